@@ -75,6 +75,22 @@ class CitationSystem {
         }
     }
 
+    /**
+     * Load the prebuilt paper index (scripts/build_paper_index.py)
+     */
+    async loadIndex(filePath) {
+        try {
+            const response = await fetch(filePath);
+            const index = await response.json();
+            Object.entries(index.entries || {}).forEach(([key, entry]) => {
+                this.references[key] = { key: key, ...entry };
+            });
+            console.log(`Loaded ${Object.keys(this.references).length} references from ${filePath}`);
+        } catch (error) {
+            console.error('Error loading paper index:', error);
+        }
+    }
+
     /**
      * Format author names (simplified)
      */
@@ -239,10 +255,14 @@ class CitationSystem {
     }
 
     /**
-     * Initialize citation system
+     * Initialize citation system from the paper index (.json) or a BibTeX file
      */
-    async init(bibtexPath) {
-        await this.loadBibTeX(bibtexPath);
+    async init(referencesPath) {
+        if (referencesPath.split('?')[0].endsWith('.json')) {
+            await this.loadIndex(referencesPath);
+        } else {
+            await this.loadBibTeX(referencesPath);
+        }
         
         // Process citations when DOM is ready
         if (document.readyState === 'loading') {
@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with local stand-ins for Semantic Scholar and the LLM API.
+
+Two mock HTTP servers replace the external services:
+- MockSemanticScholar: /paper/batch, /paper/search and /paper/{id}/citations
+  with a fixed latency, deterministic 429 injection and a configurable number
+  of citing papers per paper
+- MockChatLLM: OpenAI-compatible /v1/models and /v1/chat/completions; each
+  answer takes a first-token latency plus output tokens / tokens-per-second.
+  Streamed answers (stream=true) are sent as server-sent events and stop
+  being generated when the client disconnects
+
+Papers, verdicts and injected 429s are all derived from the requests, so
+every run does the same work. Each scenario runs in a fresh subprocess with
+its own cache directory and drives collect_all_citations, analyze_paper /
+analyze_papers_async or the FastAPI endpoints (under uvicorn). For every
+operation it reports throughput, p50/p95 latency and the subprocess's peak
+RSS. Results are written as JSON so runs can be compared between commits.
+
+Usage:
+    python benchmark.py                          # all scenarios
+    python benchmark.py --only collect-w4 analyze-async --quick
+    python benchmark.py --compare bench_results/old.json bench_results/new.json
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent
+BENCH_RESULTS_DIR = SCRIPT_DIR / "bench_results"
+MOCK_MODEL = "mock-llm"
+
+# Scenario defaults; each scenario overrides what it measures
+DEFAULTS: Dict[str, Any] = {
+    "seeds": 20,
+    "fan_out": 2500,             # citing papers per paper in the S2 mock
+    "max_citations": 0,          # per seed, 0 = all (paged 1000 at a time)
+    "workers": 1,
+    "s2_latency_ms": 20,
+    "s2_429_rate": 0.05,         # share of S2 requests answered with 429
+    "s2_retry_after_s": 0.1,
+    "papers": 200,
+    "engine": "threads",
+    "concurrency": 8,
+    "batch_size": 1,
+    "max_concurrency": 64,
+    "structured_output": False,
+    "stream": False,
+    "triage": False,
+    "llm_latency_ms": 50,        # time to first token
+    "llm_tokens_per_s": 400,
+    "llm_429_rate": 0.0,
+    "relevant_fraction": 0.2,
+    "page_requests": 200,
+}
+
+SCENARIOS: List[Dict[str, Any]] = [
+    {"name": "collect-w1", "kind": "collect"},
+    {"name": "collect-w4", "kind": "collect", "workers": 4},
+    {"name": "analyze-threads", "kind": "analyze"},
+    {"name": "analyze-threads-batch8", "kind": "analyze", "batch_size": 8},
+    {"name": "analyze-async", "kind": "analyze", "engine": "async"},
+    {"name": "analyze-structured", "kind": "analyze", "structured_output": True},
+    {"name": "analyze-stream", "kind": "analyze", "stream": True},
+    {"name": "analyze-triage-stream", "kind": "analyze", "structured_output": True, "stream": True, "triage": True},
+    {"name": "api", "kind": "api", "seeds": 10, "fan_out": 100, "workers": 4},
+]
+
+# Sizes divided by this factor with --quick
+QUICK_FACTOR = 4
+_SIZE_KEYS = ("seeds", "fan_out", "papers", "page_requests")
+
+
+def _digest(*parts: Any) -> bytes:
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).digest()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+_WORDS = (
+    "robust scalable efficient adaptive latent invisible provable federated sparse neural "
+    "fingerprint watermark backdoor ownership model language diffusion retrieval agent graph "
+    "verification attack defense alignment distillation merging quantization pruning editing"
+).split()
+
+
+def synthetic_paper(key: str, with_analysis: bool = False) -> Dict[str, Any]:
+    """Deterministic fake paper for the mocks and for prefilled paper logs."""
+    d = _digest("paper", key)
+    words = [_WORDS[b % len(_WORDS)] for b in d[:7]]
+    paper = {
+        "title": f"{' '.join(words[:5]).capitalize()} for {words[5]} {words[6]} ({key[:8]})",
+        "authors": f"Author {d[8]}, Author {d[9]}",
+        "year": 2018 + d[10] % 8,
+        "venue": ("NeurIPS", "ICLR", "ACL", "arXiv")[d[11] % 4],
+        "abstract": " ".join(_WORDS[b % len(_WORDS)] for b in _digest("abstract", key) * 6),
+        "url": f"https://example.org/{key}",
+        "semantic_scholar_id": key,
+        "citation_count": int.from_bytes(d[12:14], "big") % 500,
+    }
+    if with_analysis:
+        paper["analysis"] = mock_verdict(paper["title"], DEFAULTS["relevant_fraction"])
+    return paper
+
+
+def mock_verdict(title: str, relevant_fraction: float) -> Dict[str, Any]:
+    d = _digest("verdict", title)
+    relevant = d[0] < relevant_fraction * 256
+    categories = [("invasive", "backdoor_watermark"), ("non_invasive", "semantic_feature"), ("fingerprint_removal", "inference_time")]
+    category, subcategory = categories[d[1] % len(categories)]
+    return {
+        "is_model_copyright_protection": relevant,
+        "reasoning": "Mock verdict derived from a hash of the title; the paper " + ("does" if relevant else "does not") + " protect model ownership.",
+        "category": category if relevant else None,
+        "subcategory": subcategory if relevant else None,
+        "classification_confidence": ("high", "medium", "low")[d[2] % 3],
+        "brief_summary": f"Mock summary of {title[:40]}",
+    }
+
+
+# ============================================================================
+# Mock servers
+# ============================================================================
+
+class _MockServer:
+    """ThreadingHTTPServer on a free local port, serving `handle` on a background thread.
+
+    `handle` returns (status, headers, payload); a payload that is an iterator
+    of strings is sent as a server-sent event stream, one event per item.
+    """
+
+    def __init__(self, handle: Callable[[BaseHTTPRequestHandler, str, Optional[Any]], Tuple[int, Dict[str, str], Any]]):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method: str):
+                body = None
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body = json.loads(self.rfile.read(length))
+                status, headers, payload = handle(self, method, body)
+                if isinstance(payload, Iterator):
+                    self._stream(status, headers, payload)
+                    return
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, status: int, headers: Dict[str, str], events: Iterator[str]):
+                # No Content-Length: the body ends when the connection closes
+                self.close_connection = True
+                self.send_response(status)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    for event in events:
+                        self.wfile.write(f"data: {event}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    events.close()
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.httpd = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.requests = 0
+        self.throttled = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def count_request(self, throttle_rate: float) -> bool:
+        """Count a request; True if it is one of the deterministic `throttle_rate` share to answer with 429."""
+        with self._lock:
+            self.requests += 1
+            throttle = int(self.requests * throttle_rate) != int((self.requests - 1) * throttle_rate)
+            if throttle:
+                self.throttled += 1
+            return throttle
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "throttled": self.throttled, "completion_tokens": self.completion_tokens}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class MockSemanticScholar(_MockServer):
+    """Semantic Scholar Graph API stand-in; see module docstring."""
+
+    _CITATIONS_RE = re.compile(r"^/paper/([^/]+)/citations$")
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        super().__init__(self._handle)
+
+    @staticmethod
+    def _paper_id(ident: str) -> str:
+        # S2 paperIds map to themselves, other identifiers (ARXIV:..., titles) to a stable fake id
+        return ident if re.fullmatch(r"[0-9a-f]{40}", ident) else _digest("id", ident).hex()[:40]
+
+    def _paper(self, paper_id: str) -> Dict[str, Any]:
+        paper = synthetic_paper(paper_id)
+        return {
+            "paperId": paper_id,
+            "title": paper["title"],
+            "authors": [{"name": name} for name in paper["authors"].split(", ")],
+            "year": paper["year"],
+            "abstract": paper["abstract"],
+            "venue": paper["venue"],
+            "url": paper["url"],
+            "citationCount": self.config["fan_out"],
+        }
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str, body: Optional[Any]):
+        time.sleep(self.config["s2_latency_ms"] / 1000)
+        if self.count_request(self.config["s2_429_rate"]):
+            return 429, {"Retry-After": str(self.config["s2_retry_after_s"])}, {"message": "Too Many Requests"}
+        url = urlparse(request.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path
+        if path == "/paper/batch" and method == "POST":
+            return 200, {}, [self._paper(self._paper_id(i)) for i in body.get("ids", [])]
+        if path == "/paper/search":
+            return 200, {}, {"data": [self._paper(self._paper_id(query.get("query", "")))]}
+        match = self._CITATIONS_RE.match(path)
+        if match:
+            offset = int(query.get("offset", 0))
+            end = min(self.config["fan_out"], offset + int(query.get("limit", 100)))
+            data = [{"citingPaper": self._paper(_digest("cite", match.group(1), k).hex()[:40])} for k in range(offset, end)]
+            page: Dict[str, Any] = {"offset": offset, "data": data}
+            if end < self.config["fan_out"]:
+                page["next"] = end
+            return 200, {}, page
+        return 404, {}, {"error": f"Unknown path {path}"}
+
+
+class MockChatLLM(_MockServer):
+    """OpenAI-compatible chat completions stand-in; see module docstring."""
+
+    _TITLE_RE = re.compile(r"\*\*Title:\*\* (.*)")
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._ids = itertools.count()
+        super().__init__(self._handle)
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str, body: Optional[Any]):
+        path = urlparse(request.path).path
+        if path.endswith("/models"):
+            return 200, {}, {"object": "list", "data": [{"id": MOCK_MODEL, "object": "model", "created": 0, "owned_by": "mock"}]}
+        if not path.endswith("/chat/completions"):
+            return 404, {}, {"error": f"Unknown path {path}"}
+        if self.count_request(self.config["llm_429_rate"]):
+            return 429, {"Retry-After": "0"}, {"error": {"message": "Rate limit", "type": "rate_limit_error"}}
+
+        messages = body.get("messages", [])
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        user = messages[-1].get("content", "") if messages else ""
+        titles = self._TITLE_RE.findall(user)
+        verdicts = [mock_verdict(t, self.config["relevant_fraction"]) for t in titles] or [mock_verdict(user, 0)]
+        verdicts = [self._shape(v, body, prompt) for v in verdicts]
+        if "### Paper" in user:
+            items = [{"index": i, **v} for i, v in enumerate(verdicts)]
+            # Structured-output requests get the {"papers": [...]} object of the batch schema
+            content = json.dumps({"papers": items} if body.get("response_format") else items, indent=4)
+        else:
+            content = json.dumps(verdicts[0], indent=4)
+        # About 4 characters per token; answers longer than max_tokens are cut off
+        max_chars = 4 * int(body.get("max_tokens") or 1 << 30)
+        finish_reason = "length" if len(content) > max_chars else "stop"
+        content = content[:max_chars]
+        if body.get("stream"):
+            return 200, {}, self._stream(body, content, finish_reason)
+        completion_tokens = max(1, len(content) // 4)
+        with self._lock:
+            self.completion_tokens += completion_tokens
+        time.sleep(self.config["llm_latency_ms"] / 1000 + completion_tokens / self.config["llm_tokens_per_s"])
+        prompt_tokens = len(prompt) // 4
+        return 200, {}, {
+            "id": f"chatcmpl-mock-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or MOCK_MODEL,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @staticmethod
+    def _shape(verdict: Dict[str, Any], body: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+        """Keys in schema order for structured output, verdict fields only in triage mode."""
+        from paper_analysis import TRIAGE_KEYS
+
+        if "**Triage Mode:**" in prompt:
+            verdict = {key: verdict[key] for key in TRIAGE_KEYS}
+        response_format = body.get("response_format")
+        if response_format:
+            schema = response_format["json_schema"]["schema"]
+            if "papers" in schema["properties"]:
+                schema = schema["properties"]["papers"]["items"]
+            verdict = {key: verdict[key] for key in schema["properties"] if key in verdict}
+        return verdict
+
+    def _stream(self, body: Dict[str, Any], content: str, finish_reason: str) -> Iterator[str]:
+        """Chat completion chunks of about one token (4 characters) each, paced like the plain answer."""
+        chunk_id = f"chatcmpl-mock-{next(self._ids)}"
+        model = body.get("model") or MOCK_MODEL
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return json.dumps({
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            })
+
+        time.sleep(self.config["llm_latency_ms"] / 1000)
+        yield chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), 4):
+            time.sleep(1 / self.config["llm_tokens_per_s"])
+            with self._lock:
+                self.completion_tokens += 1
+            yield chunk({"content": content[start:start + 4]})
+        yield chunk({}, finish_reason)
+        yield "[DONE]"
+
+
+# ============================================================================
+# Scenario runners (executed in the child process)
+# ============================================================================
+
+def _operation(items: int, elapsed_s: float, latencies_s: List[float]) -> Dict[str, Any]:
+    return {
+        "items": items,
+        "elapsed_s": round(elapsed_s, 4),
+        "throughput_per_s": round(items / elapsed_s, 2) if elapsed_s > 0 else None,
+        "latency_ms": {
+            "n": len(latencies_s),
+            "p50": round(_percentile(latencies_s, 50) * 1000, 2),
+            "p95": round(_percentile(latencies_s, 95) * 1000, 2),
+            "max": round(max(latencies_s, default=0.0) * 1000, 2),
+        },
+    }
+
+
+def _seeds(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Half the seeds resolve through /paper/batch (arXiv id), half through title search
+    seeds = []
+    for i in range(config["seeds"]):
+        seed = {"title": f"Benchmark seed paper number {i}", "url": ""}
+        if i % 2 == 0:
+            seed["arxiv_id"] = f"2401.{10000 + i}"
+        seeds.append(seed)
+    return seeds
+
+
+def run_collect(config: Dict[str, Any], s2_url: str, llm_url: str) -> Dict[str, Dict[str, Any]]:
+    from scholar_citation_monitor import SemanticScholarClient, TokenBucket, collect_all_citations
+
+    latencies: List[float] = []
+
+    class TimedClient(SemanticScholarClient):
+        def _request_json(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super()._request_json(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+    client = TimedClient(base_url=s2_url, api_key=None, rate_limiter=TokenBucket(10_000, burst=64), retry_delay_s=0.05)
+    started = time.perf_counter()
+    citations = collect_all_citations(
+        _seeds(config),
+        max_citations_per_paper=config["max_citations"],
+        workers=config["workers"],
+        s2_client=client,
+    )
+    return {"collect_all_citations": _operation(len(citations), time.perf_counter() - started, latencies)}
+
+
+def _analysis_papers(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [synthetic_paper(_digest("analyze", i).hex()[:40]) for i in range(config["papers"])]
+
+
+def run_analyze(config: Dict[str, Any], s2_url: str, llm_url: str) -> Dict[str, Dict[str, Any]]:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from paper_analysis import (
+        AIMDConcurrencyLimiter,
+        AsyncOpenAIClientWrapper,
+        OpenAIClientWrapper,
+        analyze_paper,
+        analyze_papers_async,
+        analyze_papers_batch,
+    )
+
+    papers = _analysis_papers(config)
+    latencies: List[float] = []
+
+    if config["engine"] == "async":
+        class TimedAsyncClient(AsyncOpenAIClientWrapper):
+            async def generate(self, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await super().generate(*args, **kwargs)
+                finally:
+                    latencies.append(time.perf_counter() - started)
+
+        async def run():
+            client = TimedAsyncClient(
+                api_base=llm_url, model_name=MOCK_MODEL, structured_output=config["structured_output"],
+                stream=config["stream"], triage=config["triage"],
+            )
+            try:
+                return await analyze_papers_async(
+                    client, papers, include_extra_fields=True,
+                    limiter=AIMDConcurrencyLimiter(max_limit=config["max_concurrency"]),
+                )
+            finally:
+                await client.close()
+
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        return {"analyze_papers_async": _operation(sum(r is not None for r in results), time.perf_counter() - started, latencies)}
+
+    client = OpenAIClientWrapper(
+        api_base=llm_url, model_name=MOCK_MODEL, structured_output=config["structured_output"],
+        stream=config["stream"], triage=config["triage"],
+    )
+    batch_size = max(1, config["batch_size"])
+    batches = [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+
+    def run_batch(batch: List[Dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        if len(batch) == 1:
+            analyze_paper(client, batch[0], include_extra_fields=True)
+        else:
+            analyze_papers_batch(client, batch, include_extra_fields=True)
+        latencies.append(time.perf_counter() - started)
+        return len(batch)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, config["concurrency"])) as executor:
+        done = sum(executor.map(run_batch, batches))
+    name = "analyze_papers_batch" if batch_size > 1 else "analyze_paper"
+    return {name: _operation(done, time.perf_counter() - started, latencies)}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_api(config: Dict[str, Any], s2_url: str, llm_url: str) -> Dict[str, Dict[str, Any]]:
+    import requests
+    import uvicorn
+
+    import scholar_monitor_app
+    from result_writer import ResultWriter, derive_outputs, results_path
+
+    # A prefilled paper log for the paging endpoint
+    log_dir = Path(os.environ["SCHOLAR_CACHE_DIR"]) / "paper_logs"
+    scholar_monitor_app.PAPER_LOG_DIR = log_dir
+    with ResultWriter(results_path(log_dir, "bench")) as writer:
+        for i in range(config["papers"] * 10):
+            writer.write(synthetic_paper(_digest("log", i).hex()[:40], with_analysis=True))
+    derive_outputs(writer.path, log_dir, "bench", writer.count, writer.relevant)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(scholar_monitor_app.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    base = f"http://127.0.0.1:{port}"
+    session = requests.Session()
+    operations: Dict[str, Dict[str, Any]] = {}
+
+    def timed(method: str, path: str, **kwargs) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        resp = session.request(method, base + path, timeout=600, **kwargs)
+        resp.raise_for_status()
+        return resp.json(), time.perf_counter() - started
+
+    try:
+        timed("POST", "/api/seed-papers/set", json={"papers": _seeds(config)})
+        data, elapsed = timed("POST", "/api/citations/find", json={
+            "max_citations_per_paper": config["max_citations"],
+            "workers": config["workers"],
+            "s2_rate": 10_000,
+        })
+        operations["POST /api/citations/find"] = _operation(data["count"], elapsed, [elapsed])
+
+        citations = data["citations"][:config["papers"]]
+        data, elapsed = timed("POST", "/api/analyze", json={
+            "citations": citations,
+            "concurrency": config["concurrency"],
+            "api_base": llm_url,
+            "model": MOCK_MODEL,
+        })
+        operations["POST /api/analyze"] = _operation(data["count"], elapsed, [elapsed])
+
+        filters = [{}, {"relevant": "true"}, {"confidence": "high", "sort": "citation_count"}, {"year_min": 2022, "category": "invasive"}]
+        latencies: List[float] = []
+        started = time.perf_counter()
+        for i in range(config["page_requests"]):
+            params = {"page": 1 + i % 25, "page_size": 20, **filters[i % len(filters)]}
+            _, elapsed = timed("GET", "/api/paper-logs/all_citations_bench.json/papers", params=params)
+            latencies.append(elapsed)
+        operations["GET /api/paper-logs/{file}/papers"] = _operation(len(latencies), time.perf_counter() - started, latencies)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+    return operations
+
+
+RUNNERS = {"collect": run_collect, "analyze": run_analyze, "api": run_api}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_child(spec_path: Path, out_path: Path):
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    # The monitor configures logging on import; keep its per-paper INFO lines out of the measurements
+    import scholar_citation_monitor  # noqa: F401
+    logging.getLogger().setLevel(logging.WARNING)
+    operations = RUNNERS[spec["config"]["kind"]](spec["config"], spec["s2_url"], spec["llm_url"])
+    out_path.write_text(json.dumps({"operations": operations, "peak_rss_mb": _peak_rss_mb()}), encoding="utf-8")
+
+
+# ============================================================================
+# Driver
+# ============================================================================
+
+def run_scenario(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Start the mocks, run the scenario in a fresh subprocess, return its report."""
+    with MockSemanticScholar(config) as s2, MockChatLLM(config) as llm, tempfile.TemporaryDirectory() as tmp:
+        spec_path, out_path = Path(tmp) / "spec.json", Path(tmp) / "result.json"
+        spec_path.write_text(json.dumps({"config": config, "s2_url": s2.url, "llm_url": f"{llm.url}/v1"}), encoding="utf-8")
+        env = {
+            **os.environ,
+            "SCHOLAR_CACHE_DIR": str(Path(tmp) / "cache"),
+            "S2_API_BASE": s2.url,
+            "S2_API_KEY": "",
+        }
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--child", str(spec_path), str(out_path)],
+            cwd=SCRIPT_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_s = time.perf_counter() - started
+        if proc.returncode != 0 or not out_path.exists():
+            raise RuntimeError(f"Scenario {config['name']} failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-4000:]}")
+        result = json.loads(out_path.read_text(encoding="utf-8"))
+        return {
+            "name": config["name"],
+            "kind": config["kind"],
+            "config": config,
+            "operations": result["operations"],
+            "peak_rss_mb": result["peak_rss_mb"],
+            "wall_s": round(wall_s, 3),
+            "mocks": {"s2": s2.stats(), "llm": llm.stats()},
+        }
+
+
+def _git_commit() -> Tuple[Optional[str], Optional[bool]]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=SCRIPT_DIR, capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def scenario_configs(only: Optional[List[str]] = None, quick: bool = False) -> List[Dict[str, Any]]:
+    configs = []
+    for scenario in SCENARIOS:
+        if only and scenario["name"] not in only:
+            continue
+        config = {**DEFAULTS, **scenario}
+        if quick:
+            for key in _SIZE_KEYS:
+                config[key] = max(1, config[key] // QUICK_FACTOR)
+        configs.append(config)
+    return configs
+
+
+def compare(old_path: Path, new_path: Path):
+    """Print throughput, p95 and peak RSS changes per scenario/operation."""
+    old = {s["name"]: s for s in json.loads(old_path.read_text(encoding="utf-8"))["scenarios"]}
+    new = json.loads(new_path.read_text(encoding="utf-8"))["scenarios"]
+
+    def change(a: Optional[float], b: Optional[float]) -> str:
+        if not a or b is None:
+            return "-"
+        return f"{(b - a) / a:+.1%}"
+
+    print(f"{'scenario / operation':<52} {'throughput':>12} {'p95':>9} {'peak RSS':>9}")
+    for scenario in new:
+        before = old.get(scenario["name"])
+        if not before:
+            continue
+        for name, op in scenario["operations"].items():
+            prev = before["operations"].get(name)
+            if not prev:
+                continue
+            print(
+                f"{scenario['name'] + ' / ' + name:<52} "
+                f"{change(prev['throughput_per_s'], op['throughput_per_s']):>12} "
+                f"{change(prev['latency_ms']['p95'], op['latency_ms']['p95']):>9} "
+                f"{change(before['peak_rss_mb'], scenario['peak_rss_mb']):>9}"
+            )
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(Path(sys.argv[2]), Path(sys.argv[3]))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the citation monitor against local S2/LLM mocks")
+    parser.add_argument("--only", nargs="+", default=None, help=f"Scenarios to run (default: all of {', '.join(s['name'] for s in SCENARIOS)})")
+    parser.add_argument("--quick", action="store_true", help=f"Divide data sizes by {QUICK_FACTOR}")
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default: bench_results/benchmark_<commit>_<time>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"), help="Compare two results files instead of running")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit, dirty = _git_commit()
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "scenarios": [],
+    }
+    for config in scenario_configs(args.only, args.quick):
+        logger.info(f"Running {config['name']}...")
+        result = run_scenario(config)
+        report["scenarios"].append(result)
+        for name, op in result["operations"].items():
+            logger.info(
+                f"  {name}: {op['items']} items in {op['elapsed_s']:.2f}s ({op['throughput_per_s']}/s), "
+                f"p50 {op['latency_ms']['p50']:.1f} ms, p95 {op['latency_ms']['p95']:.1f} ms, peak RSS {result['peak_rss_mb']} MB"
+            )
+
+    output = args.output or BENCH_RESULTS_DIR / f"benchmark_{commit or 'unknown'}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed paper index from references.bib and the page data.
+
+The site used to fetch the raw references.bib and re-parse it with regexes on
+every page load. This build step parses it once and writes a compact JSON
+index to docs/assets/papers/paper-index.json:
+- entries: citation key -> {type, title, author, year, venue, arxiv, doi, url}
+- by_title: normalized title -> citation key
+- by_arxiv: arXiv id -> citation key
+
+Papers listed in the page `papers` literals but missing from references.bib
+are added under their own BibTeX key (or "page:<normalized title>").
+citation-system.js loads the entries; the monitor uses by_title/by_arxiv to
+give seeds an arXiv id so they resolve through /paper/batch.
+
+Usage:
+    python build_paper_index.py
+    python build_paper_index.py --check   # exit 1 if the index is out of date
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dedup_index import normalize_for_dedup
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = Path(__file__).parent.parent / "docs" / "assets"
+BIB_FILE = ASSETS_DIR / "references.bib"
+PAPER_INDEX_FILE = ASSETS_DIR / "papers" / "paper-index.json"
+PAPER_INDEX_VERSION = 1
+
+# Fields kept per entry; everything else in the .bib is dropped from the index
+_VENUE_FIELDS = ("booktitle", "journal", "howpublished", "publisher")
+_SKIPPED_TYPES = frozenset({"comment", "string", "preamble"})
+
+_ENTRY_START_RE = re.compile(r"@\s*(\w+)\s*[{(]")
+_NEXT_ENTRY_RE = re.compile(r"\n\s*@\s*\w+\s*[{(]")
+_FIELD_NAME_RE = re.compile(r"\s*([\w:.+-]+)\s*=\s*")
+_BARE_VALUE_RE = re.compile(r"[^,}#\s]+")
+_BIB_KEY_RE = re.compile(r"@\s*\w+\s*[{(]\s*([^,\s]+)\s*,")
+_ARXIV_ID_RE = re.compile(r"(?:arxiv[:./\s]*|arxiv\.org/(?:abs|pdf)/)(\d{4}\.\d{4,5})", re.IGNORECASE)
+_ARXIV_BARE_RE = re.compile(r"^(\d{4}\.\d{4,5})(?:v\d+)?$")
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+
+
+# ============================================================================
+# BibTeX parsing
+# ============================================================================
+
+def _read_braced(text: str, pos: int) -> Tuple[str, int]:
+    """Value of a {...} group starting at pos (nested braces kept), and the end position."""
+    depth = 0
+    for end in range(pos, len(text)):
+        c = text[end]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return text[pos + 1:end], end + 1
+    raise ValueError("Unbalanced braces")
+
+
+def _read_quoted(text: str, pos: int) -> Tuple[str, int]:
+    """Value of a "..." string starting at pos; quotes inside braces do not end it."""
+    depth = 0
+    for end in range(pos + 1, len(text)):
+        c = text[end]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+        elif c == '"' and depth == 0 and text[end - 1] != "\\":
+            return text[pos + 1:end], end + 1
+    raise ValueError("Unterminated string")
+
+
+def _parse_fields(body: str) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    pos = 0
+    while pos < len(body):
+        match = _FIELD_NAME_RE.match(body, pos)
+        if not match:
+            # Skip to the next field
+            comma = body.find(",", pos)
+            if comma < 0:
+                break
+            pos = comma + 1
+            continue
+        name, pos = match.group(1).lower(), match.end()
+        parts: List[str] = []
+        while pos < len(body):
+            c = body[pos]
+            if c == "{":
+                part, pos = _read_braced(body, pos)
+            elif c == '"':
+                part, pos = _read_quoted(body, pos)
+            else:
+                bare = _BARE_VALUE_RE.match(body, pos)
+                if not bare:
+                    break
+                part, pos = bare.group(), bare.end()
+            parts.append(part)
+            while pos < len(body) and body[pos].isspace():
+                pos += 1
+            if body.startswith("#", pos):
+                pos += 1
+                while pos < len(body) and body[pos].isspace():
+                    pos += 1
+                continue
+            break
+        fields[name] = re.sub(r"\s+", " ", "".join(parts)).strip()
+        comma = body.find(",", pos)
+        if comma < 0:
+            break
+        pos = comma + 1
+    return fields
+
+
+def parse_bibtex(text: str) -> List[Dict[str, str]]:
+    """Parse BibTeX into dicts with "type", "key" and the lowercased field names.
+
+    Brace-aware: nested braces and quoted values containing braces are read
+    whole. An entry missing its closing brace is read up to the next entry.
+    """
+    entries: List[Dict[str, str]] = []
+    pos = 0
+    while True:
+        match = _ENTRY_START_RE.search(text, pos)
+        if not match:
+            return entries
+        entry_type = match.group(1).lower()
+        open_pos = match.end() - 1
+        try:
+            if text[open_pos] == "{":
+                body, pos = _read_braced(text, open_pos)
+            else:
+                close = text.find(")", open_pos)
+                if close < 0:
+                    raise ValueError("Unterminated entry")
+                body, pos = text[open_pos + 1:close], close + 1
+        except ValueError as e:
+            # Usually a missing closing brace: the entry runs until the next one starts
+            next_entry = _NEXT_ENTRY_RE.search(text, match.end())
+            pos = next_entry.start() if next_entry else len(text)
+            body = text[open_pos + 1:pos]
+            line = text.count("\n", 0, match.start()) + 1
+            logger.warning(f"Malformed BibTeX entry at line {line} ({e}); reading it up to the next entry")
+        if entry_type in _SKIPPED_TYPES:
+            continue
+        key, _, rest = body.partition(",")
+        key = key.strip()
+        if not key:
+            continue
+        try:
+            fields = _parse_fields(rest)
+        except ValueError as e:
+            logger.warning(f"Skipping BibTeX entry {key}: {e}")
+            continue
+        entries.append({"type": entry_type, "key": key, **fields})
+
+
+def bibtex_key(bibtex: str) -> Optional[str]:
+    """Citation key of the first entry in a BibTeX snippet."""
+    match = _BIB_KEY_RE.search(bibtex or "")
+    return match.group(1) if match else None
+
+
+def _arxiv_id(fields: Dict[str, str]) -> Optional[str]:
+    eprint = fields.get("eprint", "")
+    match = _ARXIV_BARE_RE.match(eprint)
+    if match:
+        return match.group(1)
+    for name in ("journal", "doi", "url", "note", "howpublished", "eprint"):
+        match = _ARXIV_ID_RE.search(fields.get(name, ""))
+        if match:
+            return match.group(1)
+    return None
+
+
+def _short_authors(author: str) -> str:
+    """First two authors, then "others": all the site shows is "A", "A and B" or "A et al."."""
+    authors = [a.strip() for a in author.split(" and ") if a.strip()]
+    return " and ".join(authors[:2] + ["others"] if len(authors) > 2 else authors)
+
+
+def index_record(fields: Dict[str, str]) -> Dict[str, Any]:
+    """Compact index entry for a parsed BibTeX entry; empty fields are omitted."""
+    year_match = _YEAR_RE.search(fields.get("year", ""))
+    record = {
+        "type": fields.get("type", "misc"),
+        "title": fields.get("title", "").replace("{", "").replace("}", "").strip(),
+        "author": _short_authors(fields.get("author", "")),
+        "year": int(year_match.group()) if year_match else None,
+        "venue": next((fields[name] for name in _VENUE_FIELDS if fields.get(name)), ""),
+        "arxiv": _arxiv_id(fields),
+        "doi": fields.get("doi", ""),
+        "url": fields.get("url", ""),
+    }
+    return {k: v for k, v in record.items() if v}
+
+
+# ============================================================================
+# Index build
+# ============================================================================
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_paper_index(
+    bib_path: Path = BIB_FILE,
+    page_papers: Iterable[Dict[str, Any]] = (),
+) -> Dict[str, Any]:
+    """Build the index from the .bib file plus seed papers parsed from the pages."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    by_title: Dict[str, str] = {}
+    by_arxiv: Dict[str, str] = {}
+
+    def add(key: str, record: Dict[str, Any]):
+        entries[key] = record
+        norm = normalize_for_dedup(record.get("title", ""))
+        if norm:
+            by_title.setdefault(norm, key)
+        if record.get("arxiv"):
+            by_arxiv.setdefault(record["arxiv"], key)
+
+    for fields in parse_bibtex(bib_path.read_text(encoding="utf-8")):
+        if fields["key"] in entries:
+            # Matches the old in-browser parser, where the later entry won
+            logger.warning(f"Duplicate BibTeX key {fields['key']} in {bib_path.name}; keeping the last")
+        add(fields["key"], index_record(fields))
+
+    page_only = 0
+    for paper in page_papers:
+        norm = normalize_for_dedup(paper.get("title", ""))
+        if not norm or norm in by_title or (paper.get("arxiv_id") and paper["arxiv_id"] in by_arxiv):
+            continue
+        key = paper.get("bib_key") or f"page:{norm}"
+        if key in entries:
+            key = f"page:{norm}"
+        record = {
+            "type": "page",
+            "title": paper["title"],
+            "year": paper.get("year"),
+            "venue": paper.get("venue", ""),
+            "arxiv": paper.get("arxiv_id"),
+            "url": paper.get("url", ""),
+            "source": paper.get("source_file", ""),
+        }
+        add(key, {k: v for k, v in record.items() if v})
+        page_only += 1
+
+    logger.info(f"Indexed {len(entries)} papers ({page_only} only in page data), {len(by_arxiv)} with arXiv ids")
+    return {
+        "version": PAPER_INDEX_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "bib_sha256": _sha256(bib_path),
+        "entries": entries,
+        "by_title": by_title,
+        "by_arxiv": by_arxiv,
+    }
+
+
+def write_paper_index(index: Dict[str, Any], path: Path = PAPER_INDEX_FILE):
+    """Write the index atomically (temp file + rename) so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        # mkstemp creates 0600 files; the site serves this one
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    logger.info(f"Wrote paper index to {path} ({path.stat().st_size // 1024} KB)")
+
+
+# ============================================================================
+# Lookup
+# ============================================================================
+
+class PaperIndex:
+    """Read side of the index: look papers up by citation key, title or arXiv id."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.entries: Dict[str, Dict[str, Any]] = data.get("entries", {})
+        self.by_title: Dict[str, str] = data.get("by_title", {})
+        self.by_arxiv: Dict[str, str] = data.get("by_arxiv", {})
+        self.bib_sha256: str = data.get("bib_sha256", "")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        return {"key": key, **entry} if entry else None
+
+    def lookup(self, title: str = "", arxiv_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Entry matching the arXiv id, else the normalized title, else None."""
+        key = self.by_arxiv.get(arxiv_id) if arxiv_id else None
+        if key is None:
+            key = self.by_title.get(normalize_for_dedup(title))
+        return self.get(key) if key else None
+
+
+# Loaded index by path: (mtime_ns, PaperIndex)
+_index_cache: Dict[str, Tuple[int, PaperIndex]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def load_paper_index(path: Path = PAPER_INDEX_FILE, bib_path: Path = BIB_FILE) -> Optional[PaperIndex]:
+    """Load the index, cached per file mtime; None if it does not exist.
+
+    If references.bib changed since the index was built, the index is rebuilt
+    in memory from the .bib alone (run build_paper_index.py to update the file).
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        logger.info(f"No paper index at {path}; run build_paper_index.py to create it")
+        return None
+    with _index_cache_lock:
+        cached = _index_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        index = cached[1]
+    else:
+        try:
+            index = PaperIndex(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read paper index {path}: {e}")
+            return None
+        with _index_cache_lock:
+            _index_cache[str(path)] = (mtime, index)
+
+    if bib_path.exists() and bib_path.stat().st_mtime_ns > mtime and _sha256(bib_path) != index.bib_sha256:
+        logger.warning(f"{path.name} is older than {bib_path.name}; using a fresh in-memory build")
+        return PaperIndex(build_paper_index(bib_path))
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build docs/assets/papers/paper-index.json from references.bib and the pages")
+    parser.add_argument("--bib", type=Path, default=BIB_FILE, help="BibTeX file")
+    parser.add_argument("--output", type=Path, default=PAPER_INDEX_FILE, help="Index JSON to write")
+    parser.add_argument("--no-pages", action="store_true", help="Index references.bib only")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the index is missing or out of date")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    page_papers: List[Dict[str, Any]] = []
+    if not args.no_pages:
+        from scholar_citation_monitor import extract_all_existing_papers
+        page_papers = extract_all_existing_papers()
+    index = build_paper_index(args.bib, page_papers)
+
+    if args.check:
+        try:
+            current = json.loads(args.output.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            current = {}
+        fresh = all(current.get(k) == index[k] for k in ("version", "bib_sha256", "entries", "by_title", "by_arxiv"))
+        logger.info(f"{args.output.name} is {'up to date' if fresh else 'out of date'}")
+        sys.exit(0 if fresh else 1)
+    write_paper_index(index, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Multi-hop citation crawler built on SemanticScholarClient.
+
+The monitor only collects papers that cite a seed directly. The crawler
+expands further: citing papers of citing papers, up to a depth limit, while
+staying within a request budget and fetching at most `fan_out` citations per
+node. Two strategies order the frontier:
+- bfs: level by level; within a level, papers the pre-filter scores as
+  relevant are expanded first
+- best-first: highest relevance score first, relevant papers boosted
+
+Relevance is the local pre-filter score (prefilter.PreFilter); no LLM calls.
+The crawl produces nodes and a citing -> cited edge list, written as JSONL.
+
+Usage:
+    python citation_crawler.py --depth 2 --budget 300 --strategy best-first
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prefilter import PreFilter, get_prefilter
+from scholar_citation_monitor import (
+    BEIJING_TZ,
+    DEFAULT_S2_API_KEY,
+    PAPER_LOG_DIR,
+    PREFILTER_FIT_FILE,
+    S2_CITATIONS_PAGE_SIZE,
+    OfflineCacheMiss,
+    SemanticScholarClient,
+    TokenBucket,
+    extract_all_existing_papers,
+    get_shared_response_cache,
+    open_store,
+    resolve_seed_papers,
+)
+
+logger = logging.getLogger(__name__)
+
+CRAWL_STRATEGIES = ("bfs", "best-first")
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_REQUEST_BUDGET = 300
+DEFAULT_FAN_OUT = 100
+# Pre-filter score from which a crawled paper counts as relevant
+DEFAULT_RELEVANCE_THRESHOLD = 0.15
+# Priority bonus for relevant papers in best-first mode
+RELEVANT_BOOST = 1.0
+
+
+class CompactIdSet:
+    """Set of S2 paperIds stored as 20-byte digests instead of 40-char strings."""
+
+    def __init__(self):
+        self._digests = set()
+        self._other = set()
+
+    @staticmethod
+    def _digest(paper_id: str) -> Optional[bytes]:
+        if len(paper_id) != 40:
+            return None
+        try:
+            return bytes.fromhex(paper_id)
+        except ValueError:
+            return None
+
+    def add(self, paper_id: str):
+        digest = self._digest(paper_id)
+        if digest is not None:
+            self._digests.add(digest)
+        else:
+            self._other.add(paper_id)
+
+    def __contains__(self, paper_id: str) -> bool:
+        digest = self._digest(paper_id)
+        return digest in self._digests if digest is not None else paper_id in self._other
+
+    def __len__(self) -> int:
+        return len(self._digests) + len(self._other)
+
+
+class CitationCrawler:
+    """Budgeted multi-hop expansion of the citation graph; see module docstring."""
+
+    def __init__(
+        self,
+        client: SemanticScholarClient,
+        *,
+        strategy: str = "bfs",
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        request_budget: int = DEFAULT_REQUEST_BUDGET,
+        fan_out: int = DEFAULT_FAN_OUT,
+        relevance_threshold: float = DEFAULT_RELEVANCE_THRESHOLD,
+        scorer: Optional[PreFilter] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        if strategy not in CRAWL_STRATEGIES:
+            raise ValueError(f"Unknown crawl strategy: {strategy}")
+        self.client = client
+        self.strategy = strategy
+        self.max_depth = max(0, int(max_depth))
+        self.request_budget = max(0, int(request_budget))
+        self.fan_out = max(1, int(fan_out))
+        self.relevance_threshold = relevance_threshold
+        self.scorer = scorer or PreFilter()
+        self.progress_callback = progress_callback
+
+    def _priority(self, node: Dict[str, Any]) -> Tuple:
+        if self.strategy == "bfs":
+            return (node["depth"], 0 if node["relevant"] else 1)
+        return (-(node["score"] + (RELEVANT_BOOST if node["relevant"] else 0.0)), node["depth"])
+
+    def crawl(self, seeds: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Crawl outward from seeds that have a "semantic_scholar_id" (or "paperId").
+
+        Returns:
+            {"nodes": {paperId: node}, "edges": [(citing, cited)], "stats": {...}}
+        """
+        start_count = self.client.request_count
+        visited = CompactIdSet()
+        nodes: Dict[str, Dict[str, Any]] = {}
+        edges: List[Tuple[str, str]] = []
+        frontier: List[Tuple[Tuple, int, str]] = []
+        order = itertools.count()
+        expanded = failed = 0
+        offline_misses: List[str] = []
+
+        def requests_used() -> int:
+            return self.client.request_count - start_count
+
+        def push(node: Dict[str, Any]):
+            if node["depth"] < self.max_depth:
+                heapq.heappush(frontier, (self._priority(node), next(order), node["paperId"]))
+
+        for seed in seeds:
+            paper_id = seed.get("semantic_scholar_id") or seed.get("paperId")
+            if not paper_id:
+                logger.warning(f"Seed has no Semantic Scholar id, not crawled: {seed.get('title', '')[:60]}")
+                continue
+            if paper_id in visited:
+                continue
+            visited.add(paper_id)
+            nodes[paper_id] = {
+                "paperId": paper_id,
+                "title": seed.get("title", ""),
+                "depth": 0,
+                "score": 1.0,
+                "relevant": True,
+                "seed": True,
+            }
+            push(nodes[paper_id])
+
+        while frontier and requests_used() < self.request_budget:
+            _, _, paper_id = heapq.heappop(frontier)
+            node = nodes[paper_id]
+            expanded += 1
+            logger.info(
+                f"[depth {node['depth']}, {requests_used()}/{self.request_budget} requests] "
+                f"Expanding: {node['title'][:60]}"
+            )
+            try:
+                for page in self.client.iter_citation_pages(
+                    paper_id,
+                    max_results=self.fan_out,
+                    page_size=min(self.fan_out, S2_CITATIONS_PAGE_SIZE),
+                ):
+                    citing = [p for p in page if p.get("paperId")]
+                    scores = self.scorer.score_many(citing)
+                    for paper, score in zip(citing, scores):
+                        citing_id = paper["paperId"]
+                        edges.append((citing_id, paper_id))
+                        if citing_id in visited:
+                            continue
+                        visited.add(citing_id)
+                        child = {
+                            "paperId": citing_id,
+                            "title": paper.get("title", ""),
+                            "year": paper.get("year"),
+                            "venue": paper.get("venue", ""),
+                            "url": paper.get("url", ""),
+                            "citation_count": paper.get("citationCount"),
+                            "depth": node["depth"] + 1,
+                            "score": round(float(score), 4),
+                            "relevant": bool(score >= self.relevance_threshold),
+                            "via": paper_id,
+                        }
+                        nodes[citing_id] = child
+                        push(child)
+                    if requests_used() >= self.request_budget:
+                        break
+            except OfflineCacheMiss as e:
+                # Same as a seed in collect_all_citations: skip the node, keep crawling
+                offline_misses.append(paper_id)
+                node["error"] = str(e)
+                logger.warning(f"Not in the response cache (offline mode), not expanded: {node['title'][:60]}")
+                if self.progress_callback:
+                    self.progress_callback({"type": "paper", "action": "offline_miss", "title": node["title"], "reason": str(e)})
+            except RuntimeError as e:
+                failed += 1
+                node["error"] = str(e)
+                logger.warning(f"Expansion failed for {paper_id}: {e}")
+
+            if self.progress_callback:
+                self.progress_callback({
+                    "type": "progress",
+                    "expanded": expanded,
+                    "nodes": len(nodes),
+                    "edges": len(edges),
+                    "requests": requests_used(),
+                    "budget": self.request_budget,
+                    "frontier": len(frontier),
+                })
+
+        stats = {
+            "strategy": self.strategy,
+            "max_depth": self.max_depth,
+            "fan_out": self.fan_out,
+            "requests": requests_used(),
+            "request_budget": self.request_budget,
+            "expanded": expanded,
+            "failed": failed,
+            "offline_misses": len(offline_misses),
+            "frontier_left": len(frontier),
+            "nodes": len(nodes),
+            "edges": len(edges),
+            "relevant": sum(1 for n in nodes.values() if n["relevant"] and not n.get("seed")),
+            "by_depth": dict(sorted(
+                (depth, sum(1 for n in nodes.values() if n["depth"] == depth))
+                for depth in {n["depth"] for n in nodes.values()}
+            )),
+        }
+        if offline_misses:
+            logger.warning(
+                f"{len(offline_misses)} nodes not expanded, not in the response cache (offline mode). "
+                f"Run again without --offline to fetch them: {', '.join(offline_misses)}"
+            )
+        logger.info(f"Crawl finished: {stats}")
+        return {"nodes": nodes, "edges": edges, "stats": stats}
+
+
+def save_graph(result: Dict[str, Any], path: Path):
+    """Write the crawl as JSONL: one stats line, then node lines, then edge lines."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "stats", **result["stats"]}, ensure_ascii=False) + "\n")
+        for node in result["nodes"].values():
+            f.write(json.dumps({"type": "node", **node}, ensure_ascii=False) + "\n")
+        for citing, cited in result["edges"]:
+            f.write(json.dumps({"type": "edge", "citing": citing, "cited": cited}) + "\n")
+    logger.info(f"Saved citation graph to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl the citation graph beyond direct citations of the seeds")
+    parser.add_argument("--strategy", choices=CRAWL_STRATEGIES, default="bfs", help="Frontier order")
+    parser.add_argument("--depth", type=int, default=DEFAULT_MAX_DEPTH, help="Max hops from a seed")
+    parser.add_argument("--budget", type=int, default=DEFAULT_REQUEST_BUDGET, help="Max Semantic Scholar requests (including retries; cached responses are free)")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT, help="Max citing papers fetched per node")
+    parser.add_argument("--relevance-threshold", type=float, default=DEFAULT_RELEVANCE_THRESHOLD, help="Pre-filter score from which a paper counts as relevant")
+    parser.add_argument("--max-seeds", type=int, default=None, help="Only crawl from the first N seeds")
+    parser.add_argument("--s2-api-key", default=DEFAULT_S2_API_KEY, help="Semantic Scholar API key")
+    parser.add_argument("--s2-rate", type=float, default=None, help="Semantic Scholar requests per second")
+    parser.add_argument("--no-s2-cache", action="store_true", help="Always query Semantic Scholar, ignoring cached responses")
+    parser.add_argument("--offline", action="store_true", help="Answer Semantic Scholar requests only from the response cache")
+    parser.add_argument("--output", type=Path, default=None, help="Output JSONL (default: paper_logs/citation_graph_YYYYMMDD.jsonl)")
+    args = parser.parse_args()
+
+    seeds = extract_all_existing_papers()
+    if args.max_seeds:
+        seeds = seeds[:args.max_seeds]
+    if not seeds:
+        logger.error("No existing papers found!")
+        return
+
+    client = SemanticScholarClient(
+        api_key=args.s2_api_key,
+        rate_limiter=TokenBucket(args.s2_rate) if args.s2_rate else None,
+        response_cache=None if args.no_s2_cache and not args.offline else get_shared_response_cache(),
+        offline=args.offline,
+    )
+    store = open_store()
+    seeds = resolve_seed_papers(client, seeds, store.get_seed_ids(p["title"] for p in seeds))
+    store.upsert_seeds(seeds)
+
+    crawler = CitationCrawler(
+        client,
+        strategy=args.strategy,
+        max_depth=args.depth,
+        request_budget=args.budget,
+        fan_out=args.fan_out,
+        relevance_threshold=args.relevance_threshold,
+        scorer=get_prefilter(args.relevance_threshold, path=PREFILTER_FIT_FILE),
+    )
+    result = crawler.crawl(seeds)
+    date_str = datetime.now(BEIJING_TZ).strftime("%Y%m%d")
+    save_graph(result, args.output or PAPER_LOG_DIR / f"citation_graph_{date_str}.jsonl")
+
+
+if __name__ == "__main__":
+    main()
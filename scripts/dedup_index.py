@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate title index (character n-gram MinHash + LSH).
+
+Preprint and published versions of a paper often differ slightly in title
+(punctuation, a dropped subtitle word, "LLMs" vs "LLM"), so exact normalized
+title matches miss them. Each title is reduced to a MinHash signature over
+its character n-grams (NumPy); signatures are split into LSH bands so a query
+only compares against titles sharing at least one band, and candidates are
+confirmed by exact n-gram Jaccard similarity. Inserts are incremental.
+
+Titles alone are weak evidence: "... Language Models" and "... Vision
+Language Models" are different papers. Records may therefore carry their
+identifiers (S2 paperId, DOI, arXiv id, see paper_ids): two records whose
+ids of the same kind differ are never merged, and a fuzzy (non-exact) match
+is only made when at least one side has no ids. Fuzzy matches also need the
+normalized titles to be of similar length.
+"""
+
+import re
+import zlib
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+DEFAULT_DEDUP_THRESHOLD = 0.9
+# Shorter/longer normalized title length below this is never a fuzzy match
+DEFAULT_MIN_LENGTH_RATIO = 0.9
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_NGRAM = 3
+
+# Mersenne prime for the universal hash family; 31-bit operands keep products inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def normalize_for_dedup(title: str) -> str:
+    """Lowercase, drop punctuation, collapse spaces."""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9]+", " ", (title or "").lower())).strip()
+
+
+def paper_ids(paper: Dict[str, Any]) -> Dict[str, str]:
+    """Identifiers of a paper record by kind ("s2", "doi", "arxiv"), lowercased; missing ones left out."""
+    ids = {
+        "s2": paper.get("semantic_scholar_id") or paper.get("paperId"),
+        "doi": paper.get("doi"),
+        "arxiv": paper.get("arxiv_id"),
+    }
+    return {kind: str(value).strip().lower() for kind, value in ids.items() if value and str(value).strip()}
+
+
+def ids_conflict(a: Dict[str, str], b: Dict[str, str]) -> bool:
+    """True if both records have an id of the same kind and those ids differ."""
+    return any(kind in b and b[kind] != value for kind, value in a.items())
+
+
+def title_ngrams(title: str, n: int = DEFAULT_NGRAM) -> Set[str]:
+    text = normalize_for_dedup(title)
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TitleDedupIndex:
+    """
+    Incremental MinHash/LSH index over paper titles.
+
+    With the defaults (64 permutations, 16 bands of 4 rows) pairs with Jaccard
+    similarity around 0.5 become candidates about half the time and pairs
+    above 0.8 almost always; candidates are then checked against `threshold`,
+    `min_length_ratio` and the records' ids (see module docstring).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        ngram: int = DEFAULT_NGRAM,
+        seed: int = 1,
+        min_length_ratio: float = DEFAULT_MIN_LENGTH_RATIO,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.min_length_ratio = min_length_ratio
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._exact: Dict[str, List[int]] = {}
+        self._keys: List[Hashable] = []
+        self._grams: List[Set[str]] = []
+        self._lengths: List[int] = []
+        self._ids: List[Dict[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _signature(self, grams: Set[str]) -> np.ndarray:
+        hashed = np.fromiter((zlib.crc32(g.encode("utf-8")) & 0x7FFFFFFF for g in grams), dtype=np.uint64, count=len(grams))
+        return ((np.outer(self._a, hashed) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _bands(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _prepare(self, title: str) -> Tuple[str, Set[str], Optional[np.ndarray]]:
+        norm = normalize_for_dedup(title)
+        grams = title_ngrams(norm, self.ngram)
+        return norm, grams, self._signature(grams) if grams else None
+
+    def _query(self, norm: str, grams: Set[str], signature: Optional[np.ndarray], ids: Dict[str, str]) -> Optional[int]:
+        for i in self._exact.get(norm, ()):
+            if not ids_conflict(ids, self._ids[i]):
+                return i
+        if signature is None:
+            return None
+        candidates: Set[int] = set()
+        for band, bucket_key in self._bands(signature):
+            candidates.update(self._buckets[band].get(bucket_key, ()))
+        best, best_score = None, self.threshold
+        for i in sorted(candidates):
+            if ids and self._ids[i]:
+                continue
+            shorter, longer = sorted((len(norm), self._lengths[i]))
+            if shorter < self.min_length_ratio * longer:
+                continue
+            other = self._grams[i]
+            score = len(grams & other) / len(grams | other)
+            if score >= best_score:
+                best, best_score = i, score
+        return best
+
+    def _add(self, key: Hashable, norm: str, grams: Set[str], signature: Optional[np.ndarray], ids: Dict[str, str]):
+        if signature is None:
+            return
+        i = len(self._keys)
+        self._keys.append(key)
+        self._grams.append(grams)
+        self._lengths.append(len(norm))
+        self._ids.append(ids)
+        self._exact.setdefault(norm, []).append(i)
+        for band, bucket_key in self._bands(signature):
+            self._buckets[band].setdefault(bucket_key, []).append(i)
+
+    def query(self, title: str, ids: Optional[Dict[str, str]] = None) -> Optional[Hashable]:
+        """Key of the most similar indexed title at or above threshold, else None."""
+        match = self._query(*self._prepare(title), ids or {})
+        return self._keys[match] if match is not None else None
+
+    def add(self, key: Hashable, title: str, ids: Optional[Dict[str, str]] = None):
+        self._add(key, *self._prepare(title), ids or {})
+
+    def find_or_add(self, key: Hashable, title: str, ids: Optional[Dict[str, str]] = None) -> Optional[Hashable]:
+        """Return the key of an indexed near-duplicate, or add the title and return None.
+
+        ids (see paper_ids) keep records with different identifiers apart.
+        """
+        prepared = self._prepare(title)
+        match = self._query(*prepared, ids or {})
+        if match is not None:
+            return self._keys[match]
+        self._add(key, *prepared, ids or {})
+        return None
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the monitor, the analysis module and the web app.
+
+Counters, gauges and histograms with labels, all kept in one process-wide
+REGISTRY (thread-safe, stdlib only). The web app serves it in the Prometheus
+text format at /api/metrics; the CLI writes a RunReport (wall time per stage
+plus a snapshot of every metric) next to the paper logs after each run.
+
+Metrics recorded:
+- scholar_s2_*: Semantic Scholar requests by endpoint and status, request
+  latency, retries by reason (429, 5xx, timeout, ...), rate-limiter waits,
+  response cache hits
+- scholar_llm_*: LLM requests by engine and status, latency, token usage,
+  async concurrency limit
+- scholar_analyses_total: analysis outcomes (parsed, partial, parse_failed, error, cached)
+- scholar_collect_*: seed queue depth, seeds in flight, seed outcomes
+- scholar_stage_seconds / scholar_job_seconds: CLI stages and web app jobs
+"""
+
+import bisect
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers rate-limiter waits (ms) up to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted((key, self._copy(value)) for key, value in self._values.items())
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        for key, value in self._items():
+            yield self.name, list(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the last one is +Inf; then sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return [list(value[0]), value[1], value[2]]
+
+    def quantile(self, q: float, counts: Sequence[int]) -> Optional[float]:
+        """Estimate the q-quantile from bucket counts, interpolating within the bucket (as histogram_quantile does)."""
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        for key, (counts, total, count) in self._items():
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                yield f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """Named metrics; creating a metric that already exists returns the existing one."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: values per label set; histograms as count, sum, mean, p50, p95."""
+        out: Dict[str, Any] = {}
+        for name, metric in sorted(self._metrics.items()):
+            samples = []
+            for key, value in metric._items():
+                labels = dict(zip(metric.labelnames, key))
+                if isinstance(metric, Histogram):
+                    counts, total, count = value
+                    p50, p95 = metric.quantile(0.5, counts), metric.quantile(0.95, counts)
+                    samples.append({
+                        "labels": labels,
+                        "count": count,
+                        "sum": round(total, 6),
+                        "mean": round(total / count, 6) if count else None,
+                        "p50": round(p50, 6) if p50 is not None else None,
+                        "p95": round(p95, 6) if p95 is not None else None,
+                    })
+                else:
+                    samples.append({"labels": labels, "value": value})
+            if samples:
+                out[name] = {"type": metric.kind, "samples": samples}
+        return out
+
+
+REGISTRY = MetricsRegistry()
+
+# ----------------------------------------------------------------------------
+# Metric definitions
+# ----------------------------------------------------------------------------
+
+S2_REQUESTS = REGISTRY.counter("scholar_s2_requests_total", "Semantic Scholar request attempts by endpoint and HTTP status (or error type)", ("endpoint", "status"))
+S2_REQUEST_SECONDS = REGISTRY.histogram("scholar_s2_request_seconds", "Semantic Scholar request latency, rate-limiter wait excluded", ("endpoint",))
+S2_RETRIES = REGISTRY.counter("scholar_s2_retries_total", "Failed Semantic Scholar attempts (retried while attempts remain), by reason", ("endpoint", "reason"))
+S2_CACHE = REGISTRY.counter("scholar_s2_cache_total", "Semantic Scholar response cache lookups by endpoint and result (hit/miss/stale)", ("endpoint", "result"))
+S2_RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram("scholar_s2_rate_limit_wait_seconds", "Time spent waiting for a rate-limiter token")
+
+LLM_REQUESTS = REGISTRY.counter("scholar_llm_requests_total", "LLM chat completion requests by engine and outcome", ("engine", "status"))
+LLM_REQUEST_SECONDS = REGISTRY.histogram("scholar_llm_request_seconds", "LLM chat completion latency", ("engine",))
+LLM_TOKENS = REGISTRY.counter("scholar_llm_tokens_total", "LLM tokens reported in usage, by kind (prompt/completion)", ("kind",))
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram("scholar_llm_first_token_seconds", "Time to the first streamed token", ("engine",))
+LLM_STREAM_STOPS = REGISTRY.counter("scholar_llm_stream_stops_total", "Streamed completions by why reading stopped (json_complete/required_keys/finished)", ("engine", "reason"))
+LLM_CONCURRENCY_LIMIT = REGISTRY.gauge("scholar_llm_concurrency_limit", "Current AIMD concurrency limit of the async engine")
+
+ANALYSES = REGISTRY.counter("scholar_analyses_total", "Paper analyses by mode (single/batch/async) and outcome (parsed/partial/parse_failed/error/cached)", ("mode", "outcome"))
+
+COLLECT_QUEUE_DEPTH = REGISTRY.gauge("scholar_collect_queue_depth", "Seeds waiting to be fetched")
+COLLECT_IN_FLIGHT = REGISTRY.gauge("scholar_collect_in_flight", "Seeds being fetched")
+COLLECT_SEEDS = REGISTRY.counter("scholar_collect_seeds_total", "Seed fetch outcomes (ok/unchanged/retry/failed/offline_miss)", ("status",))
+COLLECT_CITATIONS = REGISTRY.counter("scholar_collect_citations_total", "Citing papers kept after dedup")
+
+STAGE_SECONDS = REGISTRY.histogram("scholar_stage_seconds", "Wall time of CLI run stages", ("stage",))
+JOB_SECONDS = REGISTRY.histogram("scholar_job_seconds", "Wall time of web app jobs by kind and final status", ("kind", "status"))
+JOBS = REGISTRY.gauge("scholar_jobs", "Web app jobs currently known, by kind and status", ("kind", "status"))
+
+
+class RunReport:
+    """Wall time per stage of one run, written with a metrics snapshot as JSON."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            STAGE_SECONDS.observe(elapsed, stage=name)
+
+    def to_dict(self, **extra: Any) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_s": round(time.perf_counter() - self._started, 3),
+            "stages_s": {name: round(s, 3) for name, s in self.stages.items()},
+            **extra,
+            "metrics": self.registry.snapshot(),
+        }
+
+    def write(self, path: Path, **extra: Any) -> Dict[str, Any]:
+        report = self.to_dict(**extra)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        stages = ", ".join(f"{name} {s:.1f}s" for name, s in report["stages_s"].items())
+        logger.info(f"Run took {report['total_s']:.1f}s ({stages}); report saved to {path}")
+        return report
@@ -5,15 +5,33 @@ Shared paper analysis module for LLM copyright protection research.
 This module provides reusable components for analyzing papers:
 - Classification categories
 - LLM API client wrapper
+- Persistent analysis result cache
 - Paper analysis functions
+- Async analysis engine with adaptive (AIMD) concurrency
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
 
-from openai import OpenAI
+from openai import APITimeoutError, AsyncOpenAI, BadRequestError, OpenAI, RateLimitError, UnprocessableEntityError
+
+from metrics import (
+    ANALYSES,
+    LLM_CONCURRENCY_LIMIT,
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_REQUEST_SECONDS,
+    LLM_REQUESTS,
+    LLM_STREAM_STOPS,
+    LLM_TOKENS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -84,12 +102,117 @@ DEFAULT_GENERATION_CONFIG = GenerationConfig(
     top_p=0.9,
 )
 
+# Output token budget per paper in structured-output mode; the verdict fields
+# come first, so hitting the limit only cuts the free-text reasoning
+STRUCTURED_MAX_TOKENS = 320
+# Same in triage mode, where only the verdict fields are asked for
+TRIAGE_MAX_TOKENS = 64
+
+# Errors from servers that reject response_format (unsupported option or schema);
+# only those whose message mentions one of the markers turn structured output off
+_RESPONSE_FORMAT_ERRORS = (BadRequestError, UnprocessableEntityError)
+_RESPONSE_FORMAT_MARKERS = ("response_format", "json_schema", "guided_json", "guided decoding", "structured output")
+
+# After models.list() fails, the endpoint is not asked again for this long
+MODEL_LOOKUP_RETRY_S = 60.0
+
+# ============================================================================
+# Shared API Endpoints
+# ============================================================================
+
+class ApiEndpoint:
+    """One OpenAI-compatible server, shared by every client wrapper that targets it.
+
+    Holds the synchronous OpenAI client, whose HTTP connection pool is then
+    reused across wrappers and requests, and the model name, which is looked
+    up with models.list() on first use when none was given. A failed lookup
+    is remembered: the model stays None and the endpoint is only asked again
+    after MODEL_LOOKUP_RETRY_S.
+    """
+
+    def __init__(self, api_base: str, api_key: str = "EMPTY", model_name: Optional[str] = None):
+        self.api_base = api_base
+        self.api_key = api_key
+        self._model_name = model_name
+        self._model_resolved = model_name is not None
+        self._lookup_failed_at: Optional[float] = None
+        self._client: Optional[OpenAI] = None
+        self._lock = threading.Lock()
+        if model_name:
+            logger.info(f"Using specified model: {model_name}")
+
+    @property
+    def client(self) -> OpenAI:
+        with self._lock:
+            if self._client is None:
+                self._client = OpenAI(api_key=self.api_key, base_url=self.api_base)
+            return self._client
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Model name as known so far (None until resolved)."""
+        return self._model_name
+
+    @property
+    def model_resolved(self) -> bool:
+        return self._model_resolved
+
+    def lookup_due(self) -> bool:
+        """True if the model is unknown and no lookup failed in the last MODEL_LOOKUP_RETRY_S."""
+        if self._model_resolved:
+            return False
+        return self._lookup_failed_at is None or time.monotonic() - self._lookup_failed_at >= MODEL_LOOKUP_RETRY_S
+
+    def lookup_failed(self, error: Exception):
+        self._lookup_failed_at = time.monotonic()
+        logger.warning(f"Could not get model name from API (next try in {MODEL_LOOKUP_RETRY_S:.0f}s): {error}")
+
+    def resolve_model(self) -> Optional[str]:
+        """Model name to send, resolved through the sync client if needed."""
+        if not self.lookup_due():
+            return self._model_name
+        client = self.client
+        with self._lock:
+            if self.lookup_due():
+                try:
+                    models = client.models.list()
+                    self.set_model(models.data[0].id if models.data else None)
+                except Exception as e:
+                    self.lookup_failed(e)
+            return self._model_name
+
+    def set_model(self, model_name: Optional[str]):
+        """Record a model name resolved elsewhere (e.g. by an async client)."""
+        self._model_name = model_name
+        self._model_resolved = True
+        logger.info(f"Connected to API. Model: {model_name}")
+
+
+_endpoints: Dict[Tuple[str, str, Optional[str]], ApiEndpoint] = {}
+_endpoints_lock = threading.Lock()
+
+
+def get_api_endpoint(api_base: str, api_key: str = "EMPTY", model_name: Optional[str] = None) -> ApiEndpoint:
+    """Process-wide ApiEndpoint per (api_base, api_key, model_name)."""
+    key = (api_base.rstrip("/"), api_key, model_name or None)
+    with _endpoints_lock:
+        endpoint = _endpoints.get(key)
+        if endpoint is None:
+            endpoint = ApiEndpoint(api_base, api_key, model_name or None)
+            _endpoints[key] = endpoint
+        return endpoint
+
+
 # ============================================================================
 # OpenAI API Client Wrapper
 # ============================================================================
 
 class OpenAIClientWrapper:
-    """Wrapper for OpenAI-compatible API client."""
+    """Wrapper for OpenAI-compatible API client.
+
+    Wrappers are cheap: the HTTP client and model name come from the shared
+    ApiEndpoint, and the model is only looked up on first use.
+    """
 
     def __init__(
         self,
@@ -97,31 +220,33 @@ class OpenAIClientWrapper:
         api_key: str = "EMPTY",
         model_name: Optional[str] = None,
         generation_config: Optional[GenerationConfig] = None,
+        structured_output: bool = False,
+        stream: bool = False,
+        triage: bool = False,
     ):
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=api_base,
-        )
+        self.endpoint = get_api_endpoint(api_base, api_key, model_name)
+        self.client = self.endpoint.client
         self.generation_config = generation_config or DEFAULT_GENERATION_CONFIG
-        
-        # Use provided model name, or get from API
-        if model_name:
-            self.model_name = model_name
-            logger.info(f"Using specified model: {self.model_name}")
-        else:
-            try:
-                models = self.client.models.list()
-                self.model_name = models.data[0].id if models.data else None
-                logger.info(f"Connected to API. Model: {self.model_name}")
-            except Exception as e:
-                logger.warning(f"Could not get model name from API: {e}")
-                self.model_name = None
+        # Send JSON schemas as response_format; switched off if the server rejects it
+        self.structured_output = structured_output
+        # Stream answers and stop reading once the JSON is complete
+        self.stream = stream
+        # Ask only for the verdict fields (no reasoning or summary)
+        self.triage = triage
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Given model name, or the first model served by the API."""
+        return self.endpoint.resolve_model()
 
     def generate(
         self,
         system_prompt: str,
         user_message: str,
         generation_config: Optional[GenerationConfig] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        required_keys: Sequence[str] = (),
+        fallback_config: Optional[GenerationConfig] = None,
     ) -> str:
         """Generate response with system prompt and user message.
         
@@ -129,9 +254,17 @@ class OpenAIClientWrapper:
             system_prompt: The system prompt to set context
             user_message: The user's message/query
             generation_config: Optional override for generation settings
+            response_schema: JSON schema for the answer, sent as response_format
+                in structured-output mode (ignored otherwise)
+            required_keys: In streaming mode, stop reading as soon as the JSON
+                answer has all of these keys complete (it always stops once
+                the JSON is closed)
+            fallback_config: Generation settings for requests sent without
+                response_format once structured output is off (default:
+                generation_config)
             
         Returns:
-            Generated response text
+            Generated response text (in streaming mode, up to where reading stopped)
         """
         config = generation_config or self.generation_config
         
@@ -140,23 +273,279 @@ class OpenAIClientWrapper:
             {"role": "user", "content": user_message},
         ]
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                **config.to_dict()
-            )
+        while True:
+            schema = response_schema if self.structured_output else None
+            kwargs = (config if schema is not None else fallback_config or config).to_dict()
+            if schema is not None:
+                kwargs["response_format"] = _response_format(schema)
+            started = time.perf_counter()
+            try:
+                if self.stream:
+                    return self._generate_streamed(messages, kwargs, required_keys, started)
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    **kwargs
+                )
+            except _RESPONSE_FORMAT_ERRORS as e:
+                _record_llm_call("sync", started, error=e)
+                if schema is None or not _is_response_format_error(e):
+                    logger.error(f"API call failed: {e}")
+                    raise
+                _disable_structured_output(self, e)
+                continue
+            except Exception as e:
+                _record_llm_call("sync", started, error=e)
+                logger.error(f"API call failed: {e}")
+                raise
+            _record_llm_call("sync", started, usage=response.usage)
             return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"API call failed: {e}")
-            raise
+
+    def _generate_streamed(
+        self,
+        messages: List[Dict[str, str]],
+        kwargs: Dict[str, Any],
+        required_keys: Sequence[str],
+        started: float,
+    ) -> str:
+        stream = self.client.chat.completions.create(model=self.model_name, messages=messages, stream=True, **kwargs)
+        reader = _StreamReader("sync", required_keys, started)
+        try:
+            for chunk in stream:
+                if reader.add(chunk):
+                    break
+        finally:
+            # Closing the connection early lets the server abort the generation
+            stream.close()
+        reader.record()
+        return reader.text
+
+
+class _StreamReader:
+    """Collects a streamed completion and decides when to stop reading it."""
+
+    def __init__(self, engine: str, required_keys: Sequence[str], started: float):
+        self.engine = engine
+        self.required_keys = tuple(required_keys)
+        self.started = started
+        self.parser = PartialJsonParser()
+        self.parts: List[str] = []
+        self.chunks = 0
+        self.usage: Any = None
+        self.stop_reason = "finished"
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def add(self, chunk: Any) -> bool:
+        """Take one stream chunk; True once reading can stop."""
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            return False
+        if not self.parts:
+            LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - self.started, engine=self.engine)
+        self.parts.append(delta)
+        self.chunks += 1
+        if not self.parser.feed(delta):
+            return False
+        if self.parser.closed:
+            self.stop_reason = "json_complete"
+            return True
+        if self.required_keys:
+            value = self.parser.value(complete_only=True)
+            if isinstance(value, dict) and all(key in value for key in self.required_keys):
+                self.stop_reason = "required_keys"
+                return True
+        return False
+
+    def record(self):
+        LLM_STREAM_STOPS.inc(engine=self.engine, reason=self.stop_reason)
+        # Without usage in the stream, count chunks (about one token each)
+        _record_llm_call(self.engine, self.started, usage=self.usage, completion_tokens=self.chunks)
+
+
+def _response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": schema["title"], "schema": schema, "strict": True}}
+
+
+def _is_response_format_error(error: Exception) -> bool:
+    """True if a 400/422 is about response_format (not e.g. the context length)."""
+    text = f"{error} {getattr(error, 'body', '') or ''}".lower()
+    return any(marker in text for marker in _RESPONSE_FORMAT_MARKERS)
+
+
+def _disable_structured_output(client: Any, error: Exception):
+    client.structured_output = False
+    logger.warning(f"Server rejected response_format, falling back to free-form JSON parsing: {error}")
+
+
+def _record_llm_call(
+    engine: str,
+    started: float,
+    usage: Any = None,
+    error: Optional[Exception] = None,
+    completion_tokens: Optional[int] = None,
+):
+    """Latency, outcome and token usage of one chat completion request."""
+    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, engine=engine)
+    if error is None:
+        status = "ok"
+    elif isinstance(error, RateLimitError):
+        status = "rate_limited"
+    elif isinstance(error, APITimeoutError):
+        status = "timeout"
+    else:
+        status = "error"
+    LLM_REQUESTS.inc(engine=engine, status=status)
+    if usage is not None:
+        LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, kind="prompt")
+        LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, kind="completion")
+    elif completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, kind="completion")
+
+# ============================================================================
+# Analysis Cache
+# ============================================================================
+
+DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES = 100_000
+
+
+class AnalysisCache:
+    """Persistent, size-capped LRU cache of analysis results (SQLite).
+
+    Entries are content-addressed: the key hashes the model name, the rendered
+    system prompt, the generation config, the user message (title, abstract
+    and extra fields) and the output mode (structured/triage). Changing CATEGORIES or the prompt changes the key, so
+    stale results are never returned; they simply age out of the LRU.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache(last_used)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(
+        model_name: Optional[str],
+        system_prompt: str,
+        generation_config: GenerationConfig,
+        user_message: str,
+        mode: str = "",
+    ) -> str:
+        parts = [model_name, system_prompt, generation_config.to_dict(), user_message]
+        if mode:
+            # Left out for the default mode so keys written before modes existed stay valid
+            parts.append(mode)
+        payload = json.dumps(
+            parts,
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE analysis_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO analysis_cache (key, result, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), time.time()),
+            ).rowcount
+            self._size += inserted
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                # Evict the least recently used entries
+                self._size -= self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN "
+                    "(SELECT key FROM analysis_cache ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+
+    def __len__(self) -> int:
+        return self._size
+
 
 # ============================================================================
 # Paper Analysis Functions
 # ============================================================================
 
-def build_classification_prompt() -> str:
-    """Build the system prompt for paper classification."""
+_categories_version: Optional[str] = None
+
+
+def categories_version() -> str:
+    """Fingerprint of CATEGORIES (keys, names, descriptions and their order).
+
+    Computed on first use and then cached; call invalidate_categories()
+    after changing CATEGORIES in place.
+    """
+    global _categories_version
+    if _categories_version is None:
+        payload = json.dumps(CATEGORIES, ensure_ascii=False, separators=(",", ":"))
+        _categories_version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    return _categories_version
+
+
+def invalidate_categories():
+    """Drop the cached categories version and prompts after CATEGORIES was edited."""
+    global _categories_version
+    _categories_version = None
+    _PROMPTS.clear()
+
+
+def set_categories(categories: Dict[str, Any]):
+    """Replace CATEGORIES in place (other modules hold a reference) and invalidate what depends on it."""
+    CATEGORIES.clear()
+    CATEGORIES.update(categories)
+    invalidate_categories()
+
+
+# System prompts by (categories_version(), batch, triage)
+_PROMPTS: Dict[Tuple[str, bool, bool], str] = {}
+
+
+def _memoized_prompt(batch: bool, triage: bool) -> str:
+    key = (categories_version(), batch, triage)
+    prompt = _PROMPTS.get(key)
+    if prompt is None:
+        # Mode-specific text only ever goes after the shared base, so every
+        # variant starts with the same bytes and server-side prefix caches hit
+        prompt = _render_classification_prompt()
+        if batch:
+            prompt += BATCH_PROMPT_SUFFIX
+        if triage:
+            prompt += TRIAGE_PROMPT_SUFFIX
+        _PROMPTS[key] = prompt
+    return prompt
+
+
+def build_classification_prompt(triage: bool = False) -> str:
+    """Build the system prompt for paper classification (verdict fields only with triage=True).
+
+    The prompt is built once per CATEGORIES version and reused.
+    """
+    return _memoized_prompt(False, triage)
+
+
+def _render_classification_prompt() -> str:
     categories_desc = []
     for cat_key, cat_info in CATEGORIES.items():
         categories_desc.append(f"\n## {cat_info['name']}")
@@ -192,97 +581,765 @@ If the paper is about general deep learning watermarking but not specifically fo
     return system_prompt
 
 
-def analyze_paper(
-    client: OpenAIClientWrapper,
-    paper: Dict[str, Any],
-    include_extra_fields: bool = False
-) -> Dict[str, Any]:
+# Fields a triage pass asks for; streamed analysis stops reading once they are complete
+TRIAGE_KEYS = ("is_model_copyright_protection", "category", "subcategory", "classification_confidence")
+# Fields of a complete verdict, in schema order
+ANALYSIS_KEYS = (*TRIAGE_KEYS, "brief_summary", "reasoning")
+
+TRIAGE_PROMPT_SUFFIX = """
+**Triage Mode:**
+Respond with only the "is_model_copyright_protection", "category", "subcategory" and "classification_confidence" fields, in that order. Leave out "reasoning" and "brief_summary".
+"""
+
+
+BATCH_PROMPT_SUFFIX = """
+**Batch Mode:**
+You will receive several papers, each introduced by a line "### Paper <index>".
+Analyze each paper independently and respond with a single JSON array containing one object per paper, in the format above plus an "index" field holding the paper's index:
+[
+    {"index": 0, "is_model_copyright_protection": true/false, "reasoning": "...", "category": ..., "subcategory": ..., "classification_confidence": "...", "brief_summary": "..."},
+    ...
+]
+"""
+
+
+def build_batch_classification_prompt(triage: bool = False) -> str:
+    """System prompt for classifying several papers per request.
+
+    It extends build_classification_prompt() so both share a byte-identical prefix.
     """
-    Analyze a paper using the LLM API to determine if it's about model copyright protection.
-    
-    Args:
-        client: The OpenAI client wrapper
-        paper: Paper dictionary with title and abstract (and optionally year, venue)
-        include_extra_fields: If True, include year and venue in the analysis prompt
-        
-    Returns:
-        Analysis result dictionary
+    return _memoized_prompt(True, triage)
+
+
+CONFIDENCE_LEVELS = ("high", "medium", "low")
+
+
+def build_classification_schema(triage: bool = False) -> Dict[str, Any]:
+    """JSON schema of one verdict, with category/subcategory enums from CATEGORIES.
+
+    The verdict fields come before the free-text ones, so a response cut off
+    by max_tokens still carries the classification. With triage=True only
+    TRIAGE_KEYS are kept.
     """
-    system_prompt = build_classification_prompt()
-    
+    subcategories = [sub for info in CATEGORIES.values() for sub in info["subcategories"]]
+    schema = {
+        "title": "paper_classification",
+        "type": "object",
+        "properties": {
+            "is_model_copyright_protection": {"type": "boolean"},
+            "category": {"type": ["string", "null"], "enum": [*CATEGORIES, None]},
+            "subcategory": {"type": ["string", "null"], "enum": [*subcategories, None]},
+            "classification_confidence": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+            "brief_summary": {"type": "string"},
+            "reasoning": {"type": "string"},
+        },
+        "required": list(ANALYSIS_KEYS),
+        "additionalProperties": False,
+    }
+    if triage:
+        schema["properties"] = {key: schema["properties"][key] for key in TRIAGE_KEYS}
+        schema["required"] = list(TRIAGE_KEYS)
+    return schema
+
+
+def build_batch_classification_schema(triage: bool = False) -> Dict[str, Any]:
+    """Schema for batch mode: {"papers": [verdict + "index", ...]} (response_format needs an object at the top)."""
+    item = build_classification_schema(triage)
+    del item["title"]
+    item["properties"] = {"index": {"type": "integer"}, **item["properties"]}
+    item["required"] = ["index", *item["required"]]
+    return {
+        "title": "batch_paper_classification",
+        "type": "object",
+        "properties": {"papers": {"type": "array", "items": item}},
+        "required": ["papers"],
+        "additionalProperties": False,
+    }
+
+
+def _paper_details(paper: Dict[str, Any], include_extra_fields: bool) -> List[str]:
+    """Title/abstract (and optionally year/venue) lines describing one paper."""
     abstract = paper.get("abstract", "")
     if not abstract:
         abstract = "(Abstract not available)"
-    
-    # Build user message
-    user_message_parts = [
-        "Please analyze the following paper:",
-        "",
+
+    lines = [
         f"**Title:** {paper['title']}",
         "",
         f"**Abstract:**",
         abstract,
     ]
-    
     if include_extra_fields:
-        user_message_parts.extend([
+        lines.extend([
             "",
             f"**Year:** {paper.get('year', 'Unknown')}",
             f"**Venue:** {paper.get('venue', 'Unknown')}",
         ])
-    
+    return lines
+
+
+def _single_paper_message(paper: Dict[str, Any], include_extra_fields: bool) -> str:
+    user_message_parts = ["Please analyze the following paper:", ""]
+    user_message_parts.extend(_paper_details(paper, include_extra_fields))
     user_message_parts.extend([
         "",
         "Determine if this paper is about MODEL copyright protection (not text watermarking) and classify it accordingly."
     ])
+    return "\n".join(user_message_parts)
+
+
+def _analysis_mode(client: Any) -> str:
+    """Output mode that shapes a verdict ("" for free-form JSON, the default)."""
+    parts = []
+    if getattr(client, "structured_output", False):
+        parts.append("structured")
+    if getattr(client, "triage", False):
+        parts.append("triage")
+    elif getattr(client, "stream", False):
+        # Streamed full analyses may lack brief_summary/reasoning (see _complete_keys)
+        parts.append("stream")
+    return "+".join(parts)
+
+
+def _complete_keys(client: Any, streamed: bool = True) -> Tuple[str, ...]:
+    """Fields a verdict needs to count as complete and be cached.
+
+    Triage only asks for TRIAGE_KEYS. A streamed single-paper answer is cut
+    off once TRIAGE_KEYS are complete, so its brief_summary and reasoning may
+    be missing; otherwise every ANALYSIS_KEY is needed.
+    """
+    if getattr(client, "triage", False) or (streamed and getattr(client, "stream", False)):
+        return TRIAGE_KEYS
+    return ANALYSIS_KEYS
+
+
+def _cache_key(client: Any, system_prompt: str, user_message: str) -> str:
+    """Cache key for one paper under the client's current mode and per-paper generation config."""
+    return AnalysisCache.make_key(
+        client.model_name, system_prompt, _analysis_config(client), user_message, _analysis_mode(client),
+    )
+
+
+def _analysis_config(client: Any, n_papers: int = 1, structured: Optional[bool] = None) -> GenerationConfig:
+    """Generation config for classifying n_papers in one request (short budget in structured-output mode).
+
+    structured overrides the client's current structured_output setting.
+    """
+    config = client.generation_config
+    per_paper = config.max_tokens
+    if structured is None:
+        structured = getattr(client, "structured_output", False)
+    if structured:
+        # Without a schema the model may still write reasoning first, so only cap triage when it is enforced
+        cap = TRIAGE_MAX_TOKENS if getattr(client, "triage", False) else STRUCTURED_MAX_TOKENS
+        per_paper = min(per_paper, cap)
+    return replace(config, max_tokens=per_paper * n_papers)
+
+
+def _analysis_prompt(client: Any) -> Tuple[str, Dict[str, Any]]:
+    """System prompt and response schema for single-paper analysis with this client."""
+    triage = getattr(client, "triage", False)
+    return build_classification_prompt(triage), build_classification_schema(triage)
+
+
+class PartialJsonParser:
+    """Incremental, tolerant reader for the first JSON object/array in a text stream.
+
+    feed() takes text as it arrives. Text before the first "{" or "[" and
+    after the matching close is ignored, and trailing commas are dropped.
+    value() returns what has been read so far: output cut off mid-value is
+    closed after the open string if that parses, otherwise at the last
+    complete member; with complete_only=True only complete members are kept.
+    """
+
+    def __init__(self):
+        self._out: List[str] = []
+        self._closers: List[str] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        # Length of _out and open containers after the last complete member
+        self._safe_len = 0
+        self._safe_closers: List[str] = []
+        self.closed = False
+
+    def feed(self, text: str) -> bool:
+        """Consume text; True if a member or the whole value was completed."""
+        completed = False
+        out, closers = self._out, self._closers
+        for ch in text:
+            if self.closed:
+                break
+            if not self._started:
+                if ch not in "{[":
+                    continue
+                self._started = True
+            if self._in_string:
+                out.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+                out.append(ch)
+            elif ch in "{[":
+                closers.append("}" if ch == "{" else "]")
+                out.append(ch)
+            elif ch in "}]":
+                while out and out[-1].isspace():
+                    out.pop()
+                if out and out[-1] == ",":
+                    out.pop()
+                if not closers or ch != closers[-1]:
+                    self.closed = True
+                    break
+                closers.pop()
+                out.append(ch)
+                completed = True
+                if not closers:
+                    self.closed = True
+                    break
+                self._safe_len, self._safe_closers = len(out), list(closers)
+            elif ch == ",":
+                self._safe_len, self._safe_closers = len(out), list(closers)
+                out.append(ch)
+                completed = True
+            else:
+                out.append(ch)
+        return completed
+
+    def value(self, complete_only: bool = False) -> Any:
+        """The value read so far (see class docstring), or None if nothing parses."""
+        if not self._started:
+            return None
+        candidates = []
+        if not self._closers:
+            candidates.append("".join(self._out))
+        else:
+            if not complete_only:
+                # Truncated: close the open string and containers as they are...
+                tail = "".join(self._out) + ('"' if self._in_string else "")
+                tail = tail.rstrip().rstrip(",")
+                candidates.append(tail + "".join(reversed(self._closers)))
+            # ...or drop the unfinished member
+            candidates.append("".join(self._out[:self._safe_len]) + "".join(reversed(self._safe_closers)))
+        for candidate in candidates:
+            try:
+                return json.loads(candidate, strict=False)
+            except json.JSONDecodeError:
+                continue
+        return None
+
+
+def parse_partial_json(text: str) -> Any:
+    """Parse the first JSON object/array in text, tolerating surrounding prose and truncation (see PartialJsonParser)."""
+    parser = PartialJsonParser()
+    parser.feed(text)
+    return parser.value()
+
+
+def _verdict_outcome(item: Any, required: Sequence[str] = ANALYSIS_KEYS) -> str:
+    """"parsed" if item has every required field, "partial" if it only has the verdict, else "parse_failed"."""
+    if not isinstance(item, dict) or not isinstance(item.get("is_model_copyright_protection"), bool):
+        return "parse_failed"
+    if all(key in item for key in required) and item["classification_confidence"] in CONFIDENCE_LEVELS:
+        return "parsed"
+    return "partial"
+
+
+def _normalize_verdict(item: Dict[str, Any], triage: bool = False, partial: bool = False) -> Dict[str, Any]:
+    """Fill in fields a truncated or loosely formatted verdict is missing."""
+    verdict = dict(item)
+    if triage:
+        verdict["triage"] = True
+    if partial:
+        verdict["partial"] = True
+    verdict.setdefault("reasoning", "")
+    verdict.setdefault("category", None)
+    verdict.setdefault("subcategory", None)
+    verdict.setdefault("classification_confidence", "low")
+    verdict.setdefault("brief_summary", "")
+    return verdict
+
+
+def _failed_analysis(reasoning: str) -> Dict[str, Any]:
+    return {
+        "is_model_copyright_protection": False,
+        "reasoning": reasoning,
+        "category": None,
+        "subcategory": None,
+        "classification_confidence": "low",
+        "brief_summary": "Analysis failed"
+    }
+
+
+def _parse_analysis_response(
+    response: str, paper: Dict[str, Any], triage: bool = False, required: Optional[Sequence[str]] = None
+) -> Tuple[Dict[str, Any], str]:
+    """Extract the JSON verdict from an LLM response. Returns (result, outcome).
+
+    The response may carry extra text or be cut off. outcome is "parsed" when
+    every required field is there (default: TRIAGE_KEYS in triage mode, else
+    ANALYSIS_KEYS; see _complete_keys); such verdicts are final and may be cached. A response cut
+    off after is_model_copyright_protection is "partial": the verdict is
+    returned with "partial": True but must not be cached. Triage verdicts are
+    marked with "triage": True.
+    """
+    paper_title = paper.get('title', 'Unknown')[:50]
+    required = required or (TRIAGE_KEYS if triage else ANALYSIS_KEYS)
+    parser = PartialJsonParser()
+    parser.feed(response or "")
+    # A field cut off mid-string does not count towards a complete verdict
+    result = parser.value(complete_only=True)
+    outcome = _verdict_outcome(result, required)
+    if outcome != "parsed":
+        result = parser.value()
+        outcome = "partial" if _verdict_outcome(result, required) != "parse_failed" else "parse_failed"
+    if outcome != "parse_failed":
+        if outcome == "partial":
+            logger.warning(f"Incomplete verdict (not cached) for paper: {paper_title}")
+        return _normalize_verdict(result, triage, partial=outcome == "partial"), outcome
+    logger.warning(f"Could not parse JSON from response for paper: {paper_title}")
+    return _failed_analysis(f"Failed to parse LLM response: {(response or '')[:200]}"), "parse_failed"
+
+
+def analyze_paper(
+    client: OpenAIClientWrapper,
+    paper: Dict[str, Any],
+    include_extra_fields: bool = False,
+    cache: Optional[AnalysisCache] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze a paper using the LLM API to determine if it's about model copyright protection.
     
-    user_message = "\n".join(user_message_parts)
+    Args:
+        client: The OpenAI client wrapper
+        paper: Paper dictionary with title and abstract (and optionally year, venue)
+        include_extra_fields: If True, include year and venue in the analysis prompt
+        cache: Optional analysis cache; hits skip the LLM call, and only
+            complete verdicts are stored
+        
+    Returns:
+        Analysis result dictionary
+    """
+    system_prompt, schema = _analysis_prompt(client)
+    user_message = _single_paper_message(paper, include_extra_fields)
+
+    if cache is not None:
+        cached = cache.get(_cache_key(client, system_prompt, user_message))
+        if cached is not None:
+            ANALYSES.inc(mode="single", outcome="cached")
+            return cached
 
     try:
-        response = client.generate(system_prompt, user_message)
-        
-        # Try to parse JSON from response
-        # Find JSON in response (it might have extra text)
-        json_start = response.find('{')
-        json_end = response.rfind('}') + 1
-        
-        if json_start != -1 and json_end > json_start:
-            json_str = response[json_start:json_end]
-            result = json.loads(json_str)
-        else:
-            # If no valid JSON, create a default response
-            paper_title = paper.get('title', 'Unknown')[:50]
-            logger.warning(f"Could not parse JSON from response for paper: {paper_title}")
-            result = {
-                "is_model_copyright_protection": False,
-                "reasoning": f"Failed to parse LLM response: {response[:200]}",
-                "category": None,
-                "subcategory": None,
-                "classification_confidence": "low",
-                "brief_summary": "Analysis failed"
-            }
-            
-    except json.JSONDecodeError as e:
-        paper_title = paper.get('title', 'Unknown')[:50]
-        logger.warning(f"JSON decode error for paper {paper_title}: {e}")
-        result = {
-            "is_model_copyright_protection": False,
-            "reasoning": f"JSON parse error: {str(e)}",
-            "category": None,
-            "subcategory": None,
-            "classification_confidence": "low",
-            "brief_summary": "Analysis failed"
-        }
+        response = client.generate(
+            system_prompt, user_message, _analysis_config(client), schema,
+            required_keys=TRIAGE_KEYS, fallback_config=_analysis_config(client, structured=False),
+        )
+        result, outcome = _parse_analysis_response(response, paper, client.triage, _complete_keys(client))
+        ANALYSES.inc(mode="single", outcome=outcome)
+        if outcome == "parsed" and cache is not None:
+            # Re-keyed in case structured output was turned off during the call
+            cache.put(_cache_key(client, system_prompt, user_message), result)
     except Exception as e:
         paper_title = paper.get('title', 'Unknown')[:50]
         logger.error(f"Error analyzing paper {paper_title}: {e}")
-        result = {
-            "is_model_copyright_protection": False,
-            "reasoning": f"Analysis error: {str(e)}",
-            "category": None,
-            "subcategory": None,
-            "classification_confidence": "low",
-            "brief_summary": "Analysis failed"
-        }
+        ANALYSES.inc(mode="single", outcome="error")
+        result = _failed_analysis(f"Analysis error: {str(e)}")
     
     return result
+
+
+def analyze_papers_batch(
+    client: OpenAIClientWrapper,
+    papers: List[Dict[str, Any]],
+    include_extra_fields: bool = False,
+    cache: Optional[AnalysisCache] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Classify several papers with one LLM request.
+
+    The response is expected to be a JSON array keyed by "index". Papers
+    missing from a partially parsed (or failed) response are retried one at a
+    time with analyze_paper. Cache lookups and stores use the single-paper key,
+    so batched and single-paper runs share cached results.
+
+    Returns:
+        Analysis result dictionaries, aligned with papers
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(papers)
+    system_prompt, _ = _analysis_prompt(client)
+    if cache is not None:
+        for i, paper in enumerate(papers):
+            results[i] = cache.get(_cache_key(client, system_prompt, _single_paper_message(paper, include_extra_fields)))
+
+    pending = [i for i, r in enumerate(results) if r is None]
+    ANALYSES.inc(len(papers) - len(pending), mode="batch", outcome="cached")
+    if len(pending) == 1:
+        results[pending[0]] = analyze_paper(client, papers[pending[0]], include_extra_fields, cache)
+        pending = []
+
+    if pending:
+        user_message_parts = [f"Please analyze the following {len(pending)} papers:"]
+        for index, i in enumerate(pending):
+            user_message_parts.extend(["", f"### Paper {index}"])
+            user_message_parts.extend(_paper_details(papers[i], include_extra_fields))
+        user_message_parts.extend([
+            "",
+            "For each paper, determine if it is about MODEL copyright protection (not text watermarking) and classify it accordingly."
+        ])
+        # Leave room for one full answer per paper
+        config = _analysis_config(client, len(pending))
+
+        items: Any = []
+        try:
+            response = client.generate(
+                build_batch_classification_prompt(client.triage), "\n".join(user_message_parts), config,
+                build_batch_classification_schema(client.triage),
+                fallback_config=_analysis_config(client, len(pending), structured=False),
+            )
+            # A JSON array, or {"papers": [...]} in structured-output mode; complete items survive truncation
+            parser = PartialJsonParser()
+            parser.feed(response or "")
+            items = parser.value(complete_only=True)
+            if isinstance(items, dict):
+                items = items.get("papers")
+            if not isinstance(items, list):
+                logger.warning(f"Could not parse JSON array from batch response ({len(pending)} papers)")
+        except Exception as e:
+            logger.error(f"Error analyzing batch of {len(pending)} papers: {e}")
+
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or not isinstance(item.get("index"), int):
+                continue
+            index = item.pop("index")
+            # Incomplete items (usually the last one, cut off by max_tokens) are retried on their own
+            if 0 <= index < len(pending) and _verdict_outcome(item, _complete_keys(client, streamed=False)) == "parsed":
+                i = pending[index]
+                item = _normalize_verdict(item, client.triage)
+                results[i] = item
+                if cache is not None:
+                    message = _single_paper_message(papers[i], include_extra_fields)
+                    cache.put(_cache_key(client, system_prompt, message), item)
+
+        missing = [i for i in pending if results[i] is None]
+        ANALYSES.inc(len(pending) - len(missing), mode="batch", outcome="parsed")
+        ANALYSES.inc(len(missing), mode="batch", outcome="parse_failed")
+        if missing:
+            logger.info(f"Batch response covered {len(pending) - len(missing)}/{len(pending)} papers; retrying {len(missing)} individually")
+        for i in missing:
+            results[i] = analyze_paper(client, papers[i], include_extra_fields, cache)
+
+    return results
+
+
+# ============================================================================
+# Async Analysis Engine
+# ============================================================================
+
+class AsyncOpenAIClientWrapper:
+    """AsyncOpenAI counterpart of OpenAIClientWrapper.
+
+    SDK-level retries are disabled so rate limits and timeouts reach the
+    caller, where the AIMD limiter uses them as overload signals. Create it
+    inside the event loop that will use it. Its HTTP client belongs to that
+    loop, but the model name is shared through the ApiEndpoint registry.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str = "EMPTY",
+        model_name: Optional[str] = None,
+        generation_config: Optional[GenerationConfig] = None,
+        timeout_s: float = 120.0,
+        structured_output: bool = False,
+        stream: bool = False,
+        triage: bool = False,
+    ):
+        self.client = AsyncOpenAI(api_key=api_key, base_url=api_base, max_retries=0, timeout=timeout_s)
+        self.generation_config = generation_config or DEFAULT_GENERATION_CONFIG
+        self.structured_output = structured_output
+        self.stream = stream
+        self.triage = triage
+        self.endpoint = get_api_endpoint(api_base, api_key, model_name)
+        self.model_name = model_name
+        self._model_resolved = model_name is not None
+
+    async def resolve_model(self) -> Optional[str]:
+        """Use the first model served by the API if no model name was given."""
+        if not self._model_resolved:
+            if self.endpoint.lookup_due():
+                try:
+                    models = await self.client.models.list()
+                    self.endpoint.set_model(models.data[0].id if models.data else None)
+                except Exception as e:
+                    self.endpoint.lookup_failed(e)
+            if not self.endpoint.model_resolved:
+                return None
+            self.model_name = self.endpoint.model_name
+            self._model_resolved = True
+        return self.model_name
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_message: str,
+        generation_config: Optional[GenerationConfig] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        required_keys: Sequence[str] = (),
+        fallback_config: Optional[GenerationConfig] = None,
+    ) -> str:
+        config = generation_config or self.generation_config
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        while True:
+            schema = response_schema if self.structured_output else None
+            kwargs = (config if schema is not None else fallback_config or config).to_dict()
+            if schema is not None:
+                kwargs["response_format"] = _response_format(schema)
+            started = time.perf_counter()
+            try:
+                if self.stream:
+                    return await self._generate_streamed(messages, kwargs, required_keys, started)
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    **kwargs
+                )
+            except _RESPONSE_FORMAT_ERRORS as e:
+                _record_llm_call("async", started, error=e)
+                if schema is None or not _is_response_format_error(e):
+                    raise
+                _disable_structured_output(self, e)
+                continue
+            except Exception as e:
+                _record_llm_call("async", started, error=e)
+                raise
+            _record_llm_call("async", started, usage=response.usage)
+            return response.choices[0].message.content
+
+    async def _generate_streamed(
+        self,
+        messages: List[Dict[str, str]],
+        kwargs: Dict[str, Any],
+        required_keys: Sequence[str],
+        started: float,
+    ) -> str:
+        stream = await self.client.chat.completions.create(
+            model=self.model_name, messages=messages, stream=True, **kwargs
+        )
+        reader = _StreamReader("async", required_keys, started)
+        try:
+            async for chunk in stream:
+                if reader.add(chunk):
+                    break
+        finally:
+            await stream.close()
+        reader.record()
+        return reader.text
+
+    async def close(self):
+        await self.client.close()
+
+
+class AIMDConcurrencyLimiter:
+    """Adaptive concurrency limit for one event loop (additive increase, multiplicative decrease).
+
+    The limit grows by one after every `limit` successful requests (about once
+    per round trip) while smoothed latency stays within `latency_tolerance`
+    times the best observed latency. It is multiplied by `backoff` on 429s,
+    timeouts, or latency above that bound, at most once per round trip so a
+    burst of failures from one window does not collapse it.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(int(initial), self.min_limit), self.max_limit))
+        self.backoff = float(backoff)
+        self.latency_tolerance = float(latency_tolerance)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._successes = 0
+        self._baseline_s: Optional[float] = None
+        self._ewma_s: Optional[float] = None
+        self._last_decrease = 0.0
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency_s: Optional[float] = None, overloaded: bool = False):
+        """Return a slot, reporting the request's latency or an overload signal."""
+        async with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                self._decrease("rate limit/timeout")
+            elif latency_s is not None:
+                self._observe(latency_s)
+            # Wake only as many waiters as there are free slots (one, or two after an increase)
+            self._cond.notify(max(0, int(self.limit) - self.in_flight))
+
+    def _observe(self, latency_s: float):
+        self._ewma_s = latency_s if self._ewma_s is None else 0.8 * self._ewma_s + 0.2 * latency_s
+        # Baseline tracks the best latency seen, drifting up slowly as the workload changes
+        if self._baseline_s is None or latency_s < self._baseline_s:
+            self._baseline_s = latency_s
+        else:
+            self._baseline_s += (latency_s - self._baseline_s) * 0.01
+
+        if self._ewma_s > self._baseline_s * self.latency_tolerance:
+            self._decrease("rising latency")
+            return
+        self._successes += 1
+        if self._successes >= int(self.limit):
+            self._successes = 0
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < (self._ewma_s or 1.0):
+            return
+        self._last_decrease = now
+        self._successes = 0
+        old = int(self.limit)
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        logger.info(f"Concurrency {old} -> {int(self.limit)} ({reason})")
+
+
+async def analyze_papers_async(
+    client: AsyncOpenAIClientWrapper,
+    papers: List[Dict[str, Any]],
+    include_extra_fields: bool = False,
+    cache: Optional[AnalysisCache] = None,
+    limiter: Optional[AIMDConcurrencyLimiter] = None,
+    max_attempts: int = 5,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze papers concurrently on the current event loop.
+
+    Papers are taken from a queue by a fixed pool of limiter.max_limit
+    workers (fewer for small inputs); requests in flight are bounded by
+    `limiter` (AIMD). Rate-limited or timed-out requests back off and are
+    retried up to max_attempts times.
+    on_result(index, analysis) is called as each paper finishes. Once
+    should_stop() returns True no new requests are sent.
+
+    Returns:
+        Analysis result dictionaries, aligned with papers (None for papers
+        skipped because of should_stop)
+    """
+    limiter = limiter or AIMDConcurrencyLimiter()
+    await client.resolve_model()
+    system_prompt, schema = _analysis_prompt(client)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(papers)
+
+    async def run_one(i: int):
+        paper = papers[i]
+        user_message = _single_paper_message(paper, include_extra_fields)
+        result = cache.get(_cache_key(client, system_prompt, user_message)) if cache is not None else None
+        if result is not None:
+            ANALYSES.inc(mode="async", outcome="cached")
+
+        attempt = 0
+        while result is None:
+            attempt += 1
+            await limiter.acquire()
+            if should_stop and should_stop():
+                await limiter.release()
+                return
+            started = time.monotonic()
+            overloaded = False
+            try:
+                response = await client.generate(
+                    system_prompt, user_message, _analysis_config(client), schema,
+                    required_keys=TRIAGE_KEYS, fallback_config=_analysis_config(client, structured=False),
+                )
+            except (RateLimitError, APITimeoutError) as e:
+                overloaded = True
+                if attempt >= max_attempts:
+                    logger.error(f"Error analyzing paper {paper.get('title', 'Unknown')[:50]}: {e}")
+                    ANALYSES.inc(mode="async", outcome="error")
+                    result = _failed_analysis(f"Analysis error: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error analyzing paper {paper.get('title', 'Unknown')[:50]}: {e}")
+                ANALYSES.inc(mode="async", outcome="error")
+                result = _failed_analysis(f"Analysis error: {str(e)}")
+            else:
+                result, outcome = _parse_analysis_response(response, paper, client.triage, _complete_keys(client))
+                ANALYSES.inc(mode="async", outcome=outcome)
+                if outcome == "parsed" and cache is not None:
+                    cache.put(_cache_key(client, system_prompt, user_message), result)
+            finally:
+                await limiter.release(None if overloaded else time.monotonic() - started, overloaded)
+                LLM_CONCURRENCY_LIMIT.set(limiter.limit)
+            if result is None:
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt))
+
+        results[i] = result
+        if on_result:
+            on_result(i, result)
+
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for i in range(len(papers)):
+        queue.put_nowait(i)
+
+    async def worker():
+        while not queue.empty():
+            if should_stop and should_stop():
+                return
+            await run_one(queue.get_nowait())
+
+    await asyncio.gather(*(worker() for _ in range(min(limiter.max_limit, len(papers)))))
+    return results
+
+
+def run_async_analysis(
+    api_base: str,
+    api_key: str,
+    model_name: Optional[str],
+    papers: List[Dict[str, Any]],
+    include_extra_fields: bool = False,
+    cache: Optional[AnalysisCache] = None,
+    initial_concurrency: int = 8,
+    max_concurrency: int = 256,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    structured_output: bool = False,
+    stream: bool = False,
+    triage: bool = False,
+) -> List[Optional[Dict[str, Any]]]:
+    """Blocking entry point: run analyze_papers_async on a fresh event loop."""
+
+    async def run() -> List[Dict[str, Any]]:
+        client = AsyncOpenAIClientWrapper(
+            api_base=api_base, api_key=api_key, model_name=model_name,
+            structured_output=structured_output, stream=stream, triage=triage,
+        )
+        limiter = AIMDConcurrencyLimiter(initial=initial_concurrency, max_limit=max_concurrency)
+        try:
+            return await analyze_papers_async(
+                client, papers, include_extra_fields, cache, limiter,
+                on_result=on_result, should_stop=should_stop,
+            )
+        finally:
+            logger.info(f"Async analysis finished at concurrency {int(limiter.limit)}")
+            await client.close()
+
+    return asyncio.run(run())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Offset index over paper log files, for paginated and filtered reads.
+
+A log (all_citations_*.json, scholar_relevant_*.json or citations_*.jsonl)
+is scanned once. For every paper the index keeps its byte span in the file
+plus the fields it can be filtered or sorted on (category, subcategory,
+confidence, year, relevance, citation count), as NumPy arrays saved to a
+sidecar .npz in the cache directory. A page request filters and sorts those
+arrays and then reads just the page's papers with seek().
+
+Byte spans work on the files json.dump(indent=2) writes: each paper object
+starts at a "    {" line and ends at a "    }" line. Other layouts and
+compressed JSONL are copied once into a plain JSONL file in the cache
+directory and served from there.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from result_writer import open_text
+
+logger = logging.getLogger(__name__)
+
+PAPER_LOG_INDEX_VERSION = 1
+# Loaded indexes kept in memory (LRU)
+MAX_LOADED_INDEXES = 8
+CONFIDENCES = ("high", "medium", "low")
+
+_PAPER_START = b"    {"
+_PAPER_END = b"    }"
+
+
+def _int_or(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _iter_spans_indented(path: Path) -> Iterator[Tuple[int, int]]:
+    """(offset, length) of each paper object in a json.dump(indent=2) log."""
+    with open(path, "rb") as f:
+        pos = 0
+        start = None
+        for line in f:
+            stripped = line.rstrip(b"\r\n")
+            if start is None:
+                if stripped == _PAPER_START:
+                    start = pos
+            elif stripped in (_PAPER_END, _PAPER_END + b","):
+                yield start, pos + len(_PAPER_END) - start
+                start = None
+            pos += len(line)
+
+
+def _iter_spans_jsonl(path: Path) -> Iterator[Tuple[int, int]]:
+    with open(path, "rb") as f:
+        pos = 0
+        for line in f:
+            if line.strip():
+                yield pos, len(line.rstrip(b"\r\n"))
+            pos += len(line)
+
+
+class PaperLogIndex:
+    """Filterable offset index of one paper log; see module docstring."""
+
+    def __init__(self, data_path: Path, arrays: Dict[str, np.ndarray]):
+        self.data_path = data_path
+        self.offsets = arrays["offsets"]
+        self.lengths = arrays["lengths"]
+        self.year = arrays["year"]
+        self.citation_count = arrays["citation_count"]
+        self.relevant = arrays["relevant"]
+        self.categories = [str(c) for c in arrays["categories"]]
+        self.subcategories = [str(c) for c in arrays["subcategories"]]
+        self.category = arrays["category"]
+        self.subcategory = arrays["subcategory"]
+        self.confidence = arrays["confidence"]
+        self._by_citations = np.argsort(-self.citation_count, kind="stable")
+        self.facets = self._facets()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def build(cls, data_path: Path, jsonl: bool) -> "PaperLogIndex":
+        offsets: List[int] = []
+        lengths: List[int] = []
+        fields: Dict[str, List[Any]] = {k: [] for k in ("year", "citation_count", "relevant", "category", "subcategory", "confidence")}
+        categories: Dict[str, int] = {"": 0}
+        subcategories: Dict[str, int] = {"": 0}
+        spans = _iter_spans_jsonl(data_path) if jsonl else _iter_spans_indented(data_path)
+        with open(data_path, "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                paper = json.loads(f.read(length))
+                analysis = paper.get("analysis") or {}
+                offsets.append(offset)
+                lengths.append(length)
+                fields["year"].append(_int_or(paper.get("year"), 0))
+                fields["citation_count"].append(_int_or(paper.get("citation_count"), -1))
+                fields["relevant"].append(bool(analysis.get("is_model_copyright_protection")))
+                fields["category"].append(categories.setdefault(analysis.get("category") or "", len(categories)))
+                fields["subcategory"].append(subcategories.setdefault(analysis.get("subcategory") or "", len(subcategories)))
+                confidence = str(analysis.get("classification_confidence") or "").lower()
+                fields["confidence"].append(CONFIDENCES.index(confidence) + 1 if confidence in CONFIDENCES else 0)
+        return cls(data_path, {
+            "offsets": np.array(offsets, dtype=np.int64),
+            "lengths": np.array(lengths, dtype=np.int32),
+            "year": np.array(fields["year"], dtype=np.int32),
+            "citation_count": np.array(fields["citation_count"], dtype=np.int64),
+            "relevant": np.array(fields["relevant"], dtype=bool),
+            "category": np.array(fields["category"], dtype=np.int32),
+            "subcategory": np.array(fields["subcategory"], dtype=np.int32),
+            "confidence": np.array(fields["confidence"], dtype=np.int8),
+            "categories": np.array(list(categories), dtype=str),
+            "subcategories": np.array(list(subcategories), dtype=str),
+        })
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "offsets": self.offsets,
+            "lengths": self.lengths,
+            "year": self.year,
+            "citation_count": self.citation_count,
+            "relevant": self.relevant,
+            "category": self.category,
+            "subcategory": self.subcategory,
+            "confidence": self.confidence,
+            "categories": np.array(self.categories, dtype=str),
+            "subcategories": np.array(self.subcategories, dtype=str),
+        }
+
+    def _facets(self) -> Dict[str, Dict[str, int]]:
+        """Paper counts per filter value over the whole file, for the UI's filter options."""
+        def counts(codes: np.ndarray, names: List[str]) -> Dict[str, int]:
+            tally = np.bincount(codes, minlength=len(names))
+            return {name: int(n) for name, n in zip(names, tally) if name and n}
+
+        return {
+            "category": counts(self.category, self.categories),
+            "subcategory": counts(self.subcategory, self.subcategories),
+            "confidence": counts(self.confidence, [""] + list(CONFIDENCES)),
+            "year": {str(y): int(n) for y, n in sorted(Counter(self.year[self.year > 0].tolist()).items(), reverse=True)},
+        }
+
+    def select(
+        self,
+        category: Optional[str] = None,
+        subcategory: Optional[str] = None,
+        confidence: Optional[str] = None,
+        year: Optional[int] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        relevant: Optional[bool] = None,
+        sort: str = "file",
+        order: str = "desc",
+    ) -> np.ndarray:
+        """Positions of the matching papers, in the requested order."""
+        mask = np.ones(len(self), dtype=bool)
+        if category:
+            code = self.categories.index(category) if category in self.categories else -1
+            mask &= self.category == code
+        if subcategory:
+            code = self.subcategories.index(subcategory) if subcategory in self.subcategories else -1
+            mask &= self.subcategory == code
+        if confidence:
+            confidence = confidence.lower()
+            mask &= self.confidence == (CONFIDENCES.index(confidence) + 1 if confidence in CONFIDENCES else -1)
+        if year is not None:
+            mask &= self.year == year
+        if year_min is not None:
+            mask &= self.year >= year_min
+        if year_max is not None:
+            mask &= (self.year <= year_max) & (self.year > 0)
+        if relevant is not None:
+            mask &= self.relevant == relevant
+        if sort == "citation_count":
+            ordered = self._by_citations if order == "desc" else self._by_citations[::-1]
+            return ordered[mask[ordered]]
+        return np.flatnonzero(mask)
+
+    def read(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        papers = []
+        with open(self.data_path, "rb") as f:
+            for i in positions:
+                f.seek(int(self.offsets[i]))
+                papers.append(json.loads(f.read(int(self.lengths[i]))))
+        return papers
+
+
+class PaperLogIndexer:
+    """
+    Builds, persists and caches PaperLogIndex objects for files in a log directory.
+
+    Sidecars live in `cache_dir` and are rebuilt when the log's size or mtime
+    changes. Loaded indexes are kept in a small LRU.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self._loaded: "OrderedDict[str, Tuple[Tuple[int, int], PaperLogIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def _stamp(self, path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: Path) -> PaperLogIndex:
+        key = str(path)
+        stamp = self._stamp(path)
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached and cached[0] == stamp:
+                self._loaded.move_to_end(key)
+                return cached[1]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        # One build per file at a time; concurrent requests for it wait here
+        with build_lock:
+            with self._lock:
+                cached = self._loaded.get(key)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            index = self._load_or_build(path, stamp)
+            with self._lock:
+                self._loaded[key] = (stamp, index)
+                self._loaded.move_to_end(key)
+                while len(self._loaded) > MAX_LOADED_INDEXES:
+                    self._loaded.popitem(last=False)
+        return index
+
+    def _load_or_build(self, path: Path, stamp: Tuple[int, int]) -> PaperLogIndex:
+        sidecar = self.cache_dir / f"{path.name}.idx.npz"
+        copy_path = self.cache_dir / f"{path.name}.jsonl"
+        if sidecar.exists():
+            try:
+                with np.load(sidecar) as data:
+                    arrays = {k: data[k] for k in data.files}
+                meta = arrays.pop("meta").tolist()
+                if meta == [PAPER_LOG_INDEX_VERSION, *stamp, 0]:
+                    return PaperLogIndex(path, arrays)
+                if meta == [PAPER_LOG_INDEX_VERSION, *stamp, 1] and copy_path.exists():
+                    return PaperLogIndex(copy_path, arrays)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable index {sidecar}: {e}")
+
+        logger.info(f"Indexing paper log {path.name}...")
+        index, copied = None, False
+        if path.suffix == ".jsonl":
+            index = PaperLogIndex.build(path, jsonl=True)
+        elif path.suffix == ".json":
+            index = PaperLogIndex.build(path, jsonl=False)
+            if not len(index):
+                index = None
+        if index is None:
+            # Compressed JSONL, or JSON not in the indent=2 layout: serve a plain JSONL copy
+            self._copy_as_jsonl(path, copy_path)
+            index, copied = PaperLogIndex.build(copy_path, jsonl=True), True
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, meta=np.array([PAPER_LOG_INDEX_VERSION, *stamp, int(copied)], dtype=np.int64), **index.arrays())
+        os.replace(tmp, sidecar)
+        logger.info(f"Indexed {len(index)} papers in {path.name}")
+        return index
+
+    def _copy_as_jsonl(self, path: Path, copy_path: Path):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".jsonl")
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            if ".jsonl" in path.suffixes:
+                with open_text(path) as src:
+                    shutil.copyfileobj(src, out)
+            else:
+                for paper in _load_papers(path):
+                    out.write(json.dumps(paper, ensure_ascii=False) + "\n")
+        os.replace(tmp, copy_path)
+
+
+def _load_papers(path: Path) -> List[Dict[str, Any]]:
+    """Whole-file fallback for JSON logs the line scanner cannot split."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return raw.get("papers", []) if isinstance(raw, dict) else raw if isinstance(raw, list) else []
+
+
+def paginate(
+    index: PaperLogIndex,
+    page: int = 1,
+    page_size: int = 20,
+    **filters: Any,
+) -> Dict[str, Any]:
+    """One page of papers plus totals and facets, as returned by the API."""
+    positions = index.select(**filters)
+    pages = max(1, -(-len(positions) // page_size))
+    start = (page - 1) * page_size
+    return {
+        "total": len(index),
+        "matched": int(len(positions)),
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+        "papers": index.read(positions[start:start + page_size]),
+        "facets": index.facets,
+    }
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Local relevance pre-filter in front of LLM classification.
+
+Each CATEGORIES subcategory becomes a profile (category name and description
+plus the subcategory text). A paper's title and abstract are scored against
+the profiles in two ways, vectorized with NumPy:
+- TF-IDF cosine similarity to the closest profile
+- Keyword coverage: share of a profile's most distinctive terms found in the paper
+
+Papers scoring below the threshold get an automatic "not relevant" verdict and
+are never sent to the LLM. IDF weights come from the profiles plus, via fit(),
+a fixed reference corpus (reference_papers(): the seed papers listed on the
+project pages), so terms the whole field uses ("model", "training") count for
+little while a paper's score never depends on which other papers it is
+filtered with, nor on the entry point. get_prefilter() fits once per
+categories/seeds version and saves the fit to disk for later runs.
+
+Usage (tune the threshold against stored LLM verdicts):
+    python prefilter.py --evaluate
+    python prefilter.py --evaluate --from-json paper_logs/all_citations_20250101.json
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from paper_analysis import CATEGORIES, categories_version
+
+logger = logging.getLogger(__name__)
+
+# Scores lie in [0, 1]; the default only drops papers sharing almost nothing with any profile
+DEFAULT_PREFILTER_THRESHOLD = 0.08
+KEYWORDS_PER_PROFILE = 8
+# Weight of TF-IDF similarity vs keyword coverage in the combined score
+TFIDF_WEIGHT = 0.5
+
+PREFILTER_SUMMARY = "Filtered out by local pre-filter"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a about above after again against all also an and any are as at be been before being between both but by
+can could did do does doing during each few for from further had has have having here how if in into is it
+its itself just more most no nor not of off on once only or other our out over own same should so some such
+than that the their them then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your via e g i etc such using use used based
+include includes including without within across enable enables enabling
+""".split())
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so "fingerprints"/"fingerprinting" match "fingerprint"."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def _paper_text(paper: Dict[str, Any]) -> str:
+    # Title counts twice: it is short and the most reliable signal
+    title = paper.get("title") or ""
+    return f"{title} {title} {paper.get('abstract') or ''}"
+
+
+def build_profiles(categories: Dict[str, Any] = CATEGORIES) -> List[Tuple[str, str, str]]:
+    """(category, subcategory, text) for every subcategory in categories."""
+    profiles = []
+    for cat_key, cat_info in categories.items():
+        for sub_key, sub_desc in cat_info["subcategories"].items():
+            profiles.append((cat_key, sub_key, f"{cat_info['name']} {cat_info['description']} {sub_desc}"))
+    return profiles
+
+
+def prefilter_verdict(score: float, threshold: float) -> Dict[str, Any]:
+    """Analysis result recorded for papers the pre-filter rejects."""
+    return {
+        "is_model_copyright_protection": False,
+        "reasoning": f"Pre-filter relevance score {score:.3f} is below threshold {threshold:.3f}; not sent to the LLM.",
+        "category": None,
+        "subcategory": None,
+        "classification_confidence": "low",
+        "brief_summary": PREFILTER_SUMMARY,
+        "prefiltered": True,
+        "prefilter_score": round(float(score), 4),
+    }
+
+
+class PreFilter:
+    """Scores papers against CATEGORIES profiles; see module docstring."""
+
+    def __init__(self, threshold: float = DEFAULT_PREFILTER_THRESHOLD, categories: Dict[str, Any] = CATEGORIES):
+        self.threshold = float(threshold)
+        self.profiles = build_profiles(categories)
+        self._profile_tokens = [Counter(tokenize(text)) for _, _, text in self.profiles]
+        self.vocab: Dict[str, int] = {}
+        for counts in self._profile_tokens:
+            for term in counts:
+                self.vocab.setdefault(term, len(self.vocab))
+        self.fit([])
+
+    def fit(self, reference: Iterable[Dict[str, Any]]) -> "PreFilter":
+        """Compute IDF over the profiles plus a reference corpus (the seed papers, not the batch to filter)."""
+        n_docs = len(self._profile_tokens)
+        df = np.zeros(len(self.vocab))
+        for counts in self._profile_tokens:
+            df[[self.vocab[t] for t in counts]] += 1
+        for paper in reference:
+            n_docs += 1
+            present = [self.vocab[t] for t in set(tokenize(_paper_text(paper))) if t in self.vocab]
+            df[present] += 1
+        return self._set_idf(df, n_docs)
+
+    def save(self, path: Path, key: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"key": key, "n_docs": self.n_docs, "df": self.df.tolist()}
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(path)
+
+    def load(self, path: Path, key: str) -> bool:
+        """Use the fit saved at path if it was made for `key`; returns whether it was."""
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if payload.get("key") != key or len(payload.get("df", ())) != len(self.vocab):
+            return False
+        self._set_idf(np.array(payload["df"], dtype=float), int(payload["n_docs"]))
+        return True
+
+    def _set_idf(self, df: np.ndarray, n_docs: int) -> "PreFilter":
+        self.df = df
+        self.n_docs = n_docs
+        self.idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        # Unknown terms are treated as maximally rare when normalizing paper vectors
+        self.oov_idf = float(np.log(1 + n_docs) + 1.0)
+
+        self.profile_matrix = self._tf_matrix(self._profile_tokens) * self.idf
+        self.profile_matrix /= np.linalg.norm(self.profile_matrix, axis=1, keepdims=True)
+        # Keyword profiles: the highest-weighted terms of each profile
+        self.keyword_matrix = np.zeros_like(self.profile_matrix)
+        for row, weights in enumerate(self.profile_matrix):
+            top = np.argsort(weights)[::-1][:KEYWORDS_PER_PROFILE]
+            self.keyword_matrix[row, top] = weights[top]
+        self.keyword_matrix /= self.keyword_matrix.sum(axis=1, keepdims=True)
+        return self
+
+    def _tf_matrix(self, token_counts: Sequence[Counter]) -> np.ndarray:
+        matrix = np.zeros((len(token_counts), len(self.vocab)))
+        for row, counts in enumerate(token_counts):
+            for term, count in counts.items():
+                col = self.vocab.get(term)
+                if col is not None:
+                    matrix[row, col] = 1.0 + np.log(count)
+        return matrix
+
+    def score_many(self, papers: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Relevance score in [0, 1] for each paper."""
+        if not papers:
+            return np.zeros(0)
+        token_counts = [Counter(tokenize(_paper_text(p))) for p in papers]
+        weighted = self._tf_matrix(token_counts) * self.idf
+        oov_mass = np.array([
+            sum((self.oov_idf * (1.0 + np.log(c))) ** 2 for t, c in counts.items() if t not in self.vocab)
+            for counts in token_counts
+        ])
+        norms = np.sqrt((weighted ** 2).sum(axis=1) + oov_mass)
+        norms[norms == 0] = 1.0
+        tfidf = (weighted @ self.profile_matrix.T) / norms[:, None]
+        keywords = (weighted > 0).astype(float) @ self.keyword_matrix.T
+        combined = TFIDF_WEIGHT * tfidf + (1 - TFIDF_WEIGHT) * keywords
+        return combined.max(axis=1)
+
+    def score(self, paper: Dict[str, Any]) -> float:
+        return float(self.score_many([paper])[0])
+
+    def split(self, papers: Sequence[Dict[str, Any]]) -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+        """Indices that still need the LLM, and verdicts for the rejected ones (by index)."""
+        scores = self.score_many(papers)
+        keep = [i for i, s in enumerate(scores) if s >= self.threshold]
+        rejected = {i: prefilter_verdict(s, self.threshold) for i, s in enumerate(scores) if s < self.threshold}
+        if papers:
+            logger.info(f"Pre-filter: {len(rejected)}/{len(papers)} papers below {self.threshold:.3f}, skipping LLM for them")
+        return keep, rejected
+
+
+def reference_papers() -> List[Dict[str, Any]]:
+    """The reference corpus every entry point fits on: the seed papers listed on the project pages.
+
+    Seeds edited in the web UI or passed to a single run are left out, so the
+    CLI, the web app, the crawler and --evaluate give a paper the same score.
+    """
+    # scholar_citation_monitor imports this module
+    from scholar_citation_monitor import extract_all_existing_papers
+    return extract_all_existing_papers()
+
+
+def reference_key(reference: Sequence[Dict[str, Any]]) -> str:
+    """Version of a fit: the categories plus the reference papers' texts (order-independent)."""
+    digest = hashlib.sha256(categories_version().encode("utf-8"))
+    for text in sorted(_paper_text(p) for p in reference):
+        digest.update(b"\0" + text.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+# Fitted pre-filters by reference_key()
+_FITTED: Dict[str, PreFilter] = {}
+_FITTED_LOCK = threading.Lock()
+
+
+def get_prefilter(
+    threshold: float,
+    reference: Optional[Sequence[Dict[str, Any]]] = None,
+    path: Optional[Path] = None,
+) -> PreFilter:
+    """PreFilter fitted on `reference` (default: reference_papers()), reused within the process and (with path) across runs."""
+    if reference is None:
+        reference = reference_papers()
+    key = reference_key(reference)
+    with _FITTED_LOCK:
+        fitted = _FITTED.get(key)
+        if fitted is None:
+            fitted = PreFilter()
+            if path is None or not fitted.load(path, key):
+                fitted.fit(reference)
+                if path is not None:
+                    fitted.save(path, key)
+            _FITTED[key] = fitted
+    prefilter = copy.copy(fitted)
+    prefilter.threshold = float(threshold)
+    return prefilter
+
+
+def apply_prefilter(
+    papers: Sequence[Dict[str, Any]],
+    threshold: float,
+    reference: Optional[Sequence[Dict[str, Any]]] = None,
+    path: Optional[Path] = None,
+) -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+    """Split papers with a PreFilter fitted on `reference` (see get_prefilter); threshold <= 0 keeps every paper."""
+    if threshold <= 0:
+        return list(range(len(papers))), {}
+    return get_prefilter(threshold, reference, path).split(papers)
+
+
+# ============================================================================
+# Evaluation against past LLM verdicts
+# ============================================================================
+
+def _has_llm_verdict(paper: Dict[str, Any]) -> bool:
+    analysis = paper.get("analysis") or {}
+    return (
+        "is_model_copyright_protection" in analysis
+        and not analysis.get("prefiltered")
+        and analysis.get("brief_summary") not in ("Analysis failed", "已在种子中，跳过分析")
+    )
+
+
+def evaluate(
+    papers: Sequence[Dict[str, Any]],
+    thresholds: Sequence[float],
+    reference: Optional[Sequence[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Precision/recall of the pre-filter against LLM verdicts, per threshold.
+
+    "Positive" means the paper passes the filter (is sent to the LLM); the LLM
+    verdict is the ground truth. Recall is the share of LLM-relevant papers the
+    filter keeps and should stay at 1.0; filtered is the share of LLM calls saved.
+    The filter is fitted on `reference` (default: reference_papers()) exactly
+    as in a monitor run.
+    """
+    labelled = [p for p in papers if _has_llm_verdict(p)]
+    if not labelled:
+        return []
+    scores = get_prefilter(0.0, reference).score_many(labelled)
+    relevant = np.array([bool(p["analysis"]["is_model_copyright_protection"]) for p in labelled])
+    report = []
+    for threshold in thresholds:
+        passed = scores >= threshold
+        true_pos = int((passed & relevant).sum())
+        report.append({
+            "threshold": float(threshold),
+            "papers": len(labelled),
+            "relevant": int(relevant.sum()),
+            "passed": int(passed.sum()),
+            "filtered": round(float(1 - passed.mean()), 4),
+            "precision": round(true_pos / int(passed.sum()), 4) if passed.any() else None,
+            "recall": round(true_pos / int(relevant.sum()), 4) if relevant.any() else None,
+            "missed": [p["title"] for p, s, r in zip(labelled, passed, relevant) if r and not s],
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the LLM pre-filter against past verdicts")
+    parser.add_argument("--evaluate", action="store_true", help="Report precision/recall per threshold")
+    parser.add_argument("--from-json", type=Path, default=None, help="Analyzed papers JSON (default: analyses in the store)")
+    parser.add_argument("--thresholds", default="0.02,0.04,0.06,0.08,0.1,0.12,0.15,0.2", help="Comma-separated thresholds")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if not args.evaluate:
+        parser.print_help()
+        return
+    if args.from_json:
+        raw = json.loads(args.from_json.read_text(encoding="utf-8"))
+        papers = raw.get("papers", []) if isinstance(raw, dict) else raw
+    else:
+        from scholar_citation_monitor import open_store
+        papers = list(open_store().iter_analyzed_papers())
+    report = evaluate(papers, [float(t) for t in args.thresholds.split(",") if t.strip()])
+    if not report:
+        logger.error("No papers with LLM verdicts to evaluate against.")
+        return
+    print(f"{'threshold':>9}  {'precision':>9}  {'recall':>6}  {'filtered':>8}  missed")
+    for row in report:
+        precision = "-" if row["precision"] is None else f"{row['precision']:.3f}"
+        recall = "-" if row["recall"] is None else f"{row['recall']:.3f}"
+        print(f"{row['threshold']:>9.3f}  {precision:>9}  {recall:>6}  {row['filtered']:>8.1%}  {len(row['missed'])}")
+    print(f"\n{report[0]['papers']} papers with LLM verdicts, {report[0]['relevant']} relevant.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Streaming output writers for monitor results.
+
+ResultWriter appends one JSON line per analyzed paper as soon as its analysis
+is done, optionally gzip/zstd compressed, so finished papers are on disk
+while the run goes on. Output goes to a temp file in the same directory that
+is renamed into place on close, so readers never see a half-written file.
+derive_outputs() then makes the existing all_citations / scholar_relevant
+JSON files and the Markdown summary from the JSONL in a single streaming pass
+instead of serializing them from lists.
+
+This does not bound the monitor's memory: collection, dedup, the store and
+analysis still work on the full list of citations, which the caller holds.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+# Records write_at() holds back behind a missing index before it gives up on input order
+MAX_PENDING = 1000
+_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def results_path(directory: Path, date_str: str, compression: str = "none") -> Path:
+    return directory / f"citations_{date_str}.jsonl{_SUFFIXES[compression]}"
+
+
+def _compression_for(path: Path) -> str:
+    return {".gz": "gzip", ".zst": "zstd"}.get(path.suffix, "none")
+
+
+def _zstd_module():
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression needs Python 3.14+ or the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+def _open_zstd(path: Path, mode: str) -> IO:
+    return _zstd_module().open(path, mode, encoding="utf-8")
+
+
+def open_text(path: Path, mode: str = "rt") -> IO:
+    """Open a text file, transparently (de)compressing by suffix (.gz, .zst)."""
+    compression = _compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, mode, encoding="utf-8")
+    if compression == "zstd":
+        return _open_zstd(path, mode)
+    return open(path, mode.replace("t", ""), encoding="utf-8")
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream records from a (possibly compressed) JSONL file."""
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def is_relevant(paper: Dict[str, Any]) -> bool:
+    return bool((paper.get("analysis") or {}).get("is_model_copyright_protection", False))
+
+
+class _AtomicTextFile:
+    """Text file written under a temp name and renamed to `path` on commit."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        compression = _compression_for(path)
+        if compression == "zstd":
+            _zstd_module()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        self.tmp_path = Path(tmp)
+        # Temp name ends in .tmp, so the codec comes from the final name
+        if compression == "none":
+            self.file: IO = open(self.tmp_path, "w", encoding="utf-8")
+        elif compression == "gzip":
+            self.file = io.TextIOWrapper(gzip.GzipFile(self.tmp_path, "wb"), encoding="utf-8")
+        else:
+            self.file = _open_zstd(self.tmp_path, "wt")
+
+    def commit(self):
+        self.file.close()
+        # mkstemp creates 0600 files
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class ResultWriter:
+    """
+    Append-only JSONL writer for analyzed papers; see module docstring.
+
+    write() appends immediately. write_at() takes a record's position in the
+    input list and holds records that finish early until all earlier ones are
+    written, so the file keeps the input order even with concurrent analysis.
+    At most `max_pending` records are held: past that the writer skips over
+    the missing index and appends it whenever it arrives.
+
+    Leaving the with-block on an exception still commits the records written
+    so far instead of throwing away everything that was already analyzed.
+    """
+
+    def __init__(self, path: Path, max_pending: int = MAX_PENDING):
+        self.path = path
+        self._out: Optional[_AtomicTextFile] = _AtomicTextFile(path)
+        self.count = 0
+        self.relevant = 0
+        self.max_pending = max_pending
+        self._next = 0
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        # Indices below _next that were skipped over and not written yet
+        self._skipped: Set[int] = set()
+
+    def write(self, paper: Dict[str, Any]):
+        self._out.file.write(json.dumps(paper, ensure_ascii=False) + "\n")
+        self.count += 1
+        if is_relevant(paper):
+            self.relevant += 1
+
+    def write_at(self, index: int, paper: Dict[str, Any]):
+        if index < self._next:
+            if index in self._skipped:
+                self._skipped.discard(index)
+                self.write(paper)
+            return
+        if index in self._pending:
+            return
+        self._pending[index] = paper
+        if len(self._pending) > self.max_pending:
+            # Stop waiting for the slow record(s) in front of the buffer
+            first = min(self._pending)
+            self._skipped.update(i for i in range(self._next, first))
+            self._next = first
+        while self._next in self._pending:
+            self.write(self._pending.pop(self._next))
+            self._next += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self):
+        """Write every held record in order, giving up on the missing ones before them."""
+        for index in sorted(self._pending):
+            self._skipped.update(range(self._next, index))
+            self.write(self._pending.pop(index))
+            self._next = index + 1
+
+    def finish(self, papers: Sequence[Dict[str, Any]]):
+        """Write every record of `papers` not written yet, in order (e.g. failed or skipped analyses)."""
+        for index in sorted(self._skipped):
+            self.write_at(index, papers[index])
+        for index in range(self._next, len(papers)):
+            self.write_at(index, self._pending.get(index, papers[index]))
+
+    def close(self):
+        if self._out is None:
+            return
+        self._out.commit()
+        self._out = None
+        logger.info(f"Saved {self.count} citations ({self.relevant} relevant) to {self.path}")
+
+    def abort(self):
+        if self._out is not None:
+            self._out.abort()
+            self._out = None
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._out is not None:
+            lost = len(self._pending) + len(self._skipped)
+            logger.warning(f"Stopped early; keeping the {self.count} records written to {self.path}"
+                           + (f" ({lost} out-of-order records lost)" if lost else ""))
+        self.close()
+
+
+class _JsonListWriter:
+    """Streams {header..., "papers": [...]} with the same layout as json.dump(indent=2)."""
+
+    def __init__(self, path: Path, header: Dict[str, Any]):
+        self._out = _AtomicTextFile(path)
+        self._first = True
+        head = json.dumps({**header, "papers": []}, ensure_ascii=False, indent=2)
+        # Everything up to the opening bracket of "papers"
+        self._out.file.write(head[:head.rindex("[") + 1])
+
+    def write(self, paper: Dict[str, Any]):
+        body = json.dumps(paper, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        self._out.file.write(("\n    " if self._first else ",\n    ") + body)
+        self._first = False
+
+    def commit(self):
+        self._out.file.write("]\n}" if self._first else "\n  ]\n}")
+        self._out.commit()
+
+    def abort(self):
+        self._out.abort()
+
+
+def _markdown_entry(i: int, paper: Dict[str, Any]) -> str:
+    analysis = paper.get("analysis", {})
+    lines = [
+        f"## {i}. {paper['title']}\n\n",
+        f"- **Year:** {paper.get('year', 'N/A')}\n",
+        f"- **Authors:** {paper.get('authors', 'N/A')}\n",
+        f"- **Venue:** {paper.get('venue', 'N/A')}\n",
+        f"- **Cited paper:** {paper.get('cited_paper', 'N/A')}\n",
+        f"- **Category:** {analysis.get('category')}/{analysis.get('subcategory')}\n",
+        f"- **Confidence:** {analysis.get('classification_confidence', 'N/A')}\n",
+        f"- **Summary:** {analysis.get('brief_summary', 'N/A')}\n\n",
+    ]
+    if paper.get("abstract"):
+        abstract = paper["abstract"]
+        if len(abstract) > 500:
+            abstract = abstract[:500] + "..."
+        lines.append(f"**Abstract:** {abstract}\n\n")
+    lines.append(f"**Reasoning:** {analysis.get('reasoning', 'N/A')}\n\n")
+    lines.append("---\n\n")
+    return "".join(lines)
+
+
+def derive_outputs(
+    jsonl_path: Path,
+    out_dir: Path,
+    date_str: str,
+    total: int,
+    relevant: int,
+) -> List[Path]:
+    """
+    Write all_citations_<date>.json, scholar_relevant_<date>.json and
+    scholar_summary_<date>.md from the JSONL in one pass.
+
+    `total` and `relevant` (from ResultWriter.count/.relevant) go into the
+    headers, which are written before the papers.
+    """
+    all_path = out_dir / f"all_citations_{date_str}.json"
+    relevant_path = out_dir / f"scholar_relevant_{date_str}.json"
+    md_path = out_dir / f"scholar_summary_{date_str}.md"
+
+    all_out = _JsonListWriter(all_path, {"total": total})
+    relevant_out = _JsonListWriter(relevant_path, {
+        "date": date_str,
+        "total_citations_found": total,
+        "relevant_papers_count": relevant,
+    })
+    md_out = _AtomicTextFile(md_path)
+    outputs = (all_out, relevant_out, md_out)
+    try:
+        md_out.file.write(f"# Semantic Scholar Citation Monitor - {date_str}\n\n")
+        md_out.file.write(f"**Total citations found:** {total}\n")
+        md_out.file.write(f"**Relevant papers:** {relevant}\n\n")
+        md_out.file.write("---\n\n")
+        n_relevant = 0
+        for paper in iter_jsonl(jsonl_path):
+            all_out.write(paper)
+            if is_relevant(paper):
+                n_relevant += 1
+                relevant_out.write(paper)
+                md_out.file.write(_markdown_entry(n_relevant, paper))
+        for out in outputs:
+            out.commit()
+    except BaseException:
+        for out in outputs:
+            out.abort()
+        raise
+
+    logger.info(f"Saved all {total} citations to {all_path}")
+    logger.info(f"Saved {relevant} relevant papers to {relevant_path}")
+    logger.info(f"Saved summary to {md_path}")
+    return [all_path, relevant_path, md_path]
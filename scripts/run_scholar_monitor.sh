@@ -16,7 +16,15 @@ API_BASE=""
 MODEL=""
 MAX_PAPERS=10
 MAX_CITATIONS=50
+WORKERS=1
+BATCH_SIZE=1
+ENGINE="threads"
+MAX_CONCURRENCY=256
+PREFILTER_THRESHOLD=0
+OUTPUT_COMPRESSION="none"
 SKIP_SEARCH=""
+INCREMENTAL=""
+RESUME=""
 SKIP_ANALYSIS=""
 
 # Create log directory
@@ -53,6 +61,38 @@ while [[ $# -gt 0 ]]; do
             MAX_CITATIONS="$2"
             shift 2
             ;;
+        --workers)
+            WORKERS="$2"
+            shift 2
+            ;;
+        --incremental)
+            INCREMENTAL="--incremental"
+            shift
+            ;;
+        --resume)
+            RESUME="--resume"
+            shift
+            ;;
+        --batch-size)
+            BATCH_SIZE="$2"
+            shift 2
+            ;;
+        --engine)
+            ENGINE="$2"
+            shift 2
+            ;;
+        --max-concurrency)
+            MAX_CONCURRENCY="$2"
+            shift 2
+            ;;
+        --prefilter-threshold)
+            PREFILTER_THRESHOLD="$2"
+            shift 2
+            ;;
+        --output-compression)
+            OUTPUT_COMPRESSION="$2"
+            shift 2
+            ;;
         --skip-search)
             SKIP_SEARCH="--skip-search"
             shift
@@ -71,7 +111,15 @@ while [[ $# -gt 0 ]]; do
             echo "  --host HOST         LLM API host (default: 127.0.0.1)"
             echo "  --port PORT         LLM API port (default: 8000)"
             echo "  --max-papers N      Max existing papers to check (default: 10)"
-            echo "  --max-citations N   Max citations per paper (default: 50)"
+            echo "  --max-citations N   Max citations per paper, 0 = all (default: 50)"
+            echo "  --workers N         Seeds fetched concurrently (default: 1)"
+            echo "  --incremental       Only fetch new citations since the last incremental run"
+            echo "  --resume            Continue citation collection from the last checkpoint"
+            echo "  --batch-size N      Papers classified per LLM request (default: 1)"
+            echo "  --engine NAME       LLM analysis engine: threads or async (default: threads)"
+            echo "  --max-concurrency N Max concurrent LLM requests for --engine async (default: 256)"
+            echo "  --prefilter-threshold T  Skip the LLM for papers scoring below T locally (default: 0 = off)"
+            echo "  --output-compression C  Compress the JSONL results: none, gzip or zstd (default: none)"
             echo "  --skip-search       Skip Semantic Scholar search, use cached data"
             echo "  --skip-analysis     Skip LLM analysis"
             exit 0
@@ -113,6 +161,14 @@ python "${PYTHON_SCRIPT}" \
     ${MODEL:+--model "${MODEL}"} \
     --max-papers "${MAX_PAPERS}" \
     --max-citations "${MAX_CITATIONS}" \
+    --workers "${WORKERS}" \
+    --batch-size "${BATCH_SIZE}" \
+    --engine "${ENGINE}" \
+    --max-concurrency "${MAX_CONCURRENCY}" \
+    --prefilter-threshold "${PREFILTER_THRESHOLD}" \
+    --output-compression "${OUTPUT_COMPRESSION}" \
+    ${INCREMENTAL} \
+    ${RESUME} \
     ${SKIP_SEARCH} \
     ${SKIP_ANALYSIS} \
     2>&1 | tee "${RUN_LOG}"
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of Semantic Scholar API responses (SQLite).
+
+SemanticScholarClient looks requests up here before going to the network.
+Keys hash the method, path, query parameters and JSON body; /paper/batch
+results are cached per paper id instead, so any subset of seeds can be
+resolved from earlier runs. Bodies are stored zlib-compressed.
+
+- Freshness: each endpoint has its own TTL (a title search rarely changes
+  its answer, citation lists do). Expired entries are misses, but stay
+  stored until they are refreshed or evicted. The client does not store
+  searches that found nothing, so a miss is not remembered for 30 days.
+- Size: the total size of stored bodies is capped; least recently used
+  entries are evicted first.
+- Offline mode: the caller reads entries regardless of age and never goes to
+  the network (see SemanticScholarClient(offline=True)).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds, by endpoint label (see scholar_citation_monitor._s2_endpoint)
+DEFAULT_TTLS: Dict[str, float] = {
+    "paper/search": 30 * 86400,             # title -> paperId
+    "paper/batch": 6 * 3600,                # includes citationCount, used by incremental runs
+    "paper/{id}/citations": 6 * 3600,
+}
+DEFAULT_TTL = 3600.0
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_EVICT_CHUNK = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+
+class S2ResponseCache:
+    """Persistent, size-capped LRU cache of S2 responses with per-endpoint TTLs; see module docstring."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = float(default_ttl)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(method: str, path: str, params: Optional[Dict[str, Any]] = None, json_body: Any = None) -> str:
+        payload = json.dumps(
+            [method.upper(), "/" + path.strip("/"), params or {}, json_body],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str, endpoint: str, *, ignore_ttl: bool = False) -> Tuple[str, Any]:
+        """Returns (status, data): status is "hit", "stale" (expired) or "miss"; data is None unless "hit"."""
+        with self._lock:
+            row = self._conn.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return "miss", None
+            if not ignore_ttl and time.time() - row[1] > self.ttl(endpoint):
+                return "stale", None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return "hit", json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, endpoint: str, data: Any):
+        body = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, stored_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), now, now),
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until the stored bodies fit in max_bytes
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used ASC LIMIT ?", (_EVICT_CHUNK,)
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            victims = []
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                victims.append((key,))
+                self._bytes -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT endpoint, COUNT(*), SUM(size) FROM responses GROUP BY endpoint").fetchall()
+        return {
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "endpoints": {endpoint: {"entries": n, "bytes": size} for endpoint, n, size in rows},
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_caches: Dict[str, S2ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: Path) -> S2ResponseCache:
+    """Process-wide S2ResponseCache per database path."""
+    key = str(Path(path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = S2ResponseCache(path)
+            _caches[key] = cache
+        return cache
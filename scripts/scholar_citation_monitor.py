@@ -15,24 +15,50 @@ Usage:
 import os
 import sys
 import json
+import hashlib
 import re
 import argparse
 import logging
 import time
+import asyncio
+import threading
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Deque, Tuple, Set, Callable
+from typing import List, Dict, Any, Optional, Deque, Tuple, Set, Callable, Iterator
 
 import pytz
 import requests
 
+from build_paper_index import PaperIndex, bibtex_key, load_paper_index
+from dedup_index import DEFAULT_DEDUP_THRESHOLD, TitleDedupIndex, paper_ids
+from metrics import (
+    COLLECT_CITATIONS,
+    COLLECT_IN_FLIGHT,
+    COLLECT_QUEUE_DEPTH,
+    COLLECT_SEEDS,
+    S2_CACHE,
+    S2_RATE_LIMIT_WAIT_SECONDS,
+    S2_REQUEST_SECONDS,
+    S2_REQUESTS,
+    S2_RETRIES,
+    RunReport,
+)
+from prefilter import DEFAULT_PREFILTER_THRESHOLD, apply_prefilter
+from result_writer import COMPRESSIONS, ResultWriter, derive_outputs, results_path
+from s2_response_cache import S2ResponseCache, get_response_cache
+from scholar_store import ScholarStore, get_store
 from paper_analysis import (
+    AnalysisCache,
     CATEGORIES,
     GenerationConfig,
     DEFAULT_GENERATION_CONFIG,
     OpenAIClientWrapper,
     analyze_paper as analyze_paper_shared,
+    analyze_papers_batch as analyze_papers_batch_shared,
+    run_async_analysis,
 )
 
 # ============================================================================
@@ -44,7 +70,7 @@ DEFAULT_API_BASE = "http://127.0.0.1:8000/v1"
 DEFAULT_API_KEY = "EMPTY"
 
 # Semantic Scholar API
-SEMANTIC_SCHOLAR_API = "https://api.semanticscholar.org/graph/v1"
+SEMANTIC_SCHOLAR_API = os.environ.get("S2_API_BASE", "https://api.semanticscholar.org/graph/v1")
 DEFAULT_S2_API_KEY = os.environ.get("S2_API_KEY")  # optional
 
 # Paths
@@ -53,18 +79,34 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 HTML_DIR = PROJECT_ROOT / "docs" / "html"
 LOG_DIR = SCRIPT_DIR / "logs"
 PAPER_LOG_DIR = SCRIPT_DIR / "paper_logs"
-CACHE_DIR = SCRIPT_DIR / "cache"
+CACHE_DIR = Path(os.environ.get("SCHOLAR_CACHE_DIR") or SCRIPT_DIR / "cache")
+STORE_FILE = CACHE_DIR / "scholar.sqlite3"
+ANALYSIS_CACHE_FILE = CACHE_DIR / "analysis_cache.sqlite3"
+S2_RESPONSE_CACHE_FILE = CACHE_DIR / "s2_responses.sqlite3"
+CHECKPOINT_FILE = CACHE_DIR / "collect_checkpoint.jsonl"
+PREFILTER_FIT_FILE = CACHE_DIR / "prefilter_fit.json"
 
 # Timezone for Beijing
 BEIJING_TZ = pytz.timezone("Asia/Shanghai")
 
-# Rate limiting (seconds between requests) - Semantic Scholar allows 100 req/5min
-# Using 5 seconds to be safe
-REQUEST_DELAY = 5.0
+# Rate limiting (requests per second) - Semantic Scholar allows 100 req/5min
+# without an API key and 1 req/s with one
+S2_RATE_NO_KEY = 100 / 300
+S2_RATE_WITH_KEY = 1.0
+S2_RATE_BURST = 1
 
 # Paper-level retry (when request failures happen repeatedly)
 MAX_PAPER_RETRIES = 10
 
+# Citing papers, edges and analyses not refreshed for this long are evicted from the store
+STORE_TTL_DAYS = 180
+
+# POST /paper/batch accepts at most 500 ids per request
+S2_BATCH_SIZE = 500
+
+# /paper/{id}/citations returns at most 1000 items per page
+S2_CITATIONS_PAGE_SIZE = 1000
+
 # HTML files containing paper references
 HTML_FILES = [
     "invasive.html",
@@ -103,45 +145,230 @@ logger = setup_logging()
 # Extract Papers from Website
 # ============================================================================
 
+# `const papers = {...}` / `let papers = [...]` in the page scripts
+_PAPERS_DECL_RE = re.compile(r"\b(?:const|let|var)\s+papers\s*=\s*")
+_IDENT_RE = re.compile(r"[A-Za-z_$][\w$]*")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_ARXIV_LINK_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/(\d{4}\.\d{4,5})")
+_ARXIV_EPRINT_RE = re.compile(r"(?:eprint\s*=\s*[{\"]|arXiv:)\s*(\d{4}\.\d{4,5})", re.IGNORECASE)
+_BIBTEX_YEAR_RE = re.compile(r"\byear\s*=\s*[{\"]?\s*((?:19|20)\d{2})")
+_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+_HEX4_RE = re.compile(r"[0-9A-Fa-f]{4}")
+# Fallback when a page has no parsable `papers` literal
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_PAPER_ENTRY_RE = re.compile(r"\{\s*title:\s*[\"']([^\"']+)[\"'][^{}]*?link:\s*[\"']([^\"']+)[\"']")
+
+_JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class _JsLiteralParser:
+    """Single-pass parser for the JS object/array literal holding a page's papers.
+
+    Handles strings in all three quote styles, comments (so commented-out
+    papers are skipped), trailing commas and bare identifiers (read as None).
+    """
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    def _error(self, message: str) -> ValueError:
+        line = self.text.count("\n", 0, self.pos) + 1
+        return ValueError(f"{message} at line {line}")
+
+    def _skip(self):
+        text, n = self.text, len(self.text)
+        while self.pos < n:
+            c = text[self.pos]
+            if c.isspace():
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = n if end < 0 else end + 1
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end < 0:
+                    raise self._error("Unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def _peek(self) -> str:
+        self._skip()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def value(self) -> Any:
+        c = self._peek()
+        if c == "{":
+            return self._object()
+        if c == "[":
+            return self._array()
+        if c in "\"'`":
+            return self._string()
+        match = _NUMBER_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return float(match.group()) if "." in match.group() else int(match.group())
+        match = _IDENT_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return {"true": True, "false": False}.get(match.group())
+        raise self._error(f"Unexpected {c!r}")
+
+    def _object(self) -> Dict[str, Any]:
+        self.pos += 1
+        out: Dict[str, Any] = {}
+        while True:
+            c = self._peek()
+            if c == "}":
+                self.pos += 1
+                return out
+            if c in "\"'":
+                key = self._string()
+            else:
+                match = _IDENT_RE.match(self.text, self.pos)
+                if not match:
+                    raise self._error("Expected object key")
+                key = match.group()
+                self.pos = match.end()
+            if self._peek() != ":":
+                raise self._error("Expected ':'")
+            self.pos += 1
+            out[key] = self.value()
+            c = self._peek()
+            if c == ",":
+                self.pos += 1
+            elif c != "}":
+                raise self._error("Expected ',' or '}'")
+
+    def _array(self) -> List[Any]:
+        self.pos += 1
+        out: List[Any] = []
+        while True:
+            c = self._peek()
+            if c == "]":
+                self.pos += 1
+                return out
+            out.append(self.value())
+            c = self._peek()
+            if c == ",":
+                self.pos += 1
+            elif c != "]":
+                raise self._error("Expected ',' or ']'")
+
+    def _string(self) -> str:
+        text = self.text
+        quote = text[self.pos]
+        self.pos += 1
+        parts: List[str] = []
+        start = self.pos
+        while True:
+            end = self.pos
+            while end < len(text) and text[end] not in (quote, "\\"):
+                end += 1
+            if end >= len(text):
+                self.pos = start
+                raise self._error("Unterminated string")
+            parts.append(text[self.pos:end])
+            if text[end] == quote:
+                self.pos = end + 1
+                return "".join(parts)
+            esc = text[end + 1:end + 2]
+            if esc == "u" and _HEX4_RE.fullmatch(text, end + 2, end + 6):
+                parts.append(chr(int(text[end + 2:end + 6], 16)))
+                self.pos = end + 6
+            else:
+                parts.append(_JS_ESCAPES.get(esc, esc))
+                self.pos = end + 2
+
+
+def _seed_from_entry(entry: Dict[str, Any], source_file: str, section: Optional[str]) -> Optional[Dict[str, Any]]:
+    title = re.sub(r"\s+", " ", str(entry.get("title") or "")).strip()
+    if not title:
+        return None
+    link = str(entry.get("link") or "")
+    bibtex = str(entry.get("bibtex") or "")
+    venue = str(entry.get("venue") or "")
+    paper: Dict[str, Any] = {"title": title, "url": link, "source_file": source_file}
+    if section:
+        paper["section"] = section
+    if venue:
+        paper["venue"] = venue
+    key = bibtex_key(bibtex)
+    if key:
+        paper["bib_key"] = key
+    arxiv_match = _ARXIV_LINK_RE.search(link) or _ARXIV_EPRINT_RE.search(bibtex)
+    if arxiv_match:
+        paper["arxiv_id"] = arxiv_match.group(1)
+    year_match = _BIBTEX_YEAR_RE.search(bibtex) or _YEAR_RE.search(venue)
+    if year_match:
+        paper["year"] = int(year_match.group(1))
+    return paper
+
+
+def parse_papers_from_html(content: str, source_file: str) -> List[Dict[str, Any]]:
+    """Parse seed papers from the `papers` literal(s) of a page.
+
+    Papers inside /* */ or // comments are excluded (commented-out papers).
+    """
+    papers: List[Dict[str, Any]] = []
+    found = False
+    for decl in _PAPERS_DECL_RE.finditer(content):
+        try:
+            literal = _JsLiteralParser(content, decl.end()).value()
+        except ValueError as e:
+            logger.warning(f"Could not parse papers literal in {source_file}: {e}")
+            continue
+        found = True
+        sections = literal.items() if isinstance(literal, dict) else [(None, literal)]
+        for section, entries in sections:
+            for entry in entries if isinstance(entries, list) else []:
+                paper = _seed_from_entry(entry, source_file, section) if isinstance(entry, dict) else None
+                if paper:
+                    papers.append(paper)
+    if found:
+        return papers
+
+    # No papers literal: scan title/link pairs outside comments
+    content_without_comments = _BLOCK_COMMENT_RE.sub("", content)
+    for title, link in _PAPER_ENTRY_RE.findall(content_without_comments):
+        paper = _seed_from_entry({"title": title.replace("\\'", "'"), "link": link}, source_file, None)
+        if paper:
+            papers.append(paper)
+    return papers
+
+
+# Parsed pages by path: (mtime_ns, size, sha256, papers)
+_html_seed_cache: Dict[str, Tuple[int, int, str, List[Dict[str, Any]]]] = {}
+_html_seed_cache_lock = threading.Lock()
+
+
 def extract_papers_from_html(html_path: Path) -> List[Dict[str, Any]]:
     """Extract paper information from an HTML file.
-    
-    Note: Papers wrapped in /* */ comments are excluded (commented out papers).
+
+    Results are cached per file: an unchanged mtime/size skips reading the
+    file, an unchanged content hash skips parsing it.
     """
-    papers = []
-    
+    key = str(html_path)
     try:
-        with open(html_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Remove multi-line comments (/* ... */) to exclude commented-out papers
-        content_without_comments = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        
-        # Extract paper titles and links using regex
-        paper_pattern = r'\{\s*title:\s*["\']([^"\']+)["\'].*?link:\s*["\']([^"\']+)["\']'
-        
-        matches = re.findall(paper_pattern, content_without_comments, re.DOTALL)
-        
-        for title, link in matches:
-            title = title.replace('\\\'', "'").strip()
-            
-            paper = {
-                "title": title,
-                "url": link,
-                "source_file": html_path.name,
-            }
-            
-            # Extract arxiv ID if present
-            arxiv_match = re.search(r'arxiv\.org/abs/(\d+\.\d+)', link)
-            if arxiv_match:
-                paper["arxiv_id"] = arxiv_match.group(1)
-            
-            papers.append(paper)
-            
+        stat = html_path.stat()
+        with _html_seed_cache_lock:
+            cached = _html_seed_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return [dict(p) for p in cached[3]]
+
+        raw = html_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached[2] == digest:
+            papers = cached[3]
+        else:
+            papers = parse_papers_from_html(raw.decode("utf-8"), html_path.name)
+        with _html_seed_cache_lock:
+            _html_seed_cache[key] = (stat.st_mtime_ns, stat.st_size, digest, papers)
+        return [dict(p) for p in papers]
     except Exception as e:
         logger.error(f"Error parsing {html_path}: {e}")
-    
-    return papers
+        return []
 
 
 def extract_all_existing_papers() -> List[Dict[str, Any]]:
@@ -181,25 +408,150 @@ def _normalize_title(title: str) -> str:
     return re.sub(r"\s+", " ", (title or "").strip().lower())
 
 
+def _s2_endpoint(path: str) -> str:
+    """Metric label for an API path, with the paper id replaced: paper/{id}/citations."""
+    parts = path.strip("/").split("/")
+    if len(parts) == 3 and parts[0] == "paper":
+        parts[1] = "{id}"
+    return "/".join(parts)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket rate limiter, safe to share across threads and asyncio tasks.
+
+    Each acquire reserves the next free slot under a short lock and then waits
+    outside it, so concurrent callers are spaced at `rate_per_s` (with bursts
+    up to `burst`) without serializing on the lock. `penalize` pushes every
+    caller back, e.g. when the server answers 429 with Retry-After.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int = S2_RATE_BURST):
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = float(rate_per_s)
+        self.burst = max(1, int(burst))
+        self._interval = 1.0 / self.rate_per_s
+        # Theoretical arrival time of the next request when the bucket is empty
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            earliest = self._next_at - (self.burst - 1) * self._interval
+            start = max(now, earliest)
+            self._next_at = max(self._next_at, now) + self._interval
+            return start - now
+
+    def acquire(self) -> None:
+        wait_s = self._reserve()
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    async def acquire_async(self) -> None:
+        wait_s = self._reserve()
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+
+    def penalize(self, wait_s: float) -> None:
+        """Block all callers for at least wait_s seconds from now."""
+        with self._lock:
+            blocked_until = time.monotonic() + max(0.0, wait_s) + (self.burst - 1) * self._interval
+            self._next_at = max(self._next_at, blocked_until)
+
+
+_shared_rate_limiters: Dict[Optional[str], TokenBucket] = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(api_key: Optional[str]) -> TokenBucket:
+    """Process-wide limiter per API key (None = unauthenticated pool)."""
+    with _shared_rate_limiters_lock:
+        limiter = _shared_rate_limiters.get(api_key)
+        if limiter is None:
+            rate = S2_RATE_WITH_KEY if api_key else S2_RATE_NO_KEY
+            limiter = TokenBucket(rate)
+            _shared_rate_limiters[api_key] = limiter
+        return limiter
+
+
+def get_shared_response_cache() -> S2ResponseCache:
+    """Process-wide S2 response cache at S2_RESPONSE_CACHE_FILE."""
+    return get_response_cache(S2_RESPONSE_CACHE_FILE)
+
+
+class OfflineCacheMiss(RuntimeError):
+    """A request in offline mode that the response cache cannot answer."""
+
+
+def _is_not_found(endpoint: str, data: Any) -> bool:
+    """Answers that must not be cached: a title search or batch lookup that found nothing.
+
+    A miss may be an indexing delay or a transient hiccup, so it is asked
+    again next time instead of sticking for the endpoint's whole TTL.
+    """
+    if endpoint == "paper/search":
+        return not (isinstance(data, dict) and data.get("data"))
+    if endpoint == "paper/batch":
+        return data is None
+    return False
+
+
 class SemanticScholarClient:
-    """Thin Semantic Scholar Graph API client with retries."""
+    """Thin Semantic Scholar Graph API client with retries.
+
+    Every request attempt, including retries, takes a token from
+    `rate_limiter`. By default clients share one process-wide bucket per API
+    key, sized for the keyed or unauthenticated quota. `request_count` counts
+    the attempts made by this client (for request budgets).
+
+    With a `response_cache`, fresh cached responses are returned without a
+    request (and without counting or taking a token); searches and lookups
+    that found nothing are not cached. With offline=True, cached responses
+    are used whatever their age and anything not cached raises
+    OfflineCacheMiss instead of going to the network.
+    """
 
     def __init__(
         self,
         *,
         base_url: str = SEMANTIC_SCHOLAR_API,
         api_key: Optional[str] = DEFAULT_S2_API_KEY,
-        request_delay_s: float = REQUEST_DELAY,
+        rate_limiter: Optional[TokenBucket] = None,
         max_retries: int = MAX_RETRIES,
         retry_delay_s: float = RETRY_DELAY,
         timeout_s: float = 30.0,
+        response_cache: Optional[S2ResponseCache] = None,
+        offline: bool = False,
     ):
+        if offline and response_cache is None:
+            raise ValueError("offline mode needs a response_cache")
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.request_delay_s = float(request_delay_s)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter(api_key)
         self.max_retries = int(max_retries)
         self.retry_delay_s = float(retry_delay_s)
         self.timeout_s = float(timeout_s)
+        self.response_cache = response_cache
+        self.offline = offline
+        self.request_count = 0
+        self._count_lock = threading.Lock()
 
         self.session = requests.Session()
         self.headers: Dict[str, str] = {
@@ -209,44 +561,94 @@ class SemanticScholarClient:
         if self.api_key:
             self.headers["x-api-key"] = self.api_key
 
-    def _request_json(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _request_json(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        *,
+        method: str = "GET",
+        json_body: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
+    ) -> Any:
         url = f"{self.base_url}/{path.lstrip('/')}"
+        endpoint = _s2_endpoint(path)
         last_exc: Optional[Exception] = None
 
+        cache_key = None
+        if cache and self.response_cache is not None:
+            cache_key = S2ResponseCache.make_key(method, path, params, json_body)
+            found, data = self._cache_get(cache_key, endpoint)
+            if found:
+                return data
+        if self.offline:
+            raise OfflineCacheMiss(f"Not in the response cache (offline mode): {method} {path} {params}")
+
         for attempt in range(1, self.max_retries + 1):
+            with S2_RATE_LIMIT_WAIT_SECONDS.time():
+                self.rate_limiter.acquire()
+            with self._count_lock:
+                self.request_count += 1
+            started = time.perf_counter()
             try:
-                resp = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout_s)
+                resp = self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json_body,
+                    headers=self.headers,
+                    timeout=self.timeout_s,
+                )
+                S2_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+                S2_REQUESTS.inc(endpoint=endpoint, status=resp.status_code)
 
                 # Rate limiting (429)
                 if resp.status_code == 429:
-                    retry_after = resp.headers.get("Retry-After")
-                    wait_s = float(retry_after) if retry_after and str(retry_after).isdigit() else self.retry_delay_s
-                    logger.warning(f"[429] Rate limited. Sleep {wait_s:.1f}s then retry {attempt}/{self.max_retries}.")
-                    time.sleep(wait_s)
+                    S2_RETRIES.inc(endpoint=endpoint, reason="429")
+                    wait_s = _parse_retry_after(resp.headers.get("Retry-After"))
+                    if wait_s is None:
+                        wait_s = self.retry_delay_s
+                    logger.warning(f"[429] Rate limited. Back off {wait_s:.1f}s then retry {attempt}/{self.max_retries}.")
+                    self.rate_limiter.penalize(wait_s)
                     continue
 
                 # Server errors (5xx)
                 if resp.status_code >= 500:
+                    S2_RETRIES.inc(endpoint=endpoint, reason="5xx")
                     logger.warning(f"[{resp.status_code}] Server error. Sleep {self.retry_delay_s:.1f}s then retry {attempt}/{self.max_retries}.")
                     time.sleep(self.retry_delay_s)
                     continue
 
                 resp.raise_for_status()
-                return resp.json()
+                data = resp.json()
+                if cache_key is not None and not _is_not_found(endpoint, data):
+                    self.response_cache.put(cache_key, endpoint, data)
+                return data
 
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
                 last_exc = e
+                reason = "timeout" if isinstance(e, requests.exceptions.Timeout) else "connection_error"
+                S2_REQUESTS.inc(endpoint=endpoint, status=reason)
+                S2_RETRIES.inc(endpoint=endpoint, reason=reason)
                 logger.warning(f"Request failed ({type(e).__name__}). Sleep {self.retry_delay_s:.1f}s then retry {attempt}/{self.max_retries}.")
                 time.sleep(self.retry_delay_s)
                 continue
             except requests.exceptions.RequestException as e:
                 last_exc = e
+                S2_RETRIES.inc(endpoint=endpoint, reason="request_error")
                 logger.warning(f"Request error: {e}. Sleep {self.retry_delay_s:.1f}s then retry {attempt}/{self.max_retries}.")
                 time.sleep(self.retry_delay_s)
                 continue
 
         raise RuntimeError(f"Semantic Scholar request failed after {self.max_retries} retries: {url}") from last_exc
 
+    def _cache_get(self, key: str, endpoint: str) -> Tuple[bool, Any]:
+        status, data = self.response_cache.get(key, endpoint, ignore_ttl=self.offline)
+        if status == "hit" and _is_not_found(endpoint, data):
+            # Stored by older versions; ask again
+            status, data = "miss", None
+        S2_CACHE.inc(endpoint=endpoint, result=status)
+        return status == "hit", data
+
     def search_paper_by_title(self, title: str) -> Optional[Dict[str, Any]]:
         data = self._request_json(
             "/paper/search",
@@ -259,85 +661,417 @@ class SemanticScholarClient:
         items = data.get("data") or []
         return items[0] if items else None
 
-    def get_citations(self, paper_id: str, limit: int) -> List[Dict[str, Any]]:
-        data = self._request_json(
-            f"/paper/{paper_id}/citations",
-            {
-                "limit": limit,
-                "fields": "paperId,title,authors,year,abstract,venue,url,citationCount",
-            },
-        )
+    def get_papers_batch(
+        self,
+        ids: List[str],
+        fields: str = "paperId,title,year,citationCount",
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Look up papers by id via POST /paper/batch, in chunks of S2_BATCH_SIZE.
+
+        ids may be S2 paperIds or prefixed ids such as "ARXIV:2507.08288".
+        The result is aligned with ids; unknown ids map to None. With a
+        response cache, each id found is cached on its own and only the ids
+        not cached are requested. In offline mode ids not cached map to None,
+        so callers fall back to title search, which raises OfflineCacheMiss.
+        """
+        out: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+        keys: List[Optional[str]] = [None] * len(ids)
+        missing = list(range(len(ids)))
+        if self.response_cache is not None:
+            missing = []
+            for i, paper_id in enumerate(ids):
+                keys[i] = S2ResponseCache.make_key("POST", "/paper/batch", {"fields": fields}, paper_id)
+                found, out[i] = self._cache_get(keys[i], "paper/batch")
+                if not found:
+                    missing.append(i)
+            if self.offline:
+                if missing:
+                    logger.info(f"  {len(missing)}/{len(ids)} ids not in the response cache (offline mode)")
+                return out
+
+        for start in range(0, len(missing), S2_BATCH_SIZE):
+            chunk = missing[start:start + S2_BATCH_SIZE]
+            data = self._request_json(
+                "/paper/batch",
+                {"fields": fields},
+                method="POST",
+                json_body={"ids": [ids[i] for i in chunk]},
+                cache=False,
+            )
+            items = data if isinstance(data, list) else []
+            items = items + [None] * (len(chunk) - len(items))
+            for i, item in zip(chunk, items):
+                out[i] = item
+                if keys[i] is None or _is_not_found("paper/batch", item):
+                    continue
+                self.response_cache.put(keys[i], "paper/batch", item)
+                # Later runs look the seed up by the paperId it resolved to
+                if item.get("paperId") and item["paperId"] != ids[i]:
+                    alias = S2ResponseCache.make_key("POST", "/paper/batch", {"fields": fields}, item["paperId"])
+                    self.response_cache.put(alias, "paper/batch", item)
+        return out
+
+    def iter_citation_pages(
+        self,
+        paper_id: str,
+        max_results: Optional[int] = None,
+        page_size: int = S2_CITATIONS_PAGE_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of citing papers, following offset/next until exhausted.
+
+        Stops after max_results citations (None or 0 = no cap). Each page is
+        yielded as soon as it arrives, so callers can process it before the
+        next request is made.
+        """
+        offset = 0
+        fetched = 0
+        page_size = max(1, min(int(page_size), S2_CITATIONS_PAGE_SIZE))
+        while not max_results or fetched < max_results:
+            limit = page_size if not max_results else min(page_size, max_results - fetched)
+            data = self._request_json(
+                f"/paper/{paper_id}/citations",
+                {
+                    "offset": offset,
+                    "limit": limit,
+                    "fields": "paperId,title,authors,year,abstract,venue,url,citationCount",
+                },
+            )
+            items = data.get("data") or []
+            fetched += len(items)
+            page: List[Dict[str, Any]] = []
+            for item in items:
+                citing_paper = (item or {}).get("citingPaper") or {}
+                if citing_paper.get("title"):
+                    page.append(citing_paper)
+            if page:
+                yield page
+
+            next_offset = data.get("next")
+            if not items or next_offset is None:
+                break
+            offset = int(next_offset)
+
+    def get_citations(self, paper_id: str, limit: Optional[int]) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
-        for item in data.get("data", []):
-            citing_paper = (item or {}).get("citingPaper") or {}
-            if citing_paper.get("title"):
-                out.append(citing_paper)
+        for page in self.iter_citation_pages(paper_id, max_results=limit):
+            out.extend(page)
         return out
 
 
+def open_store() -> ScholarStore:
+    """Shared store at STORE_FILE, importing the old JSON caches on first use."""
+    store = get_store(STORE_FILE)
+    store.import_legacy_json(CACHE_DIR)
+    return store
+
+
+def _seed_identifier(paper: Dict[str, Any], id_cache: Dict[str, str]) -> Optional[str]:
+    """Best identifier for POST /paper/batch, or None if only the title is known."""
+    paper_id = (
+        paper.get("semantic_scholar_id")
+        or paper.get("paperId")
+        or id_cache.get(_normalize_title(paper.get("title", "")))
+    )
+    if paper_id:
+        return paper_id
+    if paper.get("arxiv_id"):
+        return f"ARXIV:{paper['arxiv_id']}"
+    return None
+
+
+def enrich_seeds_from_index(papers: List[Dict[str, Any]], paper_index: PaperIndex) -> int:
+    """Fill in arxiv_id, year and bib_key from the paper index, in place; returns the number of matches."""
+    matched = 0
+    for paper in papers:
+        entry = paper_index.lookup(paper.get("title", ""), paper.get("arxiv_id"))
+        if not entry:
+            continue
+        matched += 1
+        if entry.get("arxiv") and not paper.get("arxiv_id"):
+            paper["arxiv_id"] = entry["arxiv"]
+        if entry.get("year") and not paper.get("year"):
+            paper["year"] = entry["year"]
+        if not paper.get("bib_key") and not entry["key"].startswith("page:"):
+            paper["bib_key"] = entry["key"]
+    logger.info(f"Paper index matched {matched}/{len(papers)} seeds")
+    return matched
+
+
+def resolve_seed_papers(
+    s2: "SemanticScholarClient",
+    papers: List[Dict[str, Any]],
+    id_cache: Optional[Dict[str, str]] = None,
+    paper_index: Optional[PaperIndex] = None,
+) -> List[Dict[str, Any]]:
+    """Resolve seed papers to S2 paperIds in bulk.
+
+    Seeds with a known paperId (explicit or from id_cache) or an arXiv id are
+    looked up through POST /paper/batch; seeds without an arXiv id get one
+    from the prebuilt paper index (references.bib) when it has a match.
+    Returns copies of the seeds; resolved ones carry "semantic_scholar_id"
+    and "citation_count". Seeds left without an id fall back to title search
+    in search_citations_for_paper.
+    """
+    id_cache = id_cache if id_cache is not None else {}
+    resolved = [dict(p) for p in papers]
+    paper_index = paper_index if paper_index is not None else load_paper_index()
+    if paper_index:
+        enrich_seeds_from_index(resolved, paper_index)
+
+    identifiers: Dict[str, List[int]] = {}
+    for i, paper in enumerate(resolved):
+        ident = _seed_identifier(paper, id_cache)
+        if ident:
+            identifiers.setdefault(ident, []).append(i)
+    if not identifiers:
+        return resolved
+
+    ids = list(identifiers)
+    logger.info(f"Resolving {len(ids)} seed identifiers via /paper/batch...")
+    try:
+        results = s2.get_papers_batch(ids)
+    except RuntimeError as e:
+        logger.warning(f"Batch resolution failed, falling back to title search: {e}")
+        return resolved
+
+    hits = 0
+    for ident, item in zip(ids, results):
+        if not item or not item.get("paperId"):
+            continue
+        hits += 1
+        for i in identifiers[ident]:
+            resolved[i]["semantic_scholar_id"] = item["paperId"]
+            resolved[i]["citation_count"] = item.get("citationCount", 0)
+    unresolved = sum(1 for p in resolved if not p.get("semantic_scholar_id"))
+    logger.info(f"  Resolved {hits}/{len(ids)} identifiers in bulk; {unresolved} seeds left for title search")
+    return resolved
+
+
+def _citation_key(citation: Dict[str, Any]) -> str:
+    """Dedup key for a citation: S2 id if known, otherwise the normalized title."""
+    ssid = citation.get("semantic_scholar_id") or ""
+    if ssid:
+        return f"s2:{ssid}"
+    return f"title:{_normalize_title(citation.get('title', ''))}"
+
+
+def _format_citation(citing_paper: Dict[str, Any], cited_title: str) -> Dict[str, Any]:
+    # Format authors
+    authors = citing_paper.get("authors", [])
+    author_names = ", ".join([a.get("name", "") for a in authors[:5]])
+    if len(authors) > 5:
+        author_names += " et al."
+
+    return {
+        "title": citing_paper.get("title", ""),
+        "authors": author_names,
+        "year": citing_paper.get("year", ""),
+        "venue": citing_paper.get("venue", ""),
+        "abstract": citing_paper.get("abstract", ""),
+        "url": citing_paper.get("url", ""),
+        "semantic_scholar_id": citing_paper.get("paperId", ""),
+        "citation_count": citing_paper.get("citationCount", 0),
+        "cited_paper": cited_title,
+    }
+
+
 def search_citations_for_paper(
     s2: SemanticScholarClient,
     paper: Dict[str, Any],
-    max_citations: int = 50,
+    max_citations: Optional[int] = 50,
+    skip_keys: Optional[Set[str]] = None,
+    previous: Optional[Dict[str, Any]] = None,
+    citing_ids: Optional[Set[str]] = None,
 ) -> Tuple[List[Dict[str, Any]], str]:
-    """Search Semantic Scholar for papers that cite the given paper."""
+    """Search Semantic Scholar for papers that cite the given paper.
+
+    Citations are paged in as they arrive (max_citations None or 0 = all).
+    Citations whose key is already in skip_keys, or repeated within this seed,
+    are dropped page by page instead of being held until the end.
+
+    Incremental mode: `previous` is this seed's record from the last run
+    ({"citation_count", "citing_ids"}). If the citation count is unchanged the
+    seed is reported as "unchanged" without fetching citations; otherwise only
+    citing papers not in previous["citing_ids"] are returned, and paging stops
+    once the expected number of new ones has been seen. The S2 id of every
+    citing paper fetched is added to `citing_ids` if given.
+    """
     citations = []
     title = paper["title"]
     
     logger.info(f"Searching citations for: {title[:50]}...")
     
-    # First, find the paper on Semantic Scholar
-    ss_paper = s2.search_paper_by_title(title)
-    time.sleep(s2.request_delay_s)
-
-    if ss_paper is None:
-        logger.warning("  Seed paper not found on Semantic Scholar")
-        return citations, "not_found"
-    
-    paper_id = ss_paper.get("paperId")
-    citation_count = ss_paper.get("citationCount", 0)
-    logger.info(f"  Found paper (ID: {paper_id}, Citations: {citation_count})")
+    # Use the id resolved in bulk if available; otherwise fall back to title search
+    paper_id = paper.get("semantic_scholar_id")
+    if paper_id:
+        citation_count = paper.get("citation_count", 0)
+        logger.info(f"  Resolved paper (ID: {paper_id}, Citations: {citation_count})")
+    else:
+        ss_paper = s2.search_paper_by_title(title)
+
+        if ss_paper is None:
+            logger.warning("  Seed paper not found on Semantic Scholar")
+            return citations, "not_found"
+
+        paper_id = ss_paper.get("paperId")
+        citation_count = ss_paper.get("citationCount", 0)
+        paper["semantic_scholar_id"] = paper_id
+        paper["citation_count"] = citation_count
+        logger.info(f"  Found paper (ID: {paper_id}, Citations: {citation_count})")
+
+    known_ids: Set[str] = set()
+    max_new: Optional[int] = None
+    if previous is not None:
+        previous_count = previous.get("citation_count")
+        if previous_count is not None and previous_count == citation_count:
+            logger.info("  Citation count unchanged since last run, skipping")
+            return citations, "unchanged"
+        known_ids = set(previous.get("citing_ids") or [])
+        if previous_count is not None and citation_count and citation_count > previous_count:
+            max_new = citation_count - previous_count
+
+    retrieved = 0
+    new_ids = 0
+    local_keys: Set[str] = set()
+    for page in s2.iter_citation_pages(paper_id, max_results=max_citations):
+        retrieved += len(page)
+        for citing_paper in page:
+            ssid = citing_paper.get("paperId")
+            if ssid:
+                if citing_ids is not None:
+                    citing_ids.add(ssid)
+                if ssid in known_ids:
+                    continue
+                new_ids += 1
+            citation = _format_citation(citing_paper, title)
+            key = _citation_key(citation)
+            if key in local_keys or (skip_keys is not None and key in skip_keys):
+                continue
+            local_keys.add(key)
+            citations.append(citation)
+        if max_new is not None and new_ids >= max_new:
+            logger.info(f"  Found all {max_new} new citing papers, stop paging")
+            break
 
-    time.sleep(s2.request_delay_s)
-    raw_citations = s2.get_citations(paper_id, limit=max_citations)
-    
-    for citing_paper in raw_citations:
-        # Format authors
-        authors = citing_paper.get("authors", [])
-        author_names = ", ".join([a.get("name", "") for a in authors[:5]])
-        if len(authors) > 5:
-            author_names += " et al."
-        
-        citation = {
-            "title": citing_paper.get("title", ""),
-            "authors": author_names,
-            "year": citing_paper.get("year", ""),
-            "venue": citing_paper.get("venue", ""),
-            "abstract": citing_paper.get("abstract", ""),
-            "url": citing_paper.get("url", ""),
-            "semantic_scholar_id": citing_paper.get("paperId", ""),
-            "citation_count": citing_paper.get("citationCount", 0),
-            "cited_paper": title,
-        }
-        citations.append(citation)
-    
-    logger.info(f"  Retrieved {len(citations)} citations")
-    time.sleep(s2.request_delay_s)
+    logger.info(f"  Retrieved {retrieved} citations ({len(citations)} not seen before)")
     return citations, "ok"
 
 
+class CollectCheckpoint:
+    """Append-only JSONL journal of a collect_all_citations run.
+
+    The first line is a "start" record identifying the run (seed titles and
+    options). It is followed by a "resolved" record with the bulk-resolved
+    seed ids, then one "seed" record per finished seed and one "retry" record
+    per requeue. A truncated last line from a crash is ignored on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+
+    def load_run(self, header: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records written after `header`, or [] if the file belongs to another run."""
+        if not self.path.exists():
+            return []
+        records: List[Dict[str, Any]] = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        if not records or records[0] != header:
+            logger.warning(f"Checkpoint {self.path} does not match this run, starting over")
+            return []
+        return records[1:]
+
+    def start(self, header: Dict[str, Any]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self.append(header)
+
+    def reopen(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def append(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self, remove: bool = False):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if remove and self.path.exists():
+            self.path.unlink()
+
+
 def collect_all_citations(
     existing_papers: List[Dict[str, Any]],
     max_citations_per_paper: int = 50,
     max_papers_to_check: int = None,
     s2_api_key: Optional[str] = None,
     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    s2_rate_per_s: Optional[float] = None,
+    workers: int = 1,
+    incremental: bool = False,
+    checkpoint_path: Optional[Path] = None,
+    resume: bool = False,
+    store: Optional[ScholarStore] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD,
+    s2_client: Optional["SemanticScholarClient"] = None,
+    s2_cache: bool = True,
+    offline: bool = False,
 ) -> List[Dict[str, Any]]:
-    """Collect citations for all existing papers. Optional progress_callback(event_dict)."""
+    """Collect citations for all existing papers. Optional progress_callback(event_dict).
+
+    s2_rate_per_s overrides the shared Semantic Scholar rate limit for this run.
+    s2_client replaces the default client (then s2_api_key, s2_rate_per_s,
+    s2_cache and offline are ignored), e.g. one pointed at another base_url.
+    s2_cache=True answers repeated requests from the shared S2 response cache;
+    offline=True never goes to the network; a seed whose responses are not
+    cached is skipped with an "offline_miss" paper event instead of looking
+    like a seed without citations, and the run carries on with the others.
+    The skipped seeds are listed in the log at the end; their checkpoint is
+    kept, so a later online run with resume=True fetches only those.
+    With workers > 1, seeds are fetched concurrently on a thread pool (all
+    threads share the client's rate limiter). Results are committed in seed
+    order, so dedup, output order and the "paper"/"progress" events are the
+    same regardless of which request finishes first; "retry" events are sent
+    as soon as a seed is requeued.
+
+    Resolved seed ids and citation edges are kept in `store` (default: the
+    shared store at STORE_FILE). With incremental=True, seeds whose count has not changed are skipped
+    ("unchanged" event) and only citing papers not seen for that seed in an
+    earlier run are returned.
+
+    With checkpoint_path, progress is appended to a CollectCheckpoint after
+    every finished seed and the file is removed once the run completes.
+    resume=True replays a matching checkpoint left by an interrupted run
+    (citations, finished seeds, retry counters) and only fetches what is left.
+
+    should_stop() is polled before each seed is started; once it returns True
+    no new seeds are started, in-flight ones are finished and the citations
+    committed so far are returned. The checkpoint is kept so the run can be
+    resumed.
+
+    Besides exact S2 id/title keys, citations whose title is a near-duplicate
+    (character n-gram Jaccard >= dedup_threshold, via TitleDedupIndex) of a
+    seed or an already collected citation are dropped; 0 disables this.
+    Records whose S2/DOI/arXiv ids differ are never treated as duplicates,
+    and fuzzy matches need one side without ids.
+    """
     all_citations = []
     seen_keys: Set[str] = set()
+    title_index = TitleDedupIndex(threshold=dedup_threshold) if dedup_threshold else None
 
-    s2 = SemanticScholarClient(api_key=s2_api_key or DEFAULT_S2_API_KEY)
+    s2 = s2_client or SemanticScholarClient(
+        api_key=s2_api_key or DEFAULT_S2_API_KEY,
+        rate_limiter=TokenBucket(s2_rate_per_s) if s2_rate_per_s else None,
+        response_cache=get_shared_response_cache() if s2_cache or offline else None,
+        offline=offline,
+    )
     
     # Add existing paper titles to seen set
     for paper in existing_papers:
@@ -347,119 +1081,272 @@ def collect_all_citations(
     if max_papers_to_check:
         papers_to_check = existing_papers[:max_papers_to_check]
 
-    # Queue-based processing: if request failures happen, requeue and retry up to MAX_PAPER_RETRIES.
-    queue: Deque[Tuple[Dict[str, Any], int]] = deque((p, 0) for p in papers_to_check)
+    checkpoint = CollectCheckpoint(checkpoint_path) if checkpoint_path else None
+    header = {
+        "type": "start",
+        "seeds": [_normalize_title(p["title"]) for p in papers_to_check],
+        "max_citations": max_citations_per_paper,
+        "incremental": incremental,
+    }
+    replay = checkpoint.load_run(header) if checkpoint and resume else []
+    resolved_record = next((r for r in replay if r.get("type") == "resolved"), None)
+    if resolved_record is None:
+        replay = []
+
+    # Resolve ids in bulk; title search is only the fallback for seeds without an identifier
+    store = store or open_store()
+    if resolved_record is not None:
+        papers_to_check = [dict(p, **ids) for p, ids in zip(papers_to_check, resolved_record["seeds"])]
+    else:
+        id_cache = store.get_seed_ids(p["title"] for p in papers_to_check)
+        papers_to_check = resolve_seed_papers(s2, papers_to_check, id_cache)
+
+    # Seeds go into the near-duplicate index with the ids resolved above
+    if title_index is not None:
+        for paper in papers_to_check + existing_papers[len(papers_to_check):]:
+            title_index.add(f"title:{_normalize_title(paper['title'])}", paper["title"], paper_ids(paper))
+
+    if checkpoint and replay:
+        logger.info(f"Resuming from checkpoint {checkpoint.path}")
+        checkpoint.reopen()
+    elif checkpoint:
+        checkpoint.start(header)
+        checkpoint.append({
+            "type": "resolved",
+            "seeds": [
+                {k: p[k] for k in ("semantic_scholar_id", "citation_count") if k in p}
+                for p in papers_to_check
+            ],
+        })
+
     total = len(papers_to_check)
     attempts = 0
     completed = 0
 
-    while queue:
-        paper, tries = queue.popleft()
-        attempts += 1
-        logger.info(f"[{attempts}/{total}] Processing: {paper['title'][:50]}... (try {tries + 1}/{MAX_PAPER_RETRIES})")
-
-        try:
-            citations, status = search_citations_for_paper(s2, paper, max_citations=max_citations_per_paper)
-        except RuntimeError as e:
-            # Request failed even after internal retries -> requeue paper-level up to 10 times
-            if tries + 1 < MAX_PAPER_RETRIES:
-                logger.warning(f"Request failed for seed, requeueing: {e}")
-                if progress_callback:
-                    progress_callback({
-                        "type": "paper",
-                        "action": "retry",
-                        "title": paper["title"],
-                        "attempt": tries + 1,
-                        "max_retries": MAX_PAPER_RETRIES,
-                        "attempts": attempts,
-                        "completed": completed,
-                        "total": total,
-                        "reason": str(e),
-                    })
-                queue.append((paper, tries + 1))
-                time.sleep(RETRY_DELAY)
-                continue
-            logger.error(f"Seed failed after {MAX_PAPER_RETRIES} attempts, skipping: {paper['title'][:80]}")
-            completed += 1
-            if progress_callback:
-                progress_callback({
-                    "type": "paper",
-                    "action": "failed",
-                    "title": paper["title"],
-                    "attempt": tries + 1,
-                    "max_retries": MAX_PAPER_RETRIES,
-                    "attempts": attempts,
-                    "completed": completed,
-                    "total": total,
-                    "count": len(all_citations),
-                    "reason": str(e),
-                })
-                progress_callback({
-                    "type": "progress",
-                    "processed": completed,
-                    "total": total,
-                    "title": paper["title"],
-                    "count": len(all_citations),
-                })
-            continue
-
-        if status == "not_found":
-            completed += 1
-            if progress_callback:
-                progress_callback({
-                    "type": "paper",
-                    "action": "not_found",
-                    "title": paper["title"],
-                    "attempt": tries + 1,
-                    "max_retries": MAX_PAPER_RETRIES,
-                    "attempts": attempts,
-                    "completed": completed,
-                    "total": total,
-                    "count": len(all_citations),
-                })
-                progress_callback({
-                    "type": "progress",
-                    "processed": completed,
-                    "total": total,
-                    "title": paper["title"],
-                    "count": len(all_citations),
-                })
-            continue
-
-        added_this_round = 0
-        for citation in citations:
-            ssid = citation.get("semantic_scholar_id") or ""
-            if ssid:
-                key = f"s2:{ssid}"
-            else:
-                key = f"title:{_normalize_title(citation.get('title', ''))}"
-            if key and key not in seen_keys:
-                seen_keys.add(key)
-                all_citations.append(citation)
-                added_this_round += 1
+    # Finished seeds wait here until every earlier seed is finished, then get committed in order
+    outcomes: Dict[int, Tuple[str, int, Any, Set[str]]] = {}
+    next_to_commit = 0
+    offline_misses: List[int] = []
+
+    def update_citation_state(paper: Dict[str, Any], fetched_ids: Set[str]):
+        paper_id = paper.get("semantic_scholar_id")
+        if not paper_id:
+            return
+        record = store.get_citation_state(paper_id)
+        known = set(record["citing_ids"])
+        previous_count = record["citation_count"]
+        current_count = paper.get("citation_count")
+        # Every fetched edge is written, so its updated_at is refreshed too
+        store.add_edges(paper_id, fetched_ids)
+        if not incremental:
+            return
+        # Only record the new count once every new citing paper has been seen,
+        # otherwise the next run would skip the seed with citations still missing
+        truncated = bool(max_citations_per_paper) and len(fetched_ids) >= max_citations_per_paper
+        found_all_new = (
+            previous_count is not None
+            and current_count is not None
+            and len(fetched_ids - known) >= current_count - previous_count
+        )
+        if found_all_new or not truncated:
+            store.set_synced_count(paper_id, paper["title"], current_count)
 
+    def commit(index: int, status: str, tries: int, payload: Any, fetched_ids: Set[str], replaying: bool = False):
+        nonlocal completed
+        paper = papers_to_check[index]
         completed += 1
+        event = {
+            "type": "paper",
+            "action": status,
+            "title": paper["title"],
+            "attempt": tries + 1,
+            "max_retries": MAX_PAPER_RETRIES,
+            "attempts": attempts,
+            "completed": completed,
+            "total": total,
+        }
+
+        if status == "failed":
+            logger.error(f"Seed failed after {tries + 1} attempts, skipping: {paper['title'][:80]}")
+            event["reason"] = payload
+        elif status == "offline_miss":
+            logger.warning(f"Not in the response cache (offline mode), skipping: {paper['title'][:80]}")
+            offline_misses.append(index)
+            event["reason"] = payload
+        elif status == "ok":
+            added_this_round = 0
+            for citation in payload:
+                key = _citation_key(citation)
+                if key and key not in seen_keys:
+                    seen_keys.add(key)
+                    if title_index is not None:
+                        duplicate_of = title_index.find_or_add(key, citation.get("title", ""), paper_ids(citation))
+                        if duplicate_of is not None:
+                            logger.info(f"  Near-duplicate of {duplicate_of}, skipping: {citation.get('title', '')[:60]}")
+                            continue
+                    all_citations.append(citation)
+                    added_this_round += 1
+            if not replaying:
+                COLLECT_CITATIONS.inc(added_this_round)
+            event["action"] = "success"
+            event["added"] = added_this_round  # 本种子新加入的篇数（去重后）
+            update_citation_state(paper, fetched_ids)
+
+        if replaying:
+            return
+        event["count"] = len(all_citations)
         if progress_callback:
+            progress_callback(event)
             progress_callback({
-                "type": "paper",
-                "action": "success",
-                "title": paper["title"],
-                "attempt": tries + 1,
-                "max_retries": MAX_PAPER_RETRIES,
-                "attempts": attempts,
-                "completed": completed,
+                "type": "progress",
+                "processed": completed,
                 "total": total,
-                "added": added_this_round,  # 本种子新加入的篇数（去重后）
+                "title": paper["title"],
                 "count": len(all_citations),
             })
+
+    def finish(index: int, status: str, tries: int, payload: Any, fetched_ids: Set[str]):
+        """Record a seed's final outcome; it is committed once all earlier seeds are."""
+        outcomes[index] = (status, tries, payload, fetched_ids)
+        # Offline misses are left out of the checkpoint so a resumed run fetches them
+        if checkpoint and status != "offline_miss":
+            paper = papers_to_check[index]
+            record = {
+                "type": "seed",
+                "index": index,
+                "status": status,
+                "tries": tries,
+                "paper": {k: paper[k] for k in ("semantic_scholar_id", "citation_count") if k in paper},
+                "payload": payload,
+            }
+            if incremental:
+                record["citing_ids"] = sorted(fetched_ids)
+            checkpoint.append(record)
+
+    def commit_ready(replayed: Set[int]):
+        nonlocal next_to_commit
+        while next_to_commit in outcomes:
+            status, tries, payload, fetched_ids = outcomes.pop(next_to_commit)
+            commit(next_to_commit, status, tries, payload, fetched_ids, replaying=next_to_commit in replayed)
+            next_to_commit += 1
+
+    # Replay finished seeds and retry counters from the checkpoint
+    replayed: Set[int] = set()
+    tries_by_index: Dict[int, int] = {}
+    for record in replay:
+        if record.get("type") == "retry":
+            tries_by_index[record["index"]] = record["tries"]
+        elif record.get("type") == "seed":
+            index = record["index"]
+            papers_to_check[index].update(record.get("paper") or {})
+            outcomes[index] = (record["status"], record["tries"], record["payload"], set(record.get("citing_ids") or []))
+            replayed.add(index)
+    if replay:
+        commit_ready(replayed)
+        logger.info(f"Resumed {len(replayed)}/{total} finished seeds, {len(all_citations)} citations")
+        if progress_callback:
             progress_callback({
                 "type": "progress",
                 "processed": completed,
                 "total": total,
-                "title": paper["title"],
+                "title": "",
                 "count": len(all_citations),
             })
-    
+
+    # Queue-based processing: if request failures happen, requeue and retry up to MAX_PAPER_RETRIES.
+    queue: Deque[Tuple[int, int]] = deque(
+        (i, tries_by_index.get(i, 0)) for i in range(total) if i not in replayed
+    )
+
+    def stopping() -> bool:
+        return bool(should_stop and should_stop())
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+        in_flight: Dict[Future, Tuple[int, int, Set[str]]] = {}
+
+        while in_flight or (queue and not stopping()):
+            while queue and len(in_flight) < max(1, int(workers)) and not stopping():
+                index, tries = queue.popleft()
+                attempts += 1
+                paper = papers_to_check[index]
+                logger.info(f"[{attempts}/{total}] Processing: {paper['title'][:50]}... (try {tries + 1}/{MAX_PAPER_RETRIES})")
+                fetched_ids: Set[str] = set()
+                previous = None
+                if incremental and paper.get("semantic_scholar_id"):
+                    previous = store.get_citation_state(paper["semantic_scholar_id"])
+                elif incremental:
+                    previous = {}
+                # Workers only read seen_keys; it is updated on commit
+                future = executor.submit(
+                    search_citations_for_paper,
+                    s2,
+                    paper,
+                    max_citations=max_citations_per_paper,
+                    skip_keys=seen_keys,
+                    previous=previous,
+                    citing_ids=fetched_ids,
+                )
+                in_flight[future] = (index, tries, fetched_ids)
+            COLLECT_QUEUE_DEPTH.set(len(queue))
+            COLLECT_IN_FLIGHT.set(len(in_flight))
+
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, tries, fetched_ids = in_flight.pop(future)
+                paper = papers_to_check[index]
+                try:
+                    citations, status = future.result()
+                except OfflineCacheMiss as e:
+                    # Retrying cannot help without the network; skip this seed only
+                    COLLECT_SEEDS.inc(status="offline_miss")
+                    finish(index, "offline_miss", tries, str(e), fetched_ids)
+                except RuntimeError as e:
+                    # Request failed even after internal retries -> requeue paper-level up to 10 times
+                    if tries + 1 < MAX_PAPER_RETRIES:
+                        logger.warning(f"Request failed for seed, requeueing: {e}")
+                        if progress_callback:
+                            progress_callback({
+                                "type": "paper",
+                                "action": "retry",
+                                "title": paper["title"],
+                                "attempt": tries + 1,
+                                "max_retries": MAX_PAPER_RETRIES,
+                                "attempts": attempts,
+                                "completed": completed,
+                                "total": total,
+                                "reason": str(e),
+                            })
+                        queue.append((index, tries + 1))
+                        COLLECT_SEEDS.inc(status="retry")
+                        if checkpoint:
+                            checkpoint.append({"type": "retry", "index": index, "tries": tries + 1})
+                        continue
+                    COLLECT_SEEDS.inc(status="failed")
+                    finish(index, "failed", tries, str(e), fetched_ids)
+                else:
+                    COLLECT_SEEDS.inc(status=status)
+                    finish(index, status, tries, citations, fetched_ids)
+
+            commit_ready(replayed)
+            COLLECT_QUEUE_DEPTH.set(len(queue))
+            COLLECT_IN_FLIGHT.set(len(in_flight))
+
+    # Persist resolved ids so later runs skip title search
+    store.upsert_seeds(papers_to_check)
+    stopped_early = bool(queue) or bool(outcomes)
+    if stopped_early:
+        logger.warning(f"Stopped before all seeds were processed ({completed}/{total} committed)")
+    if offline_misses:
+        titles = "; ".join(papers_to_check[i]["title"][:80] for i in offline_misses)
+        logger.warning(
+            f"{len(offline_misses)}/{total} seeds skipped, not in the response cache (offline mode). "
+            f"Run again without --offline (with --resume to fetch only these): {titles}"
+        )
+    if checkpoint:
+        checkpoint.close(remove=not stopped_early and not offline_misses)
+
     logger.info(f"Total unique new citations found: {len(all_citations)}")
     return all_citations
 
@@ -468,90 +1355,67 @@ def collect_all_citations(
 # Paper Analysis
 # ============================================================================
 
-def analyze_paper(client: OpenAIClientWrapper, paper: Dict[str, Any]) -> Dict[str, Any]:
+def analyze_paper(
+    client: OpenAIClientWrapper,
+    paper: Dict[str, Any],
+    cache: Optional[AnalysisCache] = None,
+) -> Dict[str, Any]:
     """Analyze a paper using the LLM API."""
-    return analyze_paper_shared(client, paper, include_extra_fields=True)
+    return analyze_paper_shared(client, paper, include_extra_fields=True, cache=cache)
 
 
-# ============================================================================
-# Save Results
-# ============================================================================
-
-def save_results(papers: List[Dict[str, Any]], date_str: str):
-    """Save analysis results."""
-    PAPER_LOG_DIR.mkdir(parents=True, exist_ok=True)
-    
-    relevant = [p for p in papers if p.get("analysis", {}).get("is_model_copyright_protection", False)]
-    
-    # Save all citations JSON
-    all_json_file = PAPER_LOG_DIR / f"all_citations_{date_str}.json"
-    with open(all_json_file, 'w', encoding='utf-8') as f:
-        json.dump({"total": len(papers), "papers": papers}, f, ensure_ascii=False, indent=2)
-    logger.info(f"Saved all {len(papers)} citations to {all_json_file}")
-    
-    # Save relevant JSON
-    json_file = PAPER_LOG_DIR / f"scholar_relevant_{date_str}.json"
-    output = {
-        "date": date_str,
-        "total_citations_found": len(papers),
-        "relevant_papers_count": len(relevant),
-        "papers": relevant,
-    }
-    
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    
-    logger.info(f"Saved {len(relevant)} relevant papers to {json_file}")
-    
-    # Save Markdown summary
-    md_file = PAPER_LOG_DIR / f"scholar_summary_{date_str}.md"
-    with open(md_file, 'w', encoding='utf-8') as f:
-        f.write(f"# Semantic Scholar Citation Monitor - {date_str}\n\n")
-        f.write(f"**Total citations found:** {len(papers)}\n")
-        f.write(f"**Relevant papers:** {len(relevant)}\n\n")
-        f.write("---\n\n")
-        
-        for i, paper in enumerate(relevant, 1):
-            analysis = paper.get("analysis", {})
-            f.write(f"## {i}. {paper['title']}\n\n")
-            f.write(f"- **Year:** {paper.get('year', 'N/A')}\n")
-            f.write(f"- **Authors:** {paper.get('authors', 'N/A')}\n")
-            f.write(f"- **Venue:** {paper.get('venue', 'N/A')}\n")
-            f.write(f"- **Cited paper:** {paper.get('cited_paper', 'N/A')}\n")
-            f.write(f"- **Category:** {analysis.get('category')}/{analysis.get('subcategory')}\n")
-            f.write(f"- **Confidence:** {analysis.get('classification_confidence', 'N/A')}\n")
-            f.write(f"- **Summary:** {analysis.get('brief_summary', 'N/A')}\n\n")
-            if paper.get('abstract'):
-                abstract = paper['abstract']
-                if len(abstract) > 500:
-                    abstract = abstract[:500] + "..."
-                f.write(f"**Abstract:** {abstract}\n\n")
-            f.write(f"**Reasoning:** {analysis.get('reasoning', 'N/A')}\n\n")
-            f.write("---\n\n")
-    
-    logger.info(f"Saved summary to {md_file}")
+def analyze_papers_batch(
+    client: OpenAIClientWrapper,
+    papers: List[Dict[str, Any]],
+    cache: Optional[AnalysisCache] = None,
+) -> List[Dict[str, Any]]:
+    """Analyze several papers with one LLM request (see paper_analysis.analyze_papers_batch)."""
+    return analyze_papers_batch_shared(client, papers, include_extra_fields=True, cache=cache)
+
+
+def analyze_papers_concurrently(
+    api_base: str,
+    api_key: str,
+    model_name: Optional[str],
+    papers: List[Dict[str, Any]],
+    cache: Optional[AnalysisCache] = None,
+    initial_concurrency: int = 8,
+    max_concurrency: int = 256,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    structured_output: bool = False,
+    stream: bool = False,
+    triage: bool = False,
+) -> List[Optional[Dict[str, Any]]]:
+    """Analyze papers on the async engine with adaptive concurrency (see paper_analysis.run_async_analysis)."""
+    return run_async_analysis(
+        api_base, api_key, model_name, papers,
+        include_extra_fields=True,
+        cache=cache,
+        initial_concurrency=initial_concurrency,
+        max_concurrency=max_concurrency,
+        on_result=on_result,
+        should_stop=should_stop,
+        structured_output=structured_output,
+        stream=stream,
+        triage=triage,
+    )
 
 
 # ============================================================================
-# Cache Functions
+# Save Results
 # ============================================================================
 
-def load_cache() -> Dict[str, Any]:
-    """Load cached data."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    cache_file = CACHE_DIR / "scholar_cache.json"
-    
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {"analyzed_titles": [], "citations": []}
-
+def save_results(papers: List[Dict[str, Any]], date_str: str, compression: str = "none"):
+    """Save analysis results: the JSONL record, then the JSON/Markdown files derived from it.
 
-def save_cache(cache: Dict[str, Any]):
-    """Save cache data."""
-    cache_file = CACHE_DIR / "scholar_cache.json"
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    Takes the caller's full list of papers. main() does not use it: it writes
+    each paper as soon as its analysis is done.
+    """
+    with ResultWriter(results_path(PAPER_LOG_DIR, date_str, compression)) as writer:
+        for paper in papers:
+            writer.write(paper)
+    derive_outputs(writer.path, PAPER_LOG_DIR, date_str, writer.count, writer.relevant)
 
 
 # ============================================================================
@@ -564,10 +1428,27 @@ def main():
     parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="LLM API key")
     parser.add_argument("--model", default=None, help="Model name (e.g., gpt-4, gpt-5.2). If not specified, uses first available model")
     parser.add_argument("--s2-api-key", default=DEFAULT_S2_API_KEY, help="Semantic Scholar API key (optional; can also set env S2_API_KEY)")
+    parser.add_argument("--s2-rate", type=float, default=None, help="Semantic Scholar requests per second (default: 1 with API key, 100/300 without)")
     parser.add_argument("--max-papers", type=int, default=10, help="Max existing papers to check")
-    parser.add_argument("--max-citations", type=int, default=50, help="Max citations per paper")
+    parser.add_argument("--max-citations", type=int, default=50, help="Max citations per paper (0 = all, paged 1000 at a time)")
+    parser.add_argument("--workers", type=int, default=1, help="Seeds to fetch concurrently from Semantic Scholar")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_DEDUP_THRESHOLD, help="Drop citations whose title is this similar (character n-gram Jaccard) to a seed or an earlier citation (0 = exact matches only)")
+    parser.add_argument("--incremental", action="store_true", help="Skip seeds whose citation count is unchanged and only return citing papers not seen in earlier runs")
+    parser.add_argument("--resume", action="store_true", help="Continue citation collection from the last checkpoint")
     parser.add_argument("--skip-search", action="store_true", help="Skip search, use cache")
+    parser.add_argument("--no-s2-cache", action="store_true", help="Always query Semantic Scholar, ignoring cached responses")
+    parser.add_argument("--offline", action="store_true", help="Answer Semantic Scholar requests only from the response cache (seeds not cached are skipped and listed at the end)")
     parser.add_argument("--skip-analysis", action="store_true", help="Skip LLM analysis")
+    parser.add_argument("--batch-size", type=int, default=1, help="Papers classified per LLM request")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads", help="LLM analysis engine: sequential/batched requests, or async with adaptive concurrency")
+    parser.add_argument("--max-concurrency", type=int, default=256, help="Upper bound on concurrent LLM requests for --engine async")
+    parser.add_argument("--prefilter-threshold", type=float, default=0.0, help=f"Skip the LLM for papers whose local relevance score is below this (0 = off; try {DEFAULT_PREFILTER_THRESHOLD}, tune with prefilter.py --evaluate)")
+    parser.add_argument("--structured-output", action="store_true", help="Ask the LLM server for schema-constrained JSON (response_format) with a short max_tokens; falls back to tolerant parsing if unsupported")
+    parser.add_argument("--stream", action="store_true", help="Stream LLM answers and stop reading once the verdict fields are complete (brief_summary/reasoning may be cut short)")
+    parser.add_argument("--triage", action="store_true", help="Ask only for the verdict fields (no reasoning/summary); best with --stream and --structured-output")
+    parser.add_argument("--no-analysis-cache", action="store_true", help="Always call the LLM, ignoring cached analyses")
+    parser.add_argument("--output-compression", choices=COMPRESSIONS, default="none", help="Compression of the paper_logs/citations_YYYYMMDD.jsonl results file")
+    parser.add_argument("--store-ttl-days", type=float, default=STORE_TTL_DAYS, help="Evict stored citing papers/analyses older than this many days")
     
     args = parser.parse_args()
     
@@ -576,10 +1457,17 @@ def main():
     logger.info("=" * 60)
     
     date_str = datetime.now(BEIJING_TZ).strftime("%Y%m%d")
+    # Per-stage wall times and metrics, saved next to the paper logs
+    report = RunReport()
+    report_path = PAPER_LOG_DIR / f"run_report_{date_str}.json"
+
+    store = open_store()
+    store.evict_stale(args.store_ttl_days * 86400)
     
     # Step 1: Extract existing papers
     logger.info("Step 1: Extracting existing papers from website...")
-    existing_papers = extract_all_existing_papers()
+    with report.stage("extract"):
+        existing_papers = extract_all_existing_papers()
     
     if not existing_papers:
         logger.error("No existing papers found!")
@@ -587,51 +1475,100 @@ def main():
     
     # Step 2: Search citations
     if args.skip_search:
-        logger.info("Step 2: Loading citations from cache...")
-        cache = load_cache()
-        citations = cache.get("citations", [])
+        logger.info("Step 2: Loading citations from store...")
+        with report.stage("load_citations"):
+            citations = store.load_citations()
     else:
         logger.info("Step 2: Searching Semantic Scholar for citations...")
-        citations = collect_all_citations(
-            existing_papers,
-            max_citations_per_paper=args.max_citations,
-            max_papers_to_check=args.max_papers,
-            s2_api_key=args.s2_api_key,
-        )
-        
-        # Cache results
-        cache = load_cache()
-        cache["citations"] = citations
-        save_cache(cache)
+        with report.stage("collect"):
+            citations = collect_all_citations(
+                existing_papers,
+                max_citations_per_paper=args.max_citations,
+                max_papers_to_check=args.max_papers,
+                s2_api_key=args.s2_api_key,
+                s2_rate_per_s=args.s2_rate,
+                workers=args.workers,
+                incremental=args.incremental,
+                checkpoint_path=CHECKPOINT_FILE,
+                resume=args.resume,
+                store=store,
+                dedup_threshold=args.dedup_threshold,
+                s2_cache=not args.no_s2_cache,
+                offline=args.offline,
+            )
+            
+            # Store results
+            store.save_citations(citations)
     
     if not citations:
         logger.info("No new citations found.")
+        report.write(report_path, citations=0)
         return
     
-    # Step 3: Analyze with LLM
-    if args.skip_analysis:
-        logger.info("Step 3: Skipping LLM analysis...")
-    else:
-        logger.info("Step 3: Analyzing citations with LLM...")
-        client = OpenAIClientWrapper(
-            api_base=args.api_base,
-            api_key=args.api_key,
-            model_name=args.model,
-        )
-        
-        for i, paper in enumerate(citations, 1):
-            logger.info(f"Analyzing [{i}/{len(citations)}]: {paper['title'][:50]}...")
-            analysis = analyze_paper(client, paper)
-            paper["analysis"] = analysis
-            
-            if analysis.get("is_model_copyright_protection"):
-                logger.info(f"  -> RELEVANT: {analysis.get('category')}/{analysis.get('subcategory')}")
+    # Step 3: Analyze with LLM; each paper is appended to the JSONL results as soon as it is done
+    with ResultWriter(results_path(PAPER_LOG_DIR, date_str, args.output_compression)) as writer, report.stage("analyze"):
+        if args.skip_analysis:
+            logger.info("Step 3: Skipping LLM analysis...")
+        else:
+            logger.info("Step 3: Analyzing citations with LLM...")
+            analysis_cache = None if args.no_analysis_cache else AnalysisCache(ANALYSIS_CACHE_FILE)
+
+            def log_analysis(index: int, analysis: Dict[str, Any]):
+                paper = citations[index]
+                paper["analysis"] = analysis
+                writer.write_at(index, paper)
+                if analysis.get("is_model_copyright_protection"):
+                    logger.info(f"  -> RELEVANT: {paper['title'][:50]} ({analysis.get('category')}/{analysis.get('subcategory')})")
+                else:
+                    logger.info(f"  -> Not relevant: {paper['title'][:50]}")
+
+            keep, rejected = apply_prefilter(citations, args.prefilter_threshold, path=PREFILTER_FIT_FILE)
+            for i, verdict in rejected.items():
+                citations[i]["analysis"] = verdict
+                writer.write_at(i, citations[i])
+            to_analyze = [citations[i] for i in keep]
+
+            if args.engine == "async":
+                logger.info(f"Analyzing {len(to_analyze)} papers (async, max concurrency {args.max_concurrency})...")
+                analyze_papers_concurrently(
+                    args.api_base, args.api_key, args.model, to_analyze,
+                    cache=analysis_cache,
+                    max_concurrency=args.max_concurrency,
+                    on_result=lambda i, analysis: log_analysis(keep[i], analysis),
+                    structured_output=args.structured_output,
+                    stream=args.stream,
+                    triage=args.triage,
+                )
             else:
-                logger.info(f"  -> Not relevant")
+                client = OpenAIClientWrapper(
+                    api_base=args.api_base,
+                    api_key=args.api_key,
+                    model_name=args.model,
+                    structured_output=args.structured_output,
+                    stream=args.stream,
+                    triage=args.triage,
+                )
+                batch_size = max(1, args.batch_size)
+                for start in range(0, len(to_analyze), batch_size):
+                    batch = to_analyze[start:start + batch_size]
+                    if batch_size == 1:
+                        logger.info(f"Analyzing [{start + 1}/{len(to_analyze)}]: {batch[0]['title'][:50]}...")
+                        analyses = [analyze_paper(client, batch[0], cache=analysis_cache)]
+                    else:
+                        logger.info(f"Analyzing [{start + 1}-{start + len(batch)}/{len(to_analyze)}]...")
+                        analyses = analyze_papers_batch(client, batch, cache=analysis_cache)
+
+                    for j, analysis in enumerate(analyses, start):
+                        log_analysis(keep[j], analysis)
+
+            store.save_analyses(citations)
     
-    # Step 4: Save results
-    logger.info("Step 4: Saving results...")
-    save_results(citations, date_str)
+        # Step 4: Save results
+        logger.info("Step 4: Saving results...")
+        writer.finish(citations)
+    with report.stage("save"):
+        derive_outputs(writer.path, PAPER_LOG_DIR, date_str, writer.count, writer.relevant)
+    report.write(report_path, citations=writer.count, relevant=writer.relevant)
     
     logger.info("=" * 60)
     logger.info("Job completed.")
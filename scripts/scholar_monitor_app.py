@@ -6,26 +6,28 @@ Endpoints:
 - GET/POST seed papers (extract from project, add manual, list)
 - POST find-citations (run Semantic Scholar citation search)
 - POST analyze (run LLM analysis with configurable concurrency)
+- POST analyze/stream (same, streaming each result via Server-Sent Events)
+- Jobs: submit find-citations/analyze runs to a bounded background pool,
+  then poll status, stream events, cancel or fetch the result by job id
 - GET paper-logs list (optional: list available JSON files)
+- GET paper-logs/{filename}/papers (one page, filtered and sorted, via an offset index)
+- GET metrics (Prometheus text format: S2/LLM requests, latencies, tokens, jobs)
 """
 
 import os
-import re
 import json
-import queue
+import hashlib
 import threading
+import time
+import uuid
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-
-def _normalize_title(title: str) -> str:
-    """Normalize title for seed-match (trim, lower, collapse spaces)."""
-    return re.sub(r"\s+", " ", (title or "").strip().lower())
-
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Import from existing monitor (run from scripts/ so parent is project root)
@@ -36,14 +38,30 @@ if str(SCRIPT_DIR) not in __import__("sys").path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
 from scholar_citation_monitor import (
+    ANALYSIS_CACHE_FILE,
+    CACHE_DIR,
+    CHECKPOINT_FILE,
+    PREFILTER_FIT_FILE,
+    STORE_TTL_DAYS,
     extract_all_existing_papers,
     collect_all_citations,
     analyze_paper,
+    analyze_papers_batch,
+    analyze_papers_concurrently,
+    open_store,
 )
-from paper_analysis import OpenAIClientWrapper
+from paper_analysis import AnalysisCache, OpenAIClientWrapper
+from dedup_index import DEFAULT_DEDUP_THRESHOLD, TitleDedupIndex, paper_ids
+from metrics import JOB_SECONDS, JOBS, REGISTRY
+from paper_log_index import PaperLogIndexer, paginate
+from prefilter import apply_prefilter
+from result_writer import ResultWriter, iter_jsonl
 
 # Paths
 PAPER_LOG_DIR = SCRIPT_DIR / "paper_logs"
+PAPER_LOG_PREFIXES = ("scholar_relevant_", "all_citations_", "citations_")
+PAPER_LOG_SUFFIXES = (".json", ".jsonl", ".jsonl.gz", ".jsonl.zst")
+PAPER_LOG_MAX_PAGE_SIZE = 200
 
 app = FastAPI(title="Scholar Citation Monitor API", version="1.0.0")
 app.add_middleware(
@@ -54,14 +72,282 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory state (per process)
+# Citing papers and analyses persist in the shared SQLite store
+store = open_store()
+store.evict_stale(STORE_TTL_DAYS * 86400)
+analysis_cache = AnalysisCache(ANALYSIS_CACHE_FILE)
+
+# In-memory state (per process); citations start from the last stored search
 state: Dict[str, Any] = {
     "seed_papers": [],
-    "citations": [],
-    "analyzed_papers": [],
+    "citations": store.load_citations(),
 }
 
 
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+JOB_WORKERS = int(os.environ.get("SCHOLAR_JOB_WORKERS", "2"))
+JOB_MAX_ACTIVE = 16  # queued + running; further submissions get 429
+JOB_HISTORY = 50  # finished jobs kept for status/result/events
+JOB_HISTORY_BYTES = 32 * 2**20  # ... and at most this many bytes of their buffered events
+JOB_EVENT_BUFFER = 1000  # most recent events kept per job for (re)attaching clients
+JOB_EVENT_BUFFER_BYTES = 4 * 2**20
+JOB_ACTIVE_STATUSES = ("queued", "running")
+# Citation searches share CHECKPOINT_FILE, so they run one at a time on their own worker
+JOB_SERIAL_KINDS = ("find-citations",)
+# Event fields copied into the job's progress summary
+JOB_PROGRESS_KEYS = ("processed", "completed", "total", "count", "relevant", "papers_per_s", "eta_s")
+# Job results are streamed to JSONL files here instead of being kept in memory
+JOB_RESULTS_DIR = CACHE_DIR / "jobs"
+JOB_RESULTS_MAX_AGE_S = 86400  # leftovers of earlier processes are removed at startup
+
+
+class Job:
+    """One background run.
+
+    Only the most recent events are kept (JOB_EVENT_BUFFER, already
+    serialized); `first_event` is the index of the oldest one still held.
+    Papers go to `result_path`, `result` is just a small summary.
+    """
+
+    def __init__(self, job_id: str, kind: str, fingerprint: str):
+        self.id = job_id
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.result_path = JOB_RESULTS_DIR / f"{job_id}.jsonl"
+        self.first_event = 0
+        self.event_count = 0
+        self.event_bytes = 0
+        self._events: "deque[str]" = deque()
+        self.cancel_requested = threading.Event()
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in JOB_ACTIVE_STATUSES
+
+    def emit(self, event: Dict[str, Any]):
+        data = json.dumps(event, ensure_ascii=False)
+        with self._cond:
+            self._events.append(data)
+            self.event_count += 1
+            self.event_bytes += len(data)
+            while len(self._events) > 1 and (
+                len(self._events) > JOB_EVENT_BUFFER or self.event_bytes > JOB_EVENT_BUFFER_BYTES
+            ):
+                self.event_bytes -= len(self._events.popleft())
+                self.first_event += 1
+            self.progress.update({k: event[k] for k in JOB_PROGRESS_KEYS if k in event})
+            self._cond.notify_all()
+
+    def set_status(self, status: str, result: Any = None, error: Optional[str] = None):
+        with self._cond:
+            self.status = status
+            if status == "running":
+                self.started_at = time.time()
+            else:
+                self.finished_at = time.time()
+                self.result = result
+                self.error = error
+            self._cond.notify_all()
+
+    def wait_events(self, after: int, timeout: float) -> Tuple[int, List[str], bool]:
+        """Serialized events from index `after` on (waiting up to timeout for new ones).
+
+        Returns (index of the first returned event, events, finished). The
+        index is past `after` when older events were already dropped.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.event_count > after or self.finished, timeout=timeout)
+            start = max(after, self.first_event)
+            events = [self._events[i] for i in range(start - self.first_event, len(self._events))]
+            return start, events, self.finished
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.finished, timeout=timeout)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": dict(self.progress),
+            "events": self.event_count,
+            "first_event": self.first_event,
+            "error": self.error,
+        }
+
+    def discard(self):
+        """Free everything the job holds once it leaves the history."""
+        with self._cond:
+            self._events.clear()
+            self.event_bytes = 0
+        self.result_path.unlink(missing_ok=True)
+
+
+class JobManager:
+    """Bounded worker pool for long-running runs.
+
+    Jobs wait in the executor's queue until a worker is free. Kinds in
+    `serial_kinds` get a single worker of their own instead, so they queue
+    behind each other without holding a shared worker. Submitting the
+    same kind and parameters as a queued or running job returns that job
+    instead of starting a duplicate. Finished jobs are dropped oldest first
+    once there are more than `history` of them or their buffered events
+    exceed `history_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = JOB_WORKERS,
+        max_active: int = JOB_MAX_ACTIVE,
+        history: int = JOB_HISTORY,
+        history_bytes: int = JOB_HISTORY_BYTES,
+        serial_kinds: Tuple[str, ...] = JOB_SERIAL_KINDS,
+    ):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scholar-job")
+        self._serial = {
+            kind: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"scholar-job-{kind}")
+            for kind in serial_kinds
+        }
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_active = max_active
+        self.history = history
+        self.history_bytes = history_bytes
+        JOB_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        for path in JOB_RESULTS_DIR.glob("*.jsonl"):
+            if time.time() - path.stat().st_mtime > JOB_RESULTS_MAX_AGE_S:
+                path.unlink(missing_ok=True)
+
+    def submit(self, kind: str, params: Dict[str, Any], fn: Callable[[Job], Any]) -> Tuple[Job, bool]:
+        """Queue fn(job); returns (job, created)."""
+        fingerprint = hashlib.sha256(
+            json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            active = [job for job in self._jobs.values() if not job.finished]
+            for job in active:
+                if job.fingerprint == fingerprint and not job.cancel_requested.is_set():
+                    return job, False
+            if len(active) >= self.max_active:
+                raise HTTPException(status_code=429, detail="Too many jobs queued. Try again later.")
+            job = Job(uuid.uuid4().hex[:12], kind, fingerprint)
+            self._jobs[job.id] = job
+            self._prune()
+        self._serial.get(kind, self._executor).submit(self._run, job, fn)
+        return job, True
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]):
+        if job.cancel_requested.is_set():
+            job.emit({"type": "cancelled"})
+            job.set_status("cancelled")
+            return
+        job.set_status("running")
+        try:
+            result = fn(job)
+        except Exception as e:
+            job.emit({"type": "error", "detail": str(e)})
+            job.set_status("failed", error=str(e))
+        else:
+            if job.cancel_requested.is_set():
+                job.emit({"type": "cancelled"})
+                job.set_status("cancelled", result=result)
+            else:
+                job.set_status("done", result=result)
+        JOB_SECONDS.observe(job.finished_at - job.started_at, kind=job.kind, status=job.status)
+        with self._lock:
+            self._prune()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        size = sum(job.event_bytes for job in finished)
+        for i, job in enumerate(finished):
+            if len(finished) - i <= self.history and size <= self.history_bytes:
+                break
+            size -= job.event_bytes
+            del self._jobs[job.id]
+            job.discard()
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        return job
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job:
+        job = self.get(job_id)
+        job.cancel_requested.set()
+        return job
+
+
+jobs = JobManager()
+
+
+def _job_event_stream(job: Job, after: int = 0) -> Iterator[str]:
+    """SSE frames for a job's events from index `after`; ends when the job is finished.
+
+    Events older than the job's buffer are skipped (the frame ids jump);
+    the complete output is at /api/jobs/{id}/result. Disconnecting only
+    stops this generator, never the job.
+    """
+    index = max(0, after)
+    while True:
+        index, events, finished = job.wait_events(index, timeout=15)
+        for data in events:
+            yield f"id: {index}\ndata: {data}\n\n"
+            index += 1
+        if finished and not events:
+            break
+        if not events:
+            yield ": keepalive\n\n"
+
+
+def _sse_response(frames: Iterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Response key holding the papers of each job kind's result
+JOB_RESULT_KEYS = {"find-citations": "citations", "analyze": "papers"}
+
+
+def _job_result(job: Job) -> Any:
+    """The job's summary result with its papers read back from the result file."""
+    if job.result is None or not job.result_path.exists():
+        return job.result
+    return {**job.result, JOB_RESULT_KEYS[job.kind]: list(iter_jsonl(job.result_path))}
+
+
+def _wait_for_result(job: Job) -> Any:
+    job.wait()
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    if job.status == "cancelled":
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+    return _job_result(job)
+
+
 # ---------------------------------------------------------------------------
 # Request/Response models
 # ---------------------------------------------------------------------------
@@ -78,12 +364,26 @@ class SeedPapersSet(BaseModel):
 class FindCitationsRequest(BaseModel):
     seed_papers: Optional[List[Dict[str, Any]]] = None  # use state if None
     max_papers_to_check: Optional[int] = None
-    max_citations_per_paper: int = 50
+    max_citations_per_paper: Optional[int] = 50  # None or 0 = all citations
+    workers: int = 1  # seeds fetched concurrently
+    incremental: bool = False  # only citing papers not seen in earlier incremental runs
+    resume: bool = False  # continue from the last checkpoint of an interrupted run
+    dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD  # near-duplicate title similarity (0 = exact only)
+    s2_rate: Optional[float] = None  # Semantic Scholar requests per second (default: shared limit)
+    s2_cache: bool = True  # answer repeated requests from the S2 response cache
+    offline: bool = False  # only use cached S2 responses, never the network
 
 
 class AnalyzeRequest(BaseModel):
     citations: Optional[List[Dict[str, Any]]] = None  # use state citations if None
     concurrency: int = 4
+    batch_size: int = 1  # papers classified per LLM request
+    engine: str = "threads"  # "threads" or "async" (adaptive concurrency, ignores concurrency/batch_size)
+    max_concurrency: int = 256  # async engine upper bound
+    prefilter_threshold: float = 0.0  # papers scoring below this skip the LLM (0 = off)
+    structured_output: bool = False  # schema-constrained JSON via response_format, short max_tokens
+    stream: bool = False  # stream answers and stop reading once the verdict fields are complete
+    triage: bool = False  # verdict fields only (no reasoning/brief_summary)
     api_base: str = "http://127.0.0.1:8000/v1"
     api_key: str = "EMPTY"
     model: Optional[str] = None
@@ -134,69 +434,70 @@ def remove_seed_paper(index: int):
 # Find citations
 # ---------------------------------------------------------------------------
 
-@app.post("/api/citations/find")
-def find_citations(req: FindCitationsRequest):
+def _seed_papers_for(req: FindCitationsRequest) -> List[Dict[str, Any]]:
     seed = req.seed_papers if req.seed_papers is not None else state["seed_papers"]
     if not seed:
         raise HTTPException(status_code=400, detail="No seed papers. Extract or add seeds first.")
-    try:
+    return list(seed)
+
+
+def _submit_find_job(req: FindCitationsRequest) -> Tuple[Job, bool]:
+    seed = _seed_papers_for(req)
+    total_to_check = min(len(seed), req.max_papers_to_check) if req.max_papers_to_check else len(seed)
+
+    def run(job: Job) -> Dict[str, Any]:
+        # 立即发送 started，让前端马上收到数据，避免“正在连接”后无数据导致界面消失或卡住
+        job.emit({"type": "started", "total": total_to_check})
+        # Find jobs run one at a time (JOB_SERIAL_KINDS), so CHECKPOINT_FILE is not shared
         citations = collect_all_citations(
             seed,
             max_citations_per_paper=req.max_citations_per_paper,
             max_papers_to_check=req.max_papers_to_check,
+            workers=req.workers,
+            incremental=req.incremental,
+            checkpoint_path=CHECKPOINT_FILE,
+            resume=req.resume,
+            store=store,
+            progress_callback=job.emit,
+            should_stop=job.cancel_requested.is_set,
+            dedup_threshold=req.dedup_threshold,
+            s2_rate_per_s=req.s2_rate,
+            s2_cache=req.s2_cache,
+            offline=req.offline,
         )
+        store.save_citations(citations)
         state["citations"] = citations
-        return {"citations": citations, "count": len(citations)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        with ResultWriter(job.result_path) as writer:
+            for paper in citations:
+                writer.write(paper)
+        job.emit({"type": "done", "count": len(citations)})
+        return {"count": len(citations)}
+
+    params = req.model_dump()
+    params["seed_papers"] = seed
+    return jobs.submit("find-citations", params, run)
+
+
+@app.post("/api/citations/find")
+def find_citations(req: FindCitationsRequest):
+    job, _ = _submit_find_job(req)
+    return _wait_for_result(job)
 
 
 @app.post("/api/citations/find/stream")
 def find_citations_stream(req: FindCitationsRequest):
-    """Stream progress via Server-Sent Events, then return final citations."""
-    seed = req.seed_papers if req.seed_papers is not None else state["seed_papers"]
-    if not seed:
-        raise HTTPException(status_code=400, detail="No seed papers. Extract or add seeds first.")
+    """Stream progress via Server-Sent Events, then return final citations.
 
-    progress_queue: queue.Queue = queue.Queue()
-    total_to_check = min(len(seed), req.max_papers_to_check) if req.max_papers_to_check else len(seed)
+    The search runs as a background job (see /api/jobs); the first event is
+    {"type": "job", "id": ...} so a client can reattach after a reload.
+    """
+    job, _ = _submit_find_job(req)
 
-    def run_find():
-        try:
-            result = collect_all_citations(
-                seed,
-                max_citations_per_paper=req.max_citations_per_paper,
-                max_papers_to_check=req.max_papers_to_check,
-                progress_callback=lambda event: progress_queue.put(event),
-            )
-            progress_queue.put({"type": "done", "citations": result})
-        except Exception as e:
-            progress_queue.put({"type": "error", "detail": str(e)})
+    def frames() -> Iterator[str]:
+        yield f"data: {json.dumps({'type': 'job', 'id': job.id})}\n\n"
+        yield from _job_event_stream(job)
 
-    def event_stream():
-        # 立即发送 started，让前端马上收到数据，避免“正在连接”后无数据导致界面消失或卡住
-        yield f"data: {json.dumps({'type': 'started', 'total': total_to_check}, ensure_ascii=False)}\n\n"
-        thread = threading.Thread(target=run_find)
-        thread.start()
-        while True:
-            try:
-                msg = progress_queue.get(timeout=300)
-            except queue.Empty:
-                continue
-            if msg["type"] == "done":
-                state["citations"] = msg["citations"]
-                yield f"data: {json.dumps({'type': 'done', 'count': len(msg['citations']), 'citations': msg['citations']}, ensure_ascii=False)}\n\n"
-                break
-            if msg["type"] == "error":
-                yield f"data: {json.dumps({'type': 'error', 'detail': msg['detail']}, ensure_ascii=False)}\n\n"
-                break
-            yield f"data: {json.dumps(msg, ensure_ascii=False)}\n\n"
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+    return _sse_response(frames())
 
 
 # ---------------------------------------------------------------------------
@@ -214,77 +515,333 @@ SKIP_ANALYSIS_SEED = {
 }
 
 
-@app.post("/api/analyze")
-def run_analyze(req: AnalyzeRequest):
-    papers = req.citations if req.citations is not None else state["citations"]
-    if not papers:
-        raise HTTPException(status_code=400, detail="No citations to analyze. Run find-citations first.")
-    seed_titles = {_normalize_title(p.get("title", "")) for p in state["seed_papers"]}
+# Analysis results per store write
+ANALYZE_STREAM_SAVE_EVERY = 50
+
+
+def _analyze_papers(
+    req: AnalyzeRequest,
+    papers: List[Dict[str, Any]],
+    on_result: Callable[[int, Dict[str, Any]], None],
+    should_stop: Optional[Callable[[], bool]] = None,
+):
+    """Analyze papers, calling on_result(index, paper_with_analysis) as each one finishes.
+
+    Once should_stop() returns True, requests not yet started are dropped.
+    Titles are matched fuzzily (TitleDedupIndex): near-duplicates of a seed
+    are skipped, and near-duplicates of an earlier paper in the request reuse
+    that paper's analysis instead of being classified again. Papers whose
+    S2/DOI/arXiv ids differ are never matched (see dedup_index).
+    """
+    seed_index = TitleDedupIndex()
+    for seed in state["seed_papers"]:
+        seed_index.add(seed.get("title", ""), seed.get("title", ""), paper_ids(seed))
+    paper_index = TitleDedupIndex()
+    duplicates: Dict[int, List[int]] = {}
     # 已在种子中的论文不提交给模型，直接标记跳过
-    results_by_index: Dict[int, Dict[str, Any]] = {}
+    to_analyze = []
     for i, p in enumerate(papers):
-        if _normalize_title(p.get("title", "")) in seed_titles:
+        title = p.get("title", "")
+        ids = paper_ids(p)
+        if seed_index.query(title, ids) is not None:
             paper = dict(p)
             paper["analysis"] = dict(SKIP_ANALYSIS_SEED)
-            results_by_index[i] = paper
-    to_analyze = [(i, p) for i, p in enumerate(papers) if i not in results_by_index]
+            on_result(i, paper)
+            continue
+        first = paper_index.find_or_add(i, title, ids)
+        if first is not None:
+            duplicates.setdefault(first, []).append(i)
+        else:
+            to_analyze.append((i, p))
+
+    def deliver(i: int, paper: Dict[str, Any]):
+        on_result(i, paper)
+        for j in duplicates.get(i, ()):
+            duplicate = dict(papers[j])
+            duplicate["analysis"] = paper["analysis"]
+            on_result(j, duplicate)
+
+    # 本地预筛：与各类别描述相关度过低的论文直接判为不相关，不调用 LLM
+    keep, rejected = apply_prefilter(
+        [p for _, p in to_analyze], req.prefilter_threshold, path=PREFILTER_FIT_FILE
+    )
+    for k, verdict in rejected.items():
+        paper = dict(to_analyze[k][1])
+        paper["analysis"] = verdict
+        deliver(to_analyze[k][0], paper)
+    to_analyze = [to_analyze[k] for k in keep]
+
+    def emit(i: int, analysis: Dict[str, Any]):
+        paper = dict(papers[i])
+        paper["analysis"] = analysis
+        deliver(i, paper)
+
+    if req.engine == "async":
+        analyze_papers_concurrently(
+            req.api_base, req.api_key, req.model, [p for _, p in to_analyze],
+            cache=analysis_cache,
+            max_concurrency=max(1, req.max_concurrency),
+            on_result=lambda k, analysis: emit(to_analyze[k][0], analysis),
+            should_stop=should_stop,
+            structured_output=req.structured_output,
+            stream=req.stream,
+            triage=req.triage,
+        )
+        return
+
     concurrency = max(1, min(req.concurrency, 16))
     client = OpenAIClientWrapper(
         api_base=req.api_base,
         api_key=req.api_key,
         model_name=req.model,
+        structured_output=req.structured_output,
+        stream=req.stream,
+        triage=req.triage,
     )
+    batch_size = max(1, req.batch_size)
     with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        future_to_i = {executor.submit(analyze_paper, client, p): i for i, p in to_analyze}
-        for future in as_completed(future_to_i):
-            i = future_to_i[future]
+        future_to_indices = {}
+        for start in range(0, len(to_analyze), batch_size):
+            chunk = to_analyze[start:start + batch_size]
+            if batch_size == 1:
+                future = executor.submit(lambda p: [analyze_paper(client, p, analysis_cache)], chunk[0][1])
+            else:
+                future = executor.submit(analyze_papers_batch, client, [p for _, p in chunk], analysis_cache)
+            future_to_indices[future] = [i for i, _ in chunk]
+        for future in as_completed(future_to_indices):
+            indices = future_to_indices[future]
+            if should_stop and should_stop():
+                for pending in future_to_indices:
+                    pending.cancel()
+            if future.cancelled():
+                continue
             try:
-                analysis = future.result()
-                paper = dict(papers[i])
-                paper["analysis"] = analysis
-                results_by_index[i] = paper
+                analyses = future.result()
             except Exception as e:
-                paper = dict(papers[i])
-                paper["analysis"] = {
+                # One dict per paper; emit() and later steps update them per paper
+                analyses = [{
                     "is_model_copyright_protection": False,
                     "reasoning": str(e),
                     "category": None,
                     "subcategory": None,
                     "classification_confidence": "low",
                     "brief_summary": "Analysis failed",
-                }
-                results_by_index[i] = paper
-    # Restore order
-    analyzed = [results_by_index[i] for i in range(len(papers))]
-    state["analyzed_papers"] = analyzed
-    return {"papers": analyzed, "count": len(analyzed)}
+                } for _ in indices]
+            for i, analysis in zip(indices, analyses):
+                emit(i, analysis)
+
+
+def _submit_analyze_job(req: AnalyzeRequest) -> Tuple[Job, bool]:
+    papers = req.citations if req.citations is not None else state["citations"]
+    if not papers:
+        raise HTTPException(status_code=400, detail="No citations to analyze. Run find-citations first.")
+    papers = list(papers)
+    total = len(papers)
+
+    def run(job: Job) -> Dict[str, Any]:
+        job.emit({"type": "started", "total": total})
+        started = time.monotonic()
+        completed = 0
+        relevant = 0
+        pending_save: List[Dict[str, Any]] = []
+
+        def on_result(i: int, paper: Dict[str, Any]):
+            nonlocal completed, relevant, pending_save
+            writer.write_at(i, paper)
+            completed += 1
+            if paper["analysis"].get("is_model_copyright_protection"):
+                relevant += 1
+            if paper["analysis"] != SKIP_ANALYSIS_SEED:
+                pending_save.append(paper)
+            if len(pending_save) >= ANALYZE_STREAM_SAVE_EVERY:
+                store.save_analyses(pending_save)
+                pending_save = []
+            elapsed = time.monotonic() - started
+            rate = completed / elapsed if elapsed > 0 else 0.0
+            job.emit({
+                "type": "result",
+                "index": i,
+                "paper": paper,
+                "completed": completed,
+                "total": total,
+                "relevant": relevant,
+                "elapsed_s": round(elapsed, 2),
+                "papers_per_s": round(rate, 3),
+                "eta_s": round((total - completed) / rate, 1) if rate > 0 else None,
+            })
+
+        # Results go to the job's file in input order (papers skipped by cancellation are left out)
+        with ResultWriter(job.result_path) as writer:
+            try:
+                _analyze_papers(req, papers, on_result, should_stop=job.cancel_requested.is_set)
+            finally:
+                store.save_analyses(pending_save)
+                writer.flush()
+        elapsed = time.monotonic() - started
+        job.emit({
+            "type": "done",
+            "count": completed,
+            "relevant": relevant,
+            "elapsed_s": round(elapsed, 2),
+            "papers_per_s": round(completed / elapsed, 3) if elapsed > 0 else None,
+        })
+        return {"count": completed, "relevant": relevant}
+
+    params = req.model_dump()
+    params["citations"] = papers
+    return jobs.submit("analyze", params, run)
+
+
+@app.post("/api/analyze")
+def run_analyze(req: AnalyzeRequest):
+    job, _ = _submit_analyze_job(req)
+    return _wait_for_result(job)
+
+
+@app.post("/api/analyze/stream")
+def run_analyze_stream(req: AnalyzeRequest):
+    """Stream each analysis via Server-Sent Events as soon as it completes.
+
+    Every "result" event carries the paper's index in the request and running
+    counters (completed, relevant, papers/s, ETA). Results are written to the
+    store in small chunks. The run is a background job; the first event is
+    {"type": "job", "id": ...}.
+    """
+    job, _ = _submit_analyze_job(req)
+
+    def frames() -> Iterator[str]:
+        yield f"data: {json.dumps({'type': 'job', 'id': job.id})}\n\n"
+        yield from _job_event_stream(job)
+
+    return _sse_response(frames())
+
+
+# ---------------------------------------------------------------------------
+# Jobs API
+# ---------------------------------------------------------------------------
+
+@app.post("/api/jobs/find-citations")
+def submit_find_citations_job(req: FindCitationsRequest):
+    job, created = _submit_find_job(req)
+    return {"job": job.summary(), "created": created}
+
+
+@app.post("/api/jobs/analyze")
+def submit_analyze_job(req: AnalyzeRequest):
+    job, created = _submit_analyze_job(req)
+    return {"job": job.summary(), "created": created}
+
+
+@app.get("/api/jobs")
+def list_jobs():
+    return {"jobs": [job.summary() for job in jobs.list()]}
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    return jobs.get(job_id).summary()
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """Request cancellation; running jobs stop starting new work and keep partial results."""
+    return jobs.cancel(job_id).summary()
+
+
+@app.get("/api/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    job = jobs.get(job_id)
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    return {"job": job.summary(), "result": _job_result(job)}
+
+
+@app.get("/api/jobs/{job_id}/events")
+def stream_job_events(job_id: str, after: int = 0):
+    """Replay a job's buffered events from index `after`, then follow it live via Server-Sent Events."""
+    return _sse_response(_job_event_stream(jobs.get(job_id), after))
 
 
 # ---------------------------------------------------------------------------
 # Paper logs (list available JSON files)
 # ---------------------------------------------------------------------------
 
+# Offset indexes of paper logs (sidecars in cache/paper_log_index/)
+paper_log_indexer = PaperLogIndexer(CACHE_DIR / "paper_log_index")
+
+
+def _is_paper_log(name: str) -> bool:
+    return name.startswith(PAPER_LOG_PREFIXES) and name.endswith(PAPER_LOG_SUFFIXES)
+
+
+def _paper_log_path(filename: str) -> Path:
+    if ".." in filename or "/" in filename or "\\" in filename:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    path = PAPER_LOG_DIR / filename
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    return path
+
+
 @app.get("/api/paper-logs/list")
 def list_paper_logs():
-    """List scholar_relevant_*.json and all_citations_*.json in paper_logs."""
+    """List scholar_relevant_*, all_citations_* and citations_* result files in paper_logs."""
     if not PAPER_LOG_DIR.exists():
         return {"files": []}
     files = []
     for f in PAPER_LOG_DIR.iterdir():
-        if f.suffix == ".json" and f.name.startswith(("scholar_relevant_", "all_citations_")):
-            files.append({"name": f.name, "path": str(f)})
+        if _is_paper_log(f.name):
+            files.append({"name": f.name, "path": str(f), "size": f.stat().st_size})
     files.sort(key=lambda x: x["name"], reverse=True)
     return {"files": files}
 
 
+@app.get("/api/paper-logs/{filename}/papers")
+def get_paper_log_page(
+    filename: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=PAPER_LOG_MAX_PAGE_SIZE),
+    category: Optional[str] = None,
+    subcategory: Optional[str] = None,
+    confidence: Optional[str] = None,
+    year: Optional[int] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    relevant: Optional[bool] = None,
+    sort: str = Query("file", pattern="^(file|citation_count)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """
+    One page of a paper log, filtered and sorted server-side.
+
+    Served from a per-file offset index (built on first access, rebuilt when
+    the file changes): only the requested page is read from disk. Also
+    returns the number of matches and per-field facet counts for the file.
+    """
+    path = _paper_log_path(filename)
+    if not _is_paper_log(filename):
+        raise HTTPException(status_code=400, detail="Not a paper log file")
+    try:
+        index = paper_log_indexer.get(path)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Cannot index {filename}: {e}")
+    result = paginate(
+        index, page, page_size,
+        category=category, subcategory=subcategory, confidence=confidence,
+        year=year, year_min=year_min, year_max=year_max, relevant=relevant,
+        sort=sort, order=order,
+    )
+    return {"filename": filename, **result}
+
+
 @app.get("/api/paper-logs/{filename}")
 def get_paper_log(filename: str):
-    """Return content of a paper log JSON file."""
-    if ".." in filename or "/" in filename or "\\" in filename:
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    path = PAPER_LOG_DIR / filename
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
+    """Return content of a paper log JSON file (JSONL logs: use /papers)."""
+    path = _paper_log_path(filename)
+    if path.suffix != ".json":
+        raise HTTPException(status_code=400, detail="Not a JSON file; use /api/paper-logs/{filename}/papers")
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
     return data
@@ -294,6 +851,15 @@ def get_paper_log(filename: str):
 # Health
 # ---------------------------------------------------------------------------
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def metrics():
+    """All counters/histograms of this process in the Prometheus text exposition format."""
+    JOBS.reset()
+    for job in jobs.list():
+        JOBS.inc(kind=job.kind, status=job.status)
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
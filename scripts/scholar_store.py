@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed store for the Scholar Citation Monitor.
+
+Holds what used to live in cache/*.json:
+- Seeds (normalized title -> S2 paperId, last synced citation count)
+- Citing papers (upserted by S2 id, falling back to normalized title)
+- Citation edges (seed paperId -> citing paper)
+- LLM analyses of citing papers
+- The citation list of the last search run (for --skip-search)
+
+Rows carry an updated_at timestamp so stale entries can be evicted by TTL.
+Seeds are refreshed on every run; citation data of a seed is only evicted
+once the seed itself has not been seen within the TTL (see evict_stale).
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeds (
+    norm_title TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    paper_id TEXT,
+    citation_count INTEGER,
+    synced_count INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seeds_paper_id ON seeds(paper_id);
+
+CREATE TABLE IF NOT EXISTS papers (
+    paper_key TEXT PRIMARY KEY,
+    s2_id TEXT,
+    norm_title TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_papers_s2_id ON papers(s2_id);
+CREATE INDEX IF NOT EXISTS idx_papers_norm_title ON papers(norm_title);
+
+CREATE TABLE IF NOT EXISTS edges (
+    seed_id TEXT NOT NULL,
+    citing_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (seed_id, citing_id)
+);
+CREATE INDEX IF NOT EXISTS idx_edges_citing_id ON edges(citing_id);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    paper_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def normalize_title(title: str) -> str:
+    return re.sub(r"\s+", " ", (title or "").strip().lower())
+
+
+def paper_key(paper: Dict[str, Any]) -> str:
+    """Stable key for a citing paper: S2 id if known, otherwise the normalized title."""
+    ssid = paper.get("semantic_scholar_id") or ""
+    if ssid:
+        return f"s2:{ssid}"
+    return f"title:{normalize_title(paper.get('title', ''))}"
+
+
+class ScholarStore:
+    """Thread-safe SQLite store; one connection guarded by a lock."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Seeds
+    # ------------------------------------------------------------------
+
+    def get_seed_ids(self, titles: Iterable[str]) -> Dict[str, str]:
+        """Map normalized title -> S2 paperId for the given seed titles."""
+        norm = list({normalize_title(t) for t in titles})
+        out: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(norm), 500):
+                chunk = norm[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT norm_title, paper_id FROM seeds WHERE paper_id IS NOT NULL "
+                    f"AND norm_title IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                out.update(rows)
+        return out
+
+    def upsert_seeds(self, papers: Iterable[Dict[str, Any]]):
+        """Record resolved seeds (those with a semantic_scholar_id)."""
+        now = time.time()
+        rows = [
+            (normalize_title(p["title"]), p["title"], p["semantic_scholar_id"], p.get("citation_count"), now)
+            for p in papers
+            if p.get("semantic_scholar_id")
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seeds (norm_title, title, paper_id, citation_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(norm_title) DO UPDATE SET title=excluded.title, paper_id=excluded.paper_id, "
+                "citation_count=excluded.citation_count, updated_at=excluded.updated_at",
+                rows,
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Citation edges / incremental state
+    # ------------------------------------------------------------------
+
+    def add_edges(self, seed_id: str, citing_ids: Iterable[str]):
+        """Insert edges, refreshing updated_at of those already stored."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO edges (seed_id, citing_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(seed_id, citing_id) DO UPDATE SET updated_at=excluded.updated_at",
+                [(seed_id, cid, now) for cid in citing_ids],
+            )
+            self._conn.commit()
+
+    def get_citation_state(self, seed_id: str) -> Dict[str, Any]:
+        """{"citation_count": synced count or None, "citing_ids": [...]} for one seed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_count FROM seeds WHERE paper_id = ? AND synced_count IS NOT NULL LIMIT 1",
+                (seed_id,),
+            ).fetchone()
+            ids = [r[0] for r in self._conn.execute("SELECT citing_id FROM edges WHERE seed_id = ?", (seed_id,))]
+        return {"citation_count": row[0] if row else None, "citing_ids": ids}
+
+    def set_synced_count(self, seed_id: str, title: str, citation_count: Optional[int]):
+        """Citation count at which every citing paper of seed_id was last seen."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO seeds (norm_title, title, paper_id, synced_count, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(norm_title) DO UPDATE SET paper_id=excluded.paper_id, "
+                "synced_count=excluded.synced_count, updated_at=excluded.updated_at",
+                (normalize_title(title), title, seed_id, citation_count, now),
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Citing papers
+    # ------------------------------------------------------------------
+
+    def upsert_papers(self, papers: Iterable[Dict[str, Any]]):
+        now = time.time()
+        rows = []
+        for p in papers:
+            data = {k: v for k, v in p.items() if k != "analysis"}
+            rows.append((
+                paper_key(p),
+                p.get("semantic_scholar_id") or None,
+                normalize_title(p.get("title", "")),
+                json.dumps(data, ensure_ascii=False),
+                now,
+            ))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO papers (paper_key, s2_id, norm_title, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(paper_key) DO UPDATE SET s2_id=excluded.s2_id, norm_title=excluded.norm_title, "
+                "data=excluded.data, updated_at=excluded.updated_at",
+                rows,
+            )
+            self._conn.commit()
+
+    def get_paper(self, s2_id: Optional[str] = None, title: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Look up one citing paper by S2 id or normalized title."""
+        with self._lock:
+            if s2_id:
+                row = self._conn.execute("SELECT data FROM papers WHERE s2_id = ? LIMIT 1", (s2_id,)).fetchone()
+            elif title:
+                row = self._conn.execute(
+                    "SELECT data FROM papers WHERE norm_title = ? LIMIT 1", (normalize_title(title),)
+                ).fetchone()
+            else:
+                row = None
+        return json.loads(row[0]) if row else None
+
+    def save_citations(self, citations: List[Dict[str, Any]]):
+        """Upsert citing papers and remember them as the last search result."""
+        self.upsert_papers(citations)
+        keys = [paper_key(p) for p in citations]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_citations', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (json.dumps(keys),),
+            )
+            self._conn.commit()
+
+    def load_citations(self) -> List[Dict[str, Any]]:
+        """Citing papers of the last search run, in their original order."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_citations'").fetchone()
+            keys: List[str] = json.loads(row[0]) if row else []
+            by_key: Dict[str, Dict[str, Any]] = {}
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                for k, data in self._conn.execute(
+                    f"SELECT paper_key, data FROM papers WHERE paper_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    by_key[k] = json.loads(data)
+        missing = len(keys) - sum(k in by_key for k in keys)
+        if missing:
+            logger.warning(f"{missing} citing papers of the last search run are no longer in {self.path}")
+        return [by_key[k] for k in keys if k in by_key]
+
+    # ------------------------------------------------------------------
+    # Analyses
+    # ------------------------------------------------------------------
+
+    def save_analyses(self, papers: Iterable[Dict[str, Any]]):
+        """Upsert the "analysis" of each paper (papers without one are ignored)."""
+        papers = [p for p in papers if p.get("analysis")]
+        if not papers:
+            return
+        self.upsert_papers(papers)
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO analyses (paper_key, result, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(paper_key) DO UPDATE SET result=excluded.result, updated_at=excluded.updated_at",
+                [(paper_key(p), json.dumps(p["analysis"], ensure_ascii=False), now) for p in papers],
+            )
+            self._conn.commit()
+
+    def get_analysis(self, paper: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM analyses WHERE paper_key = ?", (paper_key(paper),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_analyzed_papers(self) -> Iterator[Dict[str, Any]]:
+        """Every stored paper that has an analysis, with the analysis attached."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.data, a.result FROM analyses a JOIN papers p ON p.paper_key = a.paper_key"
+            ).fetchall()
+        for data, result in rows:
+            paper = json.loads(data)
+            paper["analysis"] = json.loads(result)
+            yield paper
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def evict_stale(self, ttl_s: float) -> int:
+        """Delete citation data not updated within ttl_s seconds, in one transaction.
+
+        Edges are kept while their seed is still tracked (seen within ttl_s).
+        Seeds that are not lose their edges and their synced_count together,
+        so an incremental run fetches them in full instead of treating every
+        citing paper as new. Papers still referenced by an edge or by the last
+        search run are kept, and so are their analyses.
+        """
+        cutoff = time.time() - ttl_s
+        removed = 0
+        with self._lock:
+            self._conn.execute(
+                "UPDATE seeds SET synced_count = NULL WHERE updated_at < ? AND synced_count IS NOT NULL", (cutoff,)
+            )
+            removed += self._conn.execute(
+                "DELETE FROM edges WHERE updated_at < ? AND seed_id NOT IN "
+                "(SELECT paper_id FROM seeds WHERE updated_at >= ? AND paper_id IS NOT NULL)",
+                (cutoff, cutoff),
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM papers WHERE updated_at < ? "
+                "AND paper_key NOT IN (SELECT 's2:' || citing_id FROM edges) "
+                "AND paper_key NOT IN (SELECT j.value FROM meta, json_each(meta.value) AS j WHERE meta.key = 'last_citations')",
+                (cutoff,),
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM analyses WHERE updated_at < ? AND paper_key NOT IN (SELECT paper_key FROM papers)",
+                (cutoff,),
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info(f"Evicted {removed} stale rows from {self.path}")
+        return removed
+
+    def import_legacy_json(self, cache_dir: Path):
+        """One-time import of the citations in the old scholar_cache.json."""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                return
+        path = Path(cache_dir) / "scholar_cache.json"
+        cache = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping legacy cache {path}: {e}")
+        if cache.get("citations"):
+            self.save_citations(cache["citations"])
+
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', '1')")
+            self._conn.commit()
+
+
+_stores: Dict[str, ScholarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: Path) -> ScholarStore:
+    """Process-wide ScholarStore per database path."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ScholarStore(path)
+            _stores[key] = store
+        return store
@@ -0,0 +1,18 @@
+"""
+Shared pytest setup.
+
+The monitor modules live flat in scripts/ and read SCHOLAR_CACHE_DIR at
+import time, so the path and a throwaway cache directory are set up here,
+before any test module imports them.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+os.environ["SCHOLAR_CACHE_DIR"] = tempfile.mkdtemp(prefix="scholar-tests-")
@@ -0,0 +1,50 @@
+import json
+from urllib.request import Request, urlopen
+
+from benchmark import DEFAULTS, MockSemanticScholar, _percentile, mock_verdict, scenario_configs, synthetic_paper
+
+
+def get(url, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_synthetic_data_is_deterministic():
+    assert synthetic_paper("abc", with_analysis=True) == synthetic_paper("abc", with_analysis=True)
+    assert synthetic_paper("abc")["title"] != synthetic_paper("abd")["title"]
+    verdicts = [mock_verdict(f"Title {i}", 0.2) for i in range(1000)]
+    relevant = sum(v["is_model_copyright_protection"] for v in verdicts)
+    assert 150 < relevant < 250
+    assert all(v["category"] is None for v in verdicts if not v["is_model_copyright_protection"])
+
+
+def test_percentile_nearest_rank():
+    assert _percentile([], 95) == 0.0
+    assert _percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert _percentile([float(i) for i in range(1, 101)], 95) == 95.0
+
+
+def test_quick_configs_shrink_sizes():
+    full = {c["name"]: c for c in scenario_configs()}
+    quick = {c["name"]: c for c in scenario_configs(quick=True)}
+    assert full.keys() == quick.keys()
+    assert quick["collect-w1"]["fan_out"] < full["collect-w1"]["fan_out"] == DEFAULTS["fan_out"]
+    assert [c["name"] for c in scenario_configs(only=["collect-w4"])] == ["collect-w4"]
+
+
+def test_mock_s2_pages_and_throttles_deterministically():
+    config = {**DEFAULTS, "fan_out": 250, "s2_latency_ms": 0, "s2_429_rate": 0.0}
+    with MockSemanticScholar(config) as s2:
+        seed = get(f"{s2.url}/paper/search?query=Seed&limit=1")["data"][0]
+        assert get(f"{s2.url}/paper/batch", {"ids": [seed["paperId"]]})[0] == seed
+        cited, offset = [], 0
+        while offset is not None:
+            page = get(f"{s2.url}/paper/{seed['paperId']}/citations?offset={offset}&limit=100")
+            cited += [c["citingPaper"]["paperId"] for c in page["data"]]
+            offset = page.get("next")
+        assert len(cited) == len(set(cited)) == 250
+        s2.config["s2_429_rate"] = 0.25
+        s2.requests = s2.throttled = 0
+        assert [s2.count_request(0.25) for _ in range(8)] == [False, False, False, True] * 2
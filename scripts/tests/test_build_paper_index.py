@@ -0,0 +1,69 @@
+from build_paper_index import PaperIndex, bibtex_key, build_paper_index, index_record, parse_bibtex
+
+BIB = r"""
+@string{icml = "ICML"}
+% a comment line
+@inproceedings{kirchenbauer2023watermark,
+  title = {A Watermark for {Large} Language Models},
+  author = {Kirchenbauer, John and Geiping, Jonas and Wen, Yuxin},
+  booktitle = "Proceedings of {ICML} 2023",
+  year = 2023,
+  eprint = {2301.10226},
+}
+@article{quoted,
+  title = "Quotes with {"braces"} inside",
+  journal = {arXiv preprint arXiv:2402.01234},
+  year = {2024},
+}
+@misc{broken,
+  title = {Missing closing brace},
+  year = {2022},
+
+@misc{concat,
+  title = "First part " # "second part",
+  doi = {10.1000/xyz},
+}
+"""
+
+
+def test_parse_entries():
+    entries = {e["key"]: e for e in parse_bibtex(BIB)}
+    assert list(entries) == ["kirchenbauer2023watermark", "quoted", "broken", "concat"]
+    entry = entries["kirchenbauer2023watermark"]
+    assert entry["type"] == "inproceedings"
+    assert entry["title"] == "A Watermark for {Large} Language Models"
+    assert entry["year"] == "2023"
+    assert entries["quoted"]["title"] == 'Quotes with {"braces"} inside'
+    assert entries["broken"]["title"] == "Missing closing brace"
+    assert entries["concat"]["title"] == "First part second part"
+
+
+def test_index_record():
+    entries = {e["key"]: e for e in parse_bibtex(BIB)}
+    record = index_record(entries["kirchenbauer2023watermark"])
+    assert record["title"] == "A Watermark for Large Language Models"
+    assert record["author"] == "Kirchenbauer, John and Geiping, Jonas and others"
+    assert record["year"] == 2023
+    assert record["arxiv"] == "2301.10226"
+    assert index_record(entries["quoted"])["arxiv"] == "2402.01234"
+    assert "doi" not in index_record(entries["quoted"])
+
+
+def test_bibtex_key():
+    assert bibtex_key("@article{abc2024,\n title={x}}") == "abc2024"
+    assert bibtex_key("no entry") is None
+
+
+def test_build_and_lookup(tmp_path):
+    bib = tmp_path / "references.bib"
+    bib.write_text(BIB, encoding="utf-8")
+    pages = [
+        {"title": "A watermark for large language models", "url": "dup of the bib entry"},
+        {"title": "Only On The Page", "arxiv_id": "2403.00001", "year": 2024},
+    ]
+    index = PaperIndex(build_paper_index(bib, pages))
+    assert index.lookup(title="A Watermark for Large Language Models!")["key"] == "kirchenbauer2023watermark"
+    assert index.lookup(arxiv_id="2301.10226")["key"] == "kirchenbauer2023watermark"
+    page_entry = index.lookup(arxiv_id="2403.00001")
+    assert page_entry["type"] == "page" and page_entry["title"] == "Only On The Page"
+    assert index.lookup(title="Unknown paper") is None
@@ -0,0 +1,52 @@
+import pytest
+
+from dedup_index import TitleDedupIndex, ids_conflict, paper_ids
+
+
+def test_preprint_and_published_titles_match():
+    index = TitleDedupIndex()
+    index.add("preprint", "Watermarking Large Language Models: A Survey")
+    assert index.query("Watermarking large language models - a survey.") == "preprint"
+    assert index.query("Watermarking Large Language Models: Survey") == "preprint"
+
+
+@pytest.mark.parametrize("first, second", [
+    ("A Watermark for Large Language Models", "A Watermark for Vision Language Models"),
+    ("Fingerprinting Large Language Models", "Fingerprinting Large Language Models via Backdoors"),
+    ("On the Robustness of LLM Watermarks Part I", "On the Robustness of LLM Watermarks Part II"),
+])
+def test_distinct_papers_with_different_ids_never_merge(first, second):
+    index = TitleDedupIndex(threshold=0.5)
+    index.add("a", first, {"s2": "aaa"})
+    assert index.query(second, {"s2": "bbb"}) is None
+    assert index.find_or_add("b", second, {"s2": "bbb"}) is None
+    assert len(index) == 2
+
+
+def test_exact_title_with_conflicting_ids_is_not_a_duplicate():
+    index = TitleDedupIndex()
+    index.add("v1", "Model Watermarking", {"doi": "10.1/a"})
+    assert index.query("Model Watermarking", {"doi": "10.1/b"}) is None
+    assert index.query("Model Watermarking", {"doi": "10.1/a"}) == "v1"
+    assert index.query("Model Watermarking") == "v1"
+
+
+def test_fuzzy_match_needs_one_side_without_ids():
+    index = TitleDedupIndex()
+    index.add("known", "Watermarking Large Language Models: A Survey", {"s2": "aaa"})
+    assert index.query("Watermarking Large Language Models: Survey", {"arxiv": "2401.00001"}) is None
+    assert index.query("Watermarking Large Language Models: Survey") == "known"
+
+
+def test_length_ratio_guard():
+    index = TitleDedupIndex(threshold=0.5)
+    index.add("short", "Watermarking Language Models")
+    assert index.query("Watermarking Language Models with Provable Robustness Guarantees") is None
+
+
+def test_paper_ids_and_conflicts():
+    a = paper_ids({"semantic_scholar_id": "ABC", "doi": " 10.1/X ", "arxiv_id": ""})
+    assert a == {"s2": "abc", "doi": "10.1/x"}
+    assert not ids_conflict(a, {"s2": "abc"})
+    assert not ids_conflict(a, {"arxiv": "2401.00001"})
+    assert ids_conflict(a, {"doi": "10.1/y"})
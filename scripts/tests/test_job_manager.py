@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from scholar_monitor_app import JobManager
+
+
+def wait_for(job, *statuses):
+    with job._cond:
+        assert job._cond.wait_for(lambda: job.status in statuses, timeout=5), job.status
+
+
+@pytest.fixture
+def manager():
+    return JobManager(max_workers=2)
+
+
+def blocking(gate):
+    def run(job):
+        gate.wait(5)
+        return {"count": 0}
+    return run
+
+
+def test_find_jobs_queue_behind_each_other(manager):
+    gate = threading.Event()
+    first, _ = manager.submit("find-citations", {"seeds": 1}, blocking(gate))
+    second, created = manager.submit("find-citations", {"seeds": 2}, blocking(gate))
+    assert created
+    wait_for(first, "running")
+    assert second.status == "queued"
+    # Other kinds keep the shared workers
+    analyze, _ = manager.submit("analyze", {"papers": 1}, lambda job: {"count": 0})
+    wait_for(analyze, "done")
+    gate.set()
+    wait_for(second, "done")
+    assert first.status == "done"
+
+
+def test_identical_submission_reuses_the_queued_job(manager):
+    gate = threading.Event()
+    manager.submit("find-citations", {"seeds": 1}, blocking(gate))
+    queued, _ = manager.submit("find-citations", {"seeds": 2}, blocking(gate))
+    again, created = manager.submit("find-citations", {"seeds": 2}, blocking(gate))
+    assert again is queued and not created
+    gate.set()
+    wait_for(queued, "done")
+
+
+def test_cancelled_while_queued_never_runs(manager):
+    gate = threading.Event()
+    ran = []
+    manager.submit("find-citations", {"seeds": 1}, blocking(gate))
+    queued, _ = manager.submit("find-citations", {"seeds": 2}, lambda job: ran.append(job))
+    manager.cancel(queued.id)
+    gate.set()
+    wait_for(queued, "cancelled")
+    assert ran == []
@@ -0,0 +1,51 @@
+import pytest
+
+from scholar_citation_monitor import _JsLiteralParser
+
+
+def parse(text: str):
+    return _JsLiteralParser(text).value()
+
+
+def test_quote_styles_and_escapes():
+    papers = parse("""[
+        {title: "Double \\"quoted\\"", venue: 'Single \\'quoted\\'', link: `back\\ttick`},
+        {title: "Caf\\u00e9"},
+    ]""")
+    assert papers == [
+        {"title": 'Double "quoted"', "venue": "Single 'quoted'", "link": "back\ttick"},
+        {"title": "Café"},
+    ]
+
+
+def test_comments_skip_commented_out_papers():
+    papers = parse("""[
+        // {title: "Line comment"},
+        {title: "Kept"}, /* {title: "Block comment"}, */
+    ]""")
+    assert papers == [{"title": "Kept"}]
+
+
+def test_numbers_literals_and_bare_identifiers():
+    value = parse('{year: 2024, score: 0.5, draft: false, ok: true, ref: someVariable, "quoted key": 1,}')
+    assert value == {"year": 2024, "score": 0.5, "draft": False, "ok": True, "ref": None, "quoted key": 1}
+
+
+def test_starts_at_given_position():
+    text = "const papers = [{title: 'A'}]; const other = [1];"
+    parser = _JsLiteralParser(text, text.index("["))
+    assert parser.value() == [{"title": "A"}]
+    assert text[parser.pos] == ";"
+
+
+@pytest.mark.parametrize("text, message", [
+    ("[{title: 'open}]", "Unterminated string"),
+    ("[1 2]", "Expected ',' or ']'"),
+    ("{title 'x'}", "Expected ':'"),
+    ("[1, /* never closed", "Unterminated comment"),
+])
+def test_errors_report_line(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse("\n" + text)
+    with pytest.raises(ValueError, match="at line 2"):
+        parse("\n" + text)
@@ -0,0 +1,63 @@
+import json
+
+from paper_log_index import PaperLogIndex, PaperLogIndexer, _iter_spans_indented, _iter_spans_jsonl
+
+PAPERS = [
+    {
+        "title": "First {with braces}",
+        "year": 2023,
+        "citation_count": 5,
+        "analysis": {"is_model_copyright_protection": True, "category": "watermarking", "classification_confidence": "High"},
+    },
+    {"title": "Second, \"quoted\"\n    }", "year": "n/a", "analysis": {}},
+    {
+        "title": "Third",
+        "year": 2024,
+        "citation_count": 12,
+        "analysis": {"is_model_copyright_protection": True, "category": "fingerprinting", "classification_confidence": "low"},
+    },
+]
+
+
+def read_span(path, span):
+    offset, length = span
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def test_indented_spans_cover_each_paper(tmp_path):
+    path = tmp_path / "all_citations_20250101.json"
+    path.write_text(json.dumps({"date": "2025-01-01", "papers": PAPERS}, ensure_ascii=False, indent=2), encoding="utf-8")
+    spans = list(_iter_spans_indented(path))
+    assert [read_span(path, span) for span in spans] == PAPERS
+
+
+def test_jsonl_spans_skip_blank_lines_and_crlf(tmp_path):
+    path = tmp_path / "citations_20250101.jsonl"
+    lines = [json.dumps(p, ensure_ascii=False) for p in PAPERS]
+    path.write_bytes(("\r\n".join(lines[:2]) + "\r\n\n" + lines[2] + "\n").encode("utf-8"))
+    assert [read_span(path, span) for span in _iter_spans_jsonl(path)] == PAPERS
+
+
+def test_select_and_read(tmp_path):
+    path = tmp_path / "citations_20250101.jsonl"
+    path.write_text("".join(json.dumps(p) + "\n" for p in PAPERS), encoding="utf-8")
+    index = PaperLogIndex.build(path, jsonl=True)
+    assert len(index) == 3
+    assert [p["title"] for p in index.read(index.select(relevant=True))] == ["First {with braces}", "Third"]
+    assert [p["title"] for p in index.read(index.select(confidence="high"))] == ["First {with braces}"]
+    assert [p["title"] for p in index.read(index.select(sort="citation_count"))][0] == "Third"
+    assert list(index.select(year_min=2024)) == [2]
+    assert list(index.select(category="unknown")) == []
+
+
+def test_indexer_rebuilds_when_the_log_changes(tmp_path):
+    path = tmp_path / "citations_20250101.jsonl"
+    path.write_text(json.dumps(PAPERS[0]) + "\n", encoding="utf-8")
+    indexer = PaperLogIndexer(tmp_path / "index")
+    assert len(indexer.get(path)) == 1
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(PAPERS[2]) + "\n")
+    assert len(indexer.get(path)) == 2
+    assert len(PaperLogIndexer(tmp_path / "index").get(path)) == 2
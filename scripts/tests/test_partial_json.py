@@ -0,0 +1,97 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from paper_analysis import (
+    TRIAGE_KEYS,
+    PartialJsonParser,
+    _complete_keys,
+    _parse_analysis_response,
+    _StreamReader,
+    _verdict_outcome,
+    parse_partial_json,
+)
+
+VERDICT = (
+    '{"is_model_copyright_protection": true, "category": "watermarking", '
+    '"subcategory": "text_watermarking", "classification_confidence": "high", '
+    '"brief_summary": "A watermark.", "reasoning": "Embeds a signal."}'
+)
+
+
+def test_surrounding_prose_and_trailing_commas():
+    assert parse_partial_json('Sure! {"a": [1, 2,], "b": "x",} Hope this helps.') == {"a": [1, 2], "b": "x"}
+
+
+def test_feed_in_chunks_matches_whole_text():
+    parser = PartialJsonParser()
+    for i in range(0, len(VERDICT), 7):
+        parser.feed(VERDICT[i:i + 7])
+    assert parser.closed
+    assert parser.value() == parse_partial_json(VERDICT)
+
+
+def test_text_after_the_value_is_ignored():
+    parser = PartialJsonParser()
+    parser.feed('{"a": 1} {"b": 2}')
+    assert parser.value() == {"a": 1}
+
+
+def test_feed_reports_completed_members():
+    parser = PartialJsonParser()
+    assert not parser.feed('{"a": "x')
+    assert parser.feed('", "b"')
+    assert parser.feed(": 2}")
+
+
+def test_truncated_string_is_closed():
+    assert parse_partial_json('{"a": 1, "b": "cut o') == {"a": 1, "b": "cut o"}
+
+
+def test_complete_only_drops_the_unfinished_member():
+    parser = PartialJsonParser()
+    parser.feed('{"a": 1, "b": "cut o')
+    assert parser.value(complete_only=True) == {"a": 1}
+
+
+def test_nothing_to_parse():
+    assert parse_partial_json("no json here") is None
+    assert parse_partial_json('{"a": tru') is None
+
+
+@pytest.mark.parametrize("cut, outcome", [
+    (len(VERDICT), "parsed"),
+    (VERDICT.index('"category"'), "partial"),
+    (VERDICT.index("true"), "parse_failed"),
+])
+def test_truncated_verdicts_are_not_complete(cut, outcome):
+    parser = PartialJsonParser()
+    parser.feed(VERDICT[:cut])
+    assert _verdict_outcome(parser.value(complete_only=True)) == outcome
+
+
+def test_verdict_needs_a_known_confidence():
+    item = parse_partial_json(VERDICT)
+    assert _verdict_outcome(item) == "parsed"
+    assert _verdict_outcome({**item, "classification_confidence": "very"}) == "partial"
+
+
+def test_stream_stops_once_the_verdict_fields_are_complete():
+    reader = _StreamReader("sync", TRIAGE_KEYS, time.perf_counter())
+    cut = VERDICT.index('"brief_summary"') + 5
+    chunks = [VERDICT[i:i + 8] for i in range(0, len(VERDICT), 8)]
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        if reader.add(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])):
+            break
+    assert reader.stop_reason == "required_keys"
+    assert read <= cut + 8
+
+    streamed = SimpleNamespace(triage=False, stream=True)
+    result, outcome = _parse_analysis_response(reader.text, {"title": "T"}, False, _complete_keys(streamed))
+    assert outcome == "parsed"
+    assert result["brief_summary"] == "" and result["reasoning"] == ""
+    # Without streaming the same text is a truncated full analysis
+    assert _parse_analysis_response(reader.text, {"title": "T"})[1] == "partial"
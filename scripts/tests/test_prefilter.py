@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import prefilter
+from prefilter import PreFilter, apply_prefilter, get_prefilter, reference_key
+
+SEEDS = [
+    {"title": "Instructional Fingerprinting of Large Language Models", "abstract": "Backdoor fingerprint for ownership."},
+    {"title": "A Watermark for Large Language Models", "abstract": "Text watermark for generated text."},
+]
+RELEVANT = {"title": "Backdoor fingerprints prove model ownership", "abstract": "We embed a fingerprint into model weights."}
+OFF_TOPIC = {"title": "Protein folding with graph networks", "abstract": "We predict protein structures."}
+
+
+@pytest.fixture(autouse=True)
+def fixed_reference(monkeypatch):
+    monkeypatch.setattr(prefilter, "reference_papers", lambda: list(SEEDS))
+    monkeypatch.setattr(prefilter, "_FITTED", {})
+
+
+def test_score_does_not_depend_on_the_batch():
+    scorer = get_prefilter(0.1)
+    alone = scorer.score_many([RELEVANT])
+    batched = scorer.score_many([OFF_TOPIC, RELEVANT, OFF_TOPIC])
+    assert np.isclose(alone[0], batched[1])
+    assert batched[1] > batched[0]
+
+
+def test_every_entry_point_fits_on_the_same_reference():
+    default = get_prefilter(0.1)
+    explicit = PreFilter(0.1).fit(SEEDS)
+    assert np.allclose(default.score_many([RELEVANT, OFF_TOPIC]), explicit.score_many([RELEVANT, OFF_TOPIC]))
+    report = prefilter.evaluate([dict(RELEVANT, analysis={"is_model_copyright_protection": True})], [0.0])
+    assert report[0]["passed"] == 1
+
+
+def test_fit_is_saved_and_reloaded(tmp_path):
+    path = tmp_path / "prefilter_fit.json"
+    fitted = get_prefilter(0.1, path=path)
+    assert path.exists()
+    loaded = PreFilter()
+    assert loaded.load(path, reference_key(SEEDS))
+    assert not loaded.load(path, "other-version")
+    assert np.allclose(loaded.score_many([RELEVANT]), fitted.score_many([RELEVANT]))
+
+
+def test_threshold_zero_keeps_every_paper():
+    assert apply_prefilter([OFF_TOPIC, RELEVANT], 0) == ([0, 1], {})
+    keep, rejected = apply_prefilter([OFF_TOPIC, RELEVANT], 0.05)
+    assert keep == [1] and rejected[0]["prefiltered"]
@@ -0,0 +1,45 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+import paper_analysis
+from paper_analysis import ApiEndpoint, build_classification_prompt, categories_version, set_categories
+
+
+class FailingModels:
+    def __init__(self):
+        self.calls = 0
+
+    def list(self):
+        self.calls += 1
+        raise ConnectionError("endpoint down")
+
+
+def test_failed_model_lookup_is_not_repeated(monkeypatch):
+    endpoint = ApiEndpoint("http://127.0.0.1:9/v1")
+    models = FailingModels()
+    endpoint._client = SimpleNamespace(models=models)
+    assert endpoint.resolve_model() is None
+    assert endpoint.resolve_model() is None
+    assert models.calls == 1
+    monkeypatch.setattr(paper_analysis, "MODEL_LOOKUP_RETRY_S", 0.0)
+    endpoint.resolve_model()
+    assert models.calls == 2
+
+
+@pytest.fixture
+def restore_categories():
+    saved = copy.deepcopy(paper_analysis.CATEGORIES)
+    yield
+    set_categories(saved)
+
+
+def test_set_categories_refreshes_version_and_prompts(restore_categories):
+    version, prompt = categories_version(), build_classification_prompt()
+    assert categories_version() == version
+    changed = copy.deepcopy(paper_analysis.CATEGORIES)
+    changed["extra"] = {"name": "Extra category", "description": "Only for this test", "subcategories": {"x": "Extra"}}
+    set_categories(changed)
+    assert categories_version() != version
+    assert "Extra category" in build_classification_prompt() != prompt
@@ -0,0 +1,56 @@
+import pytest
+
+from result_writer import ResultWriter, iter_jsonl
+
+
+def indices(path):
+    return [paper["i"] for paper in iter_jsonl(path)]
+
+
+def test_write_at_keeps_input_order(tmp_path):
+    path = tmp_path / "citations.jsonl"
+    with ResultWriter(path) as writer:
+        for i in (2, 0, 3, 1):
+            writer.write_at(i, {"i": i})
+        writer.write_at(1, {"i": "duplicate"})
+    assert indices(path) == [0, 1, 2, 3]
+
+
+def test_reorder_buffer_is_bounded(tmp_path):
+    path = tmp_path / "citations.jsonl"
+    with ResultWriter(path, max_pending=3) as writer:
+        for i in range(1, 6):
+            writer.write_at(i, {"i": i})
+            assert writer.pending <= 3
+        writer.write_at(0, {"i": 0})
+    assert indices(path) == [1, 2, 3, 4, 5, 0]
+
+
+def test_finish_fills_in_missing_records(tmp_path):
+    path = tmp_path / "citations.jsonl"
+    papers = [{"i": i} for i in range(4)]
+    with ResultWriter(path, max_pending=1) as writer:
+        writer.write_at(2, papers[2])
+        writer.write_at(3, papers[3])
+        writer.finish(papers)
+    assert sorted(indices(path)) == [0, 1, 2, 3]
+
+
+def test_flush_skips_gaps(tmp_path):
+    path = tmp_path / "citations.jsonl"
+    with ResultWriter(path) as writer:
+        writer.write_at(1, {"i": 1})
+        writer.write_at(3, {"i": 3})
+        writer.flush()
+    assert indices(path) == [1, 3]
+
+
+def test_failure_keeps_the_written_prefix(tmp_path):
+    path = tmp_path / "citations.jsonl"
+    with pytest.raises(RuntimeError):
+        with ResultWriter(path) as writer:
+            writer.write_at(0, {"i": 0})
+            writer.write_at(2, {"i": 2})
+            raise RuntimeError("analysis crashed")
+    assert indices(path) == [0]
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,93 @@
+import pytest
+
+from s2_response_cache import S2ResponseCache
+from scholar_citation_monitor import OfflineCacheMiss, SemanticScholarClient, TokenBucket, collect_all_citations
+from scholar_store import ScholarStore
+
+SEARCH_FIELDS = "paperId,title,authors,year,abstract,citationCount,url"
+
+
+def search_key(title):
+    return S2ResponseCache.make_key("GET", "/paper/search", {"query": title, "limit": 1, "fields": SEARCH_FIELDS})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return S2ResponseCache(tmp_path / "s2_responses.sqlite3")
+
+
+def offline_client(cache):
+    return SemanticScholarClient(api_key=None, rate_limiter=TokenBucket(1000), response_cache=cache, offline=True)
+
+
+def test_ttl_and_offline_reads(cache):
+    cache.ttls["paper/search"] = 0
+    cache.put(search_key("Seed"), "paper/search", {"data": [{"paperId": "p1"}]})
+    assert cache.get(search_key("Seed"), "paper/search")[0] == "stale"
+    assert offline_client(cache).search_paper_by_title("Seed") == {"paperId": "p1"}
+
+
+def test_offline_miss_raises(cache):
+    with pytest.raises(OfflineCacheMiss, match="offline mode"):
+        offline_client(cache).search_paper_by_title("Never searched")
+
+
+def test_cached_empty_search_is_a_miss(cache):
+    cache.put(search_key("Not found"), "paper/search", {"data": []})
+    with pytest.raises(OfflineCacheMiss):
+        offline_client(cache).search_paper_by_title("Not found")
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = S2ResponseCache(tmp_path / "small.sqlite3", max_bytes=600)
+    for i in range(20):
+        cache.put(f"k{i}", "paper/batch", {"paperId": f"p{i}", "title": "x" * 50 + str(i)})
+    assert cache.stats()["bytes"] <= 600
+    assert cache.get("k19", "paper/batch")[0] == "hit"
+    assert cache.get("k0", "paper/batch")[0] == "miss"
+
+
+class PartlyCachedS2:
+    """Offline client stand-in: only the seeds in `cached` have responses."""
+
+    def __init__(self, cached):
+        self.cached = set(cached)
+        self.fetched = []
+
+    def search_paper_by_title(self, title):
+        if title not in self.cached:
+            raise OfflineCacheMiss(f"Not in the response cache (offline mode): {title}")
+        return {"paperId": title.lower(), "citationCount": 1}
+
+    def get_papers_batch(self, ids):
+        return [None] * len(ids)
+
+    def iter_citation_pages(self, paper_id, max_results=None):
+        self.fetched.append(paper_id)
+        yield [{"paperId": f"{paper_id}-citer", "title": f"Citing paper of {paper_id}"}]
+
+
+def test_offline_miss_skips_only_that_seed(tmp_path):
+    store = ScholarStore(tmp_path / "scholar.sqlite3")
+    seeds = [{"title": t, "url": ""} for t in ("Alpha", "Beta", "Gamma")]
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    events = []
+
+    def collect(s2, resume=False):
+        found = collect_all_citations(
+            [dict(p) for p in seeds], max_citations_per_paper=0, workers=2, store=store, s2_client=s2,
+            checkpoint_path=checkpoint, resume=resume, progress_callback=events.append,
+        )
+        return sorted(c["semantic_scholar_id"] for c in found)
+
+    assert collect(PartlyCachedS2({"Alpha", "Gamma"})) == ["alpha-citer", "gamma-citer"]
+    assert [(e["title"], e["action"]) for e in events if e["type"] == "paper"] == [
+        ("Alpha", "success"), ("Beta", "offline_miss"), ("Gamma", "success"),
+    ]
+    assert checkpoint.exists()
+
+    online = PartlyCachedS2({"Alpha", "Beta", "Gamma"})
+    assert collect(online, resume=True) == ["alpha-citer", "beta-citer", "gamma-citer"]
+    assert online.fetched == ["beta"]
+    assert not checkpoint.exists()
+    store.close()
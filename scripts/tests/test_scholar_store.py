@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from scholar_citation_monitor import collect_all_citations
+from scholar_store import ScholarStore
+
+SEED = {"title": "A Watermark for Large Language Models", "url": ""}
+DAY = 86400
+
+
+class FakeS2:
+    """Stands in for SemanticScholarClient: one seed whose citing papers are listed newest first."""
+
+    def __init__(self, citing):
+        self.citing = list(citing)
+
+    def _seed(self):
+        return {"paperId": "seed-1", "citationCount": len(self.citing)}
+
+    def search_paper_by_title(self, title):
+        return self._seed()
+
+    def get_papers_batch(self, ids):
+        return [self._seed() if i == "seed-1" else None for i in ids]
+
+    def iter_citation_pages(self, paper_id, max_results=None):
+        papers = [{"paperId": c, "title": f"Citing paper {c}"} for c in reversed(self.citing)]
+        yield papers[:max_results] if max_results else papers
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScholarStore(tmp_path / "scholar.sqlite3")
+    yield store
+    store.close()
+
+
+def age(store, *tables, days=30):
+    """Pretend the rows of these tables were last updated `days` ago."""
+    with store._lock:
+        for table in tables:
+            store._conn.execute(f"UPDATE {table} SET updated_at = updated_at - ?", (days * DAY,))
+        store._conn.commit()
+
+
+def collect(store, s2):
+    found = collect_all_citations([dict(SEED)], max_citations_per_paper=0, incremental=True, store=store, s2_client=s2)
+    return sorted(c["semantic_scholar_id"] for c in found)
+
+
+def test_incremental_resync_returns_only_new_citers(store):
+    s2 = FakeS2(["c1", "c2", "c3"])
+    assert collect(store, s2) == ["c1", "c2", "c3"]
+    assert collect(store, s2) == []
+    s2.citing.append("c4")
+    assert collect(store, s2) == ["c4"]
+    assert store.get_citation_state("seed-1")["citation_count"] == 4
+
+
+def test_eviction_keeps_edges_of_tracked_seeds(store):
+    s2 = FakeS2(["c1", "c2", "c3"])
+    collect(store, s2)
+    age(store, "edges")
+    store.evict_stale(7 * DAY)
+    assert sorted(store.get_citation_state("seed-1")["citing_ids"]) == ["c1", "c2", "c3"]
+    s2.citing.append("c4")
+    assert collect(store, s2) == ["c4"]
+
+
+def test_every_fetched_edge_is_touched_on_sync(store):
+    s2 = FakeS2(["c1", "c2"])
+    collect(store, s2)
+    age(store, "edges")
+    s2.citing.append("c3")
+    collect(store, s2)
+    age(store, "seeds")
+    store.evict_stale(7 * DAY)
+    assert sorted(store.get_citation_state("seed-1")["citing_ids"]) == ["c1", "c2", "c3"]
+
+
+def test_eviction_resets_stale_seeds_for_a_full_resync(store):
+    s2 = FakeS2(["c1", "c2", "c3"])
+    collect(store, s2)
+    age(store, "seeds", "edges")
+    assert store.evict_stale(7 * DAY) == 3
+    assert store.get_citation_state("seed-1") == {"citation_count": None, "citing_ids": []}
+    # Same citation count as before, but the seed is fetched in full again
+    assert collect(store, s2) == ["c1", "c2", "c3"]
+    assert collect(store, s2) == []
+
+
+def test_eviction_keeps_the_last_search_and_its_analyses(store):
+    kept = {"title": "Kept", "semantic_scholar_id": "k1", "analysis": {"is_model_copyright_protection": True}}
+    dropped = {"title": "Dropped", "semantic_scholar_id": "d1", "analysis": {"is_model_copyright_protection": False}}
+    store.save_analyses([kept, dropped])
+    store.save_citations([kept])
+    age(store, "papers", "analyses")
+    assert store.evict_stale(7 * DAY) == 2
+    assert [p["title"] for p in store.load_citations()] == ["Kept"]
+    assert store.get_analysis(kept) == kept["analysis"]
+    assert store.get_analysis(dropped) is None
+
+
+def test_nothing_fresh_is_evicted(store):
+    collect(store, FakeS2(["c1"]))
+    store.save_citations([{"title": "Fresh", "semantic_scholar_id": "f1"}])
+    assert store.evict_stale(7 * DAY) == 0
+
+
+def test_legacy_scholar_cache_is_imported_once(store, tmp_path):
+    legacy = tmp_path / "scholar_cache.json"
+    legacy.write_text(json.dumps({"analyzed_titles": [], "citations": [{"title": "Old", "semantic_scholar_id": "o1"}]}))
+    store.import_legacy_json(tmp_path)
+    assert [p["title"] for p in store.load_citations()] == ["Old"]
+    store.save_citations([{"title": "New", "semantic_scholar_id": "n1"}])
+    store.import_legacy_json(tmp_path)
+    assert [p["title"] for p in store.load_citations()] == ["New"]
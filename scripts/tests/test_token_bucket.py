@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+import scholar_citation_monitor
+from scholar_citation_monitor import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scholar_citation_monitor.time, "monotonic", fake)
+    return fake
+
+
+def test_burst_then_spaced_at_rate(clock):
+    bucket = TokenBucket(rate_per_s=10, burst=3)
+    waits = [bucket._reserve() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1)
+    assert waits[4] == pytest.approx(0.2)
+
+
+def test_tokens_refill_while_idle(clock):
+    bucket = TokenBucket(rate_per_s=10, burst=2)
+    bucket._reserve(), bucket._reserve()
+    assert bucket._reserve() == pytest.approx(0.1)
+    clock.now += 10
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+
+
+def test_penalize_blocks_every_caller(clock):
+    bucket = TokenBucket(rate_per_s=10, burst=1)
+    bucket.penalize(5.0)
+    assert bucket._reserve() == pytest.approx(5.0)
+    assert bucket._reserve() == pytest.approx(5.1)
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_acquire_async_waits_for_its_slot():
+    bucket = TokenBucket(rate_per_s=50, burst=1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(4)))
+        return loop.time() - started
+
+    assert asyncio.run(run()) >= 0.05